@@ -0,0 +1,85 @@
+"""Benchmark the hot water tank integrators
+
+Steps a tank through a synthetic year of charging, discharging and
+standby hours with each integrator and reports the runtime and the
+difference in node temperatures from the odeint integrator.
+
+Run from the root of the repository:
+
+    python -m benchmarks.tank_integrators
+"""
+import time
+
+import numpy as np
+
+from pylesa.storage.enums import Integrator
+from pylesa.storage.hot_water_tank import HotWaterTank
+
+HOURS = 8760
+NUMBER_NODES = 10
+SOURCE_TEMP = 65.
+SOURCE_DELTA_T = 5.
+FLOW_TEMP = 55.
+RETURN_TEMP = 40.
+
+
+def make_tank(integrator: Integrator) -> HotWaterTank:
+    return HotWaterTank(
+        100000.,
+        "polyurethane",
+        "inside",
+        NUMBER_NODES,
+        {"height": None, "width": None, "insulation_thickness": None},
+        {
+            "tank_opening": 1,
+            "tank_opening_diameter": 35,
+            "uninsulated_connections": 0,
+            "uninsulated_connections_diameter": 35,
+            "insulated_connections": 2,
+            "insulated_connections_diameter": 35,
+        },
+        {"insulation_factor": 1., "overall_factor": 2.},
+        integrator=integrator,
+    )
+
+
+def operation(hours: int):
+    """Hourly state, thermal output and demand in kWh"""
+    rng = np.random.default_rng(0)
+    states = rng.choice(["charging", "discharging", "standby"], size=hours)
+    demand = 500. + 300. * rng.random(hours)
+    thermal_output = np.where(
+        states == "charging", demand + 1000. * rng.random(hours), demand)
+    thermal_output = np.where(
+        states == "discharging", demand - 400. * rng.random(hours), thermal_output)
+    return states, thermal_output, demand
+
+
+def run(integrator: Integrator, hours: int = HOURS):
+    tank = make_tank(integrator)
+    states, thermal_output, demand = operation(hours)
+    nodes_temp = tank.init_temps(RETURN_TEMP)
+    temps = np.empty((hours, NUMBER_NODES))
+    then = time.perf_counter()
+    for hour in range(hours):
+        nodes_temp = tank.new_nodes_temp(
+            states[hour], nodes_temp, SOURCE_TEMP, SOURCE_DELTA_T, FLOW_TEMP,
+            RETURN_TEMP, thermal_output[hour], demand[hour], hour)[-1]
+        temps[hour] = nodes_temp
+    return temps, time.perf_counter() - then
+
+
+def main():
+    results = {integrator: run(integrator) for integrator in Integrator}
+    reference, reference_time = results[Integrator.ODEINT]
+    print(f"{'integrator':<12}{'runtime (s)':>12}{'speed up':>10}"
+          f"{'max diff (degC)':>18}{'mean diff (degC)':>18}")
+    for integrator, (temps, runtime) in results.items():
+        diff = np.abs(temps - reference)
+        print(f"{integrator.value:<12}{runtime:>12.2f}"
+              f"{reference_time / runtime:>10.1f}"
+              f"{diff.max():>18.4f}{diff.mean():>18.4f}")
+
+
+if __name__ == "__main__":
+    main()
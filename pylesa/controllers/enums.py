@@ -0,0 +1,9 @@
+from enum import Enum
+
+from ..heat.enums import SingleTypeCheck
+
+
+class Backend(str, Enum, metaclass=SingleTypeCheck):
+    AUTO = "AUTO"
+    GEKKO = "GEKKO"
+    HIGHS = "HIGHS"
@@ -7,21 +7,165 @@ which the supply, demand and storage operate
 the fixed order control contains a set order of operations
 which are followed
 """
+from dataclasses import dataclass
 import logging
-import pandas as pd
 from pathlib import Path
+from typing import List, Optional, Tuple
 import numpy as np
-import pickle
 from tqdm import tqdm
 
-from .. import initialise_classes
+from .. import initialise_classes, precompute, tools
 from ..io import inputs
+from ..io.results import ResultsStore
 from ..constants import OUTDIR
 from ..heat.models import PerformanceValue
 from ..heat.enums import Fuel
+from ..storage import batch as tank_batch
 
 LOG = logging.getLogger(__name__)
 
+# numbers of the processes in the fixed order inputs
+PROCESS_KEY = {
+    'above': {1: 'RES to demand',
+              2: 'ES to demand',
+              3: 'Import to demand',
+              4: 'HP RES to demand',
+              5: 'EAUX RES to demand',
+              6: 'TS to demand',
+              7: 'ES to HP to demand',
+              8: 'HP import to demand',
+              9: 'AUX to demand',
+              10: 'HP RES to TS',
+              11: 'EAUX RES to TS',
+              12: 'RES to ES',
+              13: 'RES to export'},
+    'below': {1: 'RES to demand',
+              2: 'Import to demand',
+              3: 'ES to demand',
+              4: 'HP RES to demand',
+              5: 'EAUX RES to demand',
+              6: 'HP import to demand',
+              7: 'TS to demand',
+              8: 'ES to HP to demand',
+              9: 'AUX to demand',
+              10: 'HP RES to TS',
+              11: 'EAUX RES to TS',
+              12: 'HP import to TS',
+              13: 'RES to ES',
+              14: 'Import to ES',
+              15: 'RES to export'}}
+
+
+@dataclass(frozen=True)
+class Process:
+    """a process of the fixed order and its effects
+
+    Attributes:
+        handler: name of the FixedOrder method, None if it does nothing
+        args: names of the handler arguments, taken from the checks
+        results: (group, field, part) of the results set to the output
+        checks: (name, sign, part) of the checks the output is added to
+
+    part is 'h' or 'e' for a handler which returns the heat and
+    electricity of a heat pump and None for one returning a float.
+    """
+    handler: Optional[str]
+    args: Tuple[str, ...] = ()
+    results: Tuple[Tuple[str, str, Optional[str]], ...] = ()
+    checks: Tuple[Tuple[str, int, Optional[str]], ...] = ()
+
+
+_TS_ARGS = ('nodes_temp', 'source_temp', 'flow_temp', 'timestep',
+            'ts_discharge', 'ts_charge')
+
+PROCESSES = {
+    'RES to demand': Process(None),
+    'ES to demand': Process(
+        'ES_to_demand', ('elec_unmet', 'soc'),
+        results=(('elec_demand', 'ES', None),
+                 ('ES', 'discharging_to_demand', None)),
+        checks=(('elec_unmet', -1, None), ('soc', -1, None))),
+    'Import to demand': Process(
+        'import_to_demand', ('elec_unmet',),
+        results=(('elec_demand', 'import', None),
+                 ('grid', 'import_for_elec_demand', None)),
+        checks=(('elec_unmet', -1, None),)),
+    'HP RES to demand': Process(
+        'HP_RES_to_demand',
+        ('hp_usage', 'RES_left', 'hp_performance', 'heat_unmet'),
+        results=(('heat_demand', 'HP_RES', 'h'),
+                 ('RES', 'HP_to_heat_demand', 'e'),
+                 ('HP', 'heat_from_RES_to_demand', 'h'),
+                 ('HP', 'elec_from_RES_to_demand', 'e')),
+        checks=(('heat_unmet', -1, 'h'), ('RES_left', -1, 'e'),
+                ('hp_usage', 1, 'h'))),
+    'EAUX RES to demand': Process(
+        'EAUX_RES_to_demand', ('aux_left', 'RES_left', 'heat_unmet'),
+        results=(('aux', 'RES_to_demand', None),),
+        checks=(('heat_unmet', -1, None), ('RES_left', -1, None),
+                ('aux_left', -1, None))),
+    'HP import to demand': Process(
+        'HP_import_to_demand',
+        ('hp_usage', 'heat_unmet', 'hp_performance', 'heat_pump_output'),
+        results=(('heat_demand', 'HP_import', 'h'),
+                 ('grid', 'import_for_heat_pump_to_heat_demand', 'e'),
+                 ('HP', 'heat_from_import_to_demand', 'h'),
+                 ('HP', 'elec_from_import_to_demand', 'e')),
+        checks=(('heat_unmet', -1, 'h'), ('hp_usage', 1, 'h'))),
+    'TS to demand': Process(
+        'TS_to_demand', ('heat_unmet',) + _TS_ARGS,
+        results=(('heat_demand', 'TS', None),
+                 ('TS', 'discharging_total', None)),
+        checks=(('heat_unmet', -1, None), ('ts_discharge', 1, None))),
+    'ES to HP to demand': Process(
+        'ES_to_HP_to_demand',
+        ('soc', 'hp_performance', 'heat_unmet', 'hp_usage'),
+        results=(('heat_demand', 'HP_ES', 'h'),
+                 ('ES', 'discharging_to_HP', 'e'),
+                 ('HP', 'heat_from_ES_to_demand', 'h'),
+                 ('HP', 'elec_from_ES_to_demand', 'e')),
+        checks=(('heat_unmet', -1, 'h'), ('soc', -1, 'e'))),
+    'AUX to demand': Process(
+        'aux_to_demand', ('heat_unmet',),
+        results=(('heat_demand', 'aux', None),),
+        checks=(('heat_unmet', -1, None), ('aux_left', -1, None))),
+    'HP RES to TS': Process(
+        'HP_RES_to_TS',
+        ('RES_left', 'hp_performance', 'hp_usage', 'heat_demand') + _TS_ARGS,
+        results=(('RES', 'HP_to_TS', 'e'),
+                 ('HP', 'heat_from_RES_to_TS', 'h'),
+                 ('HP', 'elec_from_RES_to_TS', 'e'),
+                 ('TS', 'HP_from_RES_to_TS', 'h')),
+        checks=(('RES_left', -1, 'e'), ('hp_usage', 1, 'h'),
+                ('ts_charge', 1, 'h'))),
+    'EAUX RES to TS': Process(
+        'EAUX_RES_to_TS', ('aux_left', 'RES_left') + _TS_ARGS,
+        results=(('aux', 'RES_to_TS', None), ('TS', 'aux_to_TS', None)),
+        checks=(('RES_left', -1, None), ('ts_charge', 1, None),
+                ('aux_left', -1, None))),
+    'HP import to TS': Process(
+        'HP_import_to_TS', ('hp_performance', 'hp_usage') + _TS_ARGS,
+        results=(('grid', 'import_for_heat_pump_to_TS', 'e'),
+                 ('HP', 'heat_from_import_to_TS', 'h'),
+                 ('HP', 'elec_from_import_to_TS', 'e'),
+                 ('TS', 'HP_from_import_to_TS', 'h')),
+        checks=(('hp_usage', 1, 'h'), ('ts_charge', 1, 'h'))),
+    'RES to ES': Process(
+        'RES_to_ES', ('RES_left', 'soc'),
+        results=(('RES', 'ES', None), ('ES', 'charging_from_RES', None)),
+        checks=(('RES_left', -1, None), ('soc', 1, None))),
+    'Import to ES': Process(
+        'import_to_ES', ('soc',),
+        results=(('grid', 'import_for_ES', None),
+                 ('ES', 'charging_from_import', None)),
+        checks=(('soc', 1, None),)),
+    'RES to export': Process(
+        'RES_to_export', ('RES_left',),
+        results=(('RES', 'export', None), ('grid', 'total_export', None)),
+        checks=(('RES_left', -1, None),)),
+}
+
+
 class FixedOrder(object):
 
     def __init__(self, root: Path, subname: str):
@@ -30,9 +174,8 @@ class FixedOrder(object):
         self.subname = subname
 
         classes = initialise_classes.init(self.root, subname)
-        self.myUserWindturbine = classes['myUserWindturbine']
-        self.myDatabaseWindturbine = classes['myDatabaseWindturbine']
-        self.myPV = classes['myPV']
+        # series which are the same for every combination of the run
+        self.shared = precompute.load(self.root, subname)
         self.myHotWaterTank = classes['myHotWaterTank']
         self.myHeatPump = classes['myHeatPump']
         self.myElectricalStorage = classes['myElectricalStorage']
@@ -49,12 +192,24 @@ class FixedOrder(object):
         self.source_delta_t = dem['source_delta_t']
 
         self.myGrid = classes['myGrid']
-        self.import_price = self.myGrid.import_cost_series()
+        self.import_price = self.shared['import_cost']
         self.export_price = self.myGrid.export
 
         controller_inputs = myInputs.controller()
         self.import_setpoint = controller_inputs['import_setpoint']
         self.fixed_order_info = controller_inputs['fixed_order_info']
+        # the processes of each order are resolved once for every hour
+        self.order = {
+            'above': self.compile_order(
+                self.fixed_order_info['order_above_setpoint'], 'above'),
+            'below': self.compile_order(
+                self.fixed_order_info['order_below_setpoint'], 'below')}
+        self.max_heat_demand = np.amax(self.heat_demand.values)
+
+        # results of an hour are written to the same record every hour
+        self.record = self.set_of_results()
+        self.zero_record = {group: dict(fields)
+                            for group, fields in self.record.items()}
 
     def run_timesteps(self, first_hour, timesteps):
         """run fixed order controller
@@ -65,33 +220,28 @@ class FixedOrder(object):
         Returns:
             dataframe -- outputs for each timestep
         """
+        final_hour = self.start(first_hour, timesteps)
 
-        # calculate renewable generation
-        wind_user = self.myUserWindturbine.user_power()['wind_user']
-        wind_data = (
-            self.myDatabaseWindturbine.database_power()['wind_database'])
-        wind = wind_user + wind_data
-        PV = self.myPV.power_output()
+        # run controller for each timestep
+        for timestep in tqdm(
+                range(first_hour, final_hour),
+                desc=f"Solving: {self.subname}",
+                leave=False
+            ):
+            self.run_hour(timestep)
 
-        renewable_generation = wind_user + wind_data + PV
-        # create instance of Check class
-        myCheck = CheckFunctions(
-            renewable_generation, self.elec_demand, self.heat_demand)
-        # the electricity match metrics are performed over the entire year
-        elec_match = myCheck.electrical_surplus_deficit()
-        match = elec_match['match']
-        surplus = elec_match['surplus']
-        deficit = elec_match['deficit']
-        RES_used_demand = elec_match['RES_used']
+        self.finish()
 
-        # heat pump performance over the year
-        hp_performance = self.myHeatPump.performance()
+    def start(self, first_hour, timesteps):
+        """prepare the series and results of a run
 
-        # node temperatures and simulation outputs updated every timestep
-        nodes_temp_list = []
-        soc_list = []
-        results = []
+        Arguments:
+            first_hour {int} -- first hour of the run
+            timesteps {int} -- number of timesteps to run
 
+        Returns:
+            int -- hour after the final timestep
+        """
         # can run number of timesteps up to 8760
         # final hour is from first hour plus number of timesteps
         final_hour = first_hour + timesteps
@@ -100,74 +250,128 @@ class FixedOrder(object):
             LOG.error(msg)
             raise ValueError(msg)
 
-        # run controller for each timestep
-        for timestep in tqdm(
-                range(first_hour, final_hour),
-                desc=f"Solving: {self.subname}",
-                leave=False
-            ):
-            heat_demand = self.heat_demand[timestep]
-            source_temp = self.source_temp[timestep]
-            flow_temp = self.flow_temp[timestep]
-            import_price = self.import_price[timestep]
-
-            # node temperatures are from previous calc or initial
-            if timestep == first_hour:
-                nodes_temp_list.append(
-                    self.myHotWaterTank.init_temps(self.return_temp))
-                nodes_temp = nodes_temp_list[0]
-                soc_list.append(
-                    self.myElectricalStorage.init_state())
-                soc = soc_list[0]
-            else:
-                nodes_temp = nodes_temp_list[timestep - first_hour]
-                soc = soc_list[timestep - first_hour]
-
-            # run for either above or below setpoint
-            if import_price > self.import_setpoint:
-                run = self.above_setpoint(
-                    timestep, surplus[timestep], deficit[timestep],
-                    match[timestep], nodes_temp, soc, hp_performance[timestep],
-                    myCheck, heat_demand, source_temp, flow_temp, import_price)
-            elif import_price <= self.import_setpoint:
-                run = self.below_setpoint(
-                    timestep, surplus[timestep], deficit[timestep],
-                    match[timestep], nodes_temp, soc, hp_performance[timestep],
-                    myCheck, heat_demand, source_temp, flow_temp, import_price)
-
-            # complete the set of results
-            run['RES']['elec_demand'] = RES_used_demand[timestep]
-            run['elec_demand']['RES'] = RES_used_demand[timestep]
-            run['RES']['generation_total'] = renewable_generation[timestep]
-            run['RES']['wind'] = wind[timestep]
-            run['RES']['PV'] = PV[timestep]
-            run['RES']['HP'] = run['HP']['elec_RES_usage']
-            run['RES']['aux'] = (
-                run['aux']['RES_to_demand'] +
-                run['aux']['RES_to_TS'])
-
-            run['elec_demand']['elec_demand'] = self.elec_demand[timestep]
-            run['heat_demand']['heat_demand'] = heat_demand
-
-            # add to list of results
-            results.append(run)
-            # update node temperature and soc for next timestep run
-            nodes_temp_list.append(
-                run['TS']['final_nodes_temp'])
-            soc_list.append(
-                run['ES']['final_soc'])
-
-        # write the outputs to a pickle
-        file = self.root / OUTDIR / self.subname / 'outputs.pkl'
-        with open(file, 'wb') as output_file:
-            pickle.dump(results, output_file,
-                        protocol=pickle.HIGHEST_PROTOCOL)
+        # renewable generation
+        wind_user = self.shared['wind_user']
+        wind_data = self.shared['wind_database']
+        self.wind = wind_user + wind_data
+        self.PV = self.shared['PV']
+
+        self.renewable_generation = self.shared['generation_total']
+        # create instance of Check class
+        self.myCheck = tools.CheckFunctions(
+            self.renewable_generation, self.elec_demand, self.heat_demand)
+        # the electricity match metrics are performed over the entire year
+        self.elec_match = self.shared['elec_match']
+
+        # heat pump performance over the year
+        self.hp_performance = self.myHeatPump.performance()
+
+        # node temperatures and state of charge updated every timestep
+        self.nodes_temp = self.myHotWaterTank.init_temps(self.return_temp)
+        self.soc = self.myElectricalStorage.init_state()
+
+        self.results = ResultsStore(
+            self.set_of_results(), timesteps,
+            self.myHotWaterTank.number_nodes)
+        return final_hour
+
+    def run_hour(self, timestep):
+        """run the controller for one timestep of a started run
+
+        Arguments:
+            timestep {int} -- hour of year
+        """
+        heat_demand = self.heat_demand[timestep]
+        source_temp = self.source_temp[timestep]
+        flow_temp = self.flow_temp[timestep]
+        import_price = self.import_price[timestep]
+
+        match = self.elec_match['match']
+        surplus = self.elec_match['surplus']
+        deficit = self.elec_match['deficit']
+        RES_used_demand = self.elec_match['RES_used']
+
+        # node temperatures are from previous calc or initial
+        nodes_temp = self.nodes_temp
+        soc = self.soc
+
+        # run for either above or below setpoint
+        if import_price > self.import_setpoint:
+            run = self.above_setpoint(
+                timestep, surplus[timestep], deficit[timestep],
+                match[timestep], nodes_temp, soc,
+                self.hp_performance[timestep], self.myCheck, heat_demand,
+                source_temp, flow_temp, import_price)
+        elif import_price <= self.import_setpoint:
+            run = self.below_setpoint(
+                timestep, surplus[timestep], deficit[timestep],
+                match[timestep], nodes_temp, soc,
+                self.hp_performance[timestep], self.myCheck, heat_demand,
+                source_temp, flow_temp, import_price)
+
+        # complete the set of results
+        run['RES']['elec_demand'] = RES_used_demand[timestep]
+        run['elec_demand']['RES'] = RES_used_demand[timestep]
+        run['RES']['generation_total'] = self.renewable_generation[timestep]
+        run['RES']['wind'] = self.wind[timestep]
+        run['RES']['PV'] = self.PV[timestep]
+        run['RES']['HP'] = run['HP']['elec_RES_usage']
+        run['RES']['aux'] = (
+            run['aux']['RES_to_demand'] +
+            run['aux']['RES_to_TS'])
+
+        run['elec_demand']['elec_demand'] = self.elec_demand[timestep]
+        run['heat_demand']['heat_demand'] = heat_demand
+
+        # add to the results
+        self.results.append(run)
+        # update node temperature and soc for next timestep run
+        self.nodes_temp = run['TS']['final_nodes_temp']
+        self.soc = run['ES']['final_soc']
+
+    def finish(self):
+        """write the outputs of a run to a binary file"""
+        self.myHotWaterTank.log_cache_info(self.subname)
+        self.results.save(self.root / OUTDIR / self.subname)
+        self.results = None
+
+    def compile_order(self, order, setpoint):
+        """resolve a fixed order into the handlers run every hour
+
+        Arguments:
+            order {list} -- numbers of the processes, see PROCESS_KEY
+            setpoint {str} -- 'above' or 'below' the import setpoint
+
+        Returns:
+            list -- bound handler, arguments, results and checks
+                of each process
+        """
+        key = PROCESS_KEY[setpoint]
+        steps = []
+        for number in order:
+            if number not in key:
+                msg = (f'Process {number} of the order {setpoint} setpoint '
+                       f'is not one of {sorted(key)}')
+                LOG.error(msg)
+                raise ValueError(msg)
+            process = PROCESSES[key[number]]
+            if process.handler is None:
+                continue
+            steps.append((getattr(self, process.handler), process.args,
+                          process.results, process.checks))
+        return steps
+
+    def new_results(self):
+        """the results record of an hour, reset to zero"""
+        for group, fields in self.record.items():
+            fields.update(self.zero_record[group])
+        return self.record
 
     def above_setpoint(self, timestep, surplus, deficit, match,
                        nodes_temp, soc, hp_performance, myCheck,
                        heat_demand, source_temp, flow_temp, import_price):
 
-        results = self.set_of_results()
+        results = self.new_results()
 
         results['grid']['surplus'] = surplus
         results['grid']['deficit'] = deficit
@@ -176,27 +380,10 @@ class FixedOrder(object):
         results['HP']['cop'] = hp_performance.cop
         results['HP']['duty'] = hp_performance.duty
 
-        order_above_setpoint = self.fixed_order_info['order_above_setpoint']
-        key = self.process_key()['above']
-
-        checks = {'elec_unmet': deficit,
-                  'heat_unmet': heat_demand,
-                  'RES_left': surplus,
-                  'hp_usage': 0.0,
-                  'ts_discharge': 0.0,
-                  'ts_charge': 0.0,
-                  'soc': soc,
-                  'aux_left': np.amax(self.heat_demand.values)
-                  }
-
-        for number in range(len(order_above_setpoint)):
-
-            process = key[order_above_setpoint[number]]
-            checks, results = self.run_process(
-                results, checks, process, timestep, surplus,
-                deficit, match, nodes_temp, soc, hp_performance,
-                myCheck, heat_demand, source_temp, flow_temp,
-                import_price)
+        checks = self.hour_checks(
+            timestep, surplus, deficit, nodes_temp, soc, hp_performance,
+            heat_demand, source_temp, flow_temp)
+        self.run_order(self.order['above'], results, checks)
 
         # complete results with additional calculations
         # heat pump results
@@ -439,7 +626,7 @@ class FixedOrder(object):
                        nodes_temp, soc, hp_performance, myCheck,
                        heat_demand, source_temp, flow_temp, import_price):
 
-        results = self.set_of_results()
+        results = self.new_results()
 
         results['grid']['surplus'] = surplus
         results['grid']['deficit'] = deficit
@@ -449,27 +636,10 @@ class FixedOrder(object):
         results['HP']['cop'] = hp_performance.cop
         results['HP']['duty'] = hp_performance.duty
 
-        order_below_setpoint = self.fixed_order_info['order_below_setpoint']
-        key = self.process_key()['below']
-
-        checks = {'elec_unmet': deficit,
-                  'heat_unmet': heat_demand,
-                  'RES_left': surplus,
-                  'hp_usage': 0.0,
-                  'ts_discharge': 0.0,
-                  'ts_charge': 0.0,
-                  'soc': soc,
-                  'aux_left': np.amax(self.heat_demand.values)
-                  }
-
-        for number in range(len(order_below_setpoint)):
-
-            process = key[order_below_setpoint[number]]
-            checks, results = self.run_process(
-                results, checks, process, timestep, surplus,
-                deficit, match, nodes_temp, soc, hp_performance,
-                myCheck, heat_demand, source_temp, flow_temp,
-                import_price)
+        checks = self.hour_checks(
+            timestep, surplus, deficit, nodes_temp, soc, hp_performance,
+            heat_demand, source_temp, flow_temp)
+        self.run_order(self.order['below'], results, checks)
 
         # heat pump results
         results['HP']['heat_to_heat_demand'] = (
@@ -723,202 +893,52 @@ class FixedOrder(object):
 
         return results
 
-    def run_process(self, results, checks, process, timestep, surplus,
-                    deficit, match, nodes_temp, soc, hp_performance,
-                    myCheck, heat_demand, source_temp, flow_temp,
-                    import_price, heat_pump_output=None):
-
-        elec_unmet = checks['elec_unmet']
-        heat_unmet = checks['heat_unmet']
-        RES_left = checks['RES_left']
-        hp_usage = checks['hp_usage']
-        ts_discharge = checks['ts_discharge']
-        ts_charge = checks['ts_charge']
-        soc = checks['soc']
-        aux_left = checks['aux_left']
-
-        if process == 'ES to demand':
-            r = self.ES_to_demand(
-                elec_unmet, soc)
-            results['elec_demand']['ES'] = r
-            results['ES']['discharging_to_demand'] = r
-
-        elif process == 'Import to demand':
-            r = self.import_to_demand(elec_unmet)
-            results['elec_demand']['import'] = r
-            results['grid']['import_for_elec_demand'] = r
-
-        elif process == 'HP RES to demand':
-            r = self.HP_RES_to_demand(
-                hp_usage, RES_left, hp_performance, heat_unmet)
-            results['heat_demand']['HP_RES'] = r['h']
-            results['RES']['HP_to_heat_demand'] = r['e']
-            results['HP']['heat_from_RES_to_demand'] = r['h']
-            results['HP']['elec_from_RES_to_demand'] = r['e']
-
-        elif process == 'EAUX RES to demand':
-            r = self.EAUX_RES_to_demand(
-                aux_left, RES_left, heat_unmet)
-            results['aux']['RES_to_demand'] = r
-
-        elif process == 'HP import to demand':
-            r = self.HP_import_to_demand(
-                hp_usage, heat_unmet, hp_performance,
-                heat_pump_output)
-            results['heat_demand']['HP_import'] = r['h']
-            results['grid']['import_for_heat_pump_to_heat_demand'] = r['e']
-            results['HP']['heat_from_import_to_demand'] = r['h']
-            results['HP']['elec_from_import_to_demand'] = r['e']
-
-        elif process == 'TS to demand':
-            r = self.TS_to_demand(
-                heat_unmet, nodes_temp, source_temp, flow_temp,
-                timestep, ts_discharge, ts_charge)
-            results['heat_demand']['TS'] = r
-            results['TS']['discharging_total'] = r
-
-        elif process == 'ES to HP to demand':
-            r = self.ES_to_HP_to_demand(
-                soc, hp_performance, heat_unmet, hp_usage)
-            results['heat_demand']['HP_ES'] = r['h']
-            results['ES']['discharging_to_HP'] = r['e']
-            results['HP']['heat_from_ES_to_demand'] = r['h']
-            results['HP']['elec_from_ES_to_demand'] = r['e']
-
-        elif process == 'AUX to demand':
-            r = self.aux_to_demand(
-                heat_unmet)
-            results['heat_demand']['aux'] = r
-
-        elif process == 'HP RES to TS':
-            r = self.HP_RES_to_TS(
-                RES_left, hp_performance, hp_usage, heat_demand,
-                nodes_temp, source_temp, flow_temp, timestep,
-                ts_discharge, ts_charge)
-            results['RES']['HP_to_TS'] = r['e']
-            results['HP']['heat_from_RES_to_TS'] = r['h']
-            results['HP']['elec_from_RES_to_TS'] = r['e']
-            results['TS']['HP_from_RES_to_TS'] = r['h']
-
-        elif process == 'EAUX RES to TS':
-            r = self.EAUX_RES_to_TS(
-                aux_left, RES_left, nodes_temp, source_temp,
-                flow_temp, timestep, ts_discharge, ts_charge)
-            results['aux']['RES_to_TS'] = r
-            results['TS']['aux_to_TS'] = r
-
-        elif process == 'HP import to TS':
-            r = self.HP_import_to_TS(
-                hp_performance, hp_usage, nodes_temp, source_temp,
-                flow_temp, timestep, ts_discharge, ts_charge)
-            results['grid']['import_for_heat_pump_to_TS'] = r['e']
-            results['HP']['heat_from_import_to_TS'] = r['h']
-            results['HP']['elec_from_import_to_TS'] = r['e']
-            results['TS']['HP_from_import_to_TS'] = r['h']
-
-        elif process == 'RES to ES':
-            r = self.RES_to_ES(
-                RES_left, soc)
-            results['RES']['ES'] = r
-            results['ES']['charging_from_RES'] = r
-
-        elif process == 'Import to ES':
-            r = self.import_to_ES(
-                soc)
-            results['grid']['import_for_ES'] = r
-            results['ES']['charging_from_import'] = r
-
-        elif process == 'RES to export':
-            r = self.RES_to_export(
-                RES_left)
-            results['RES']['export'] = r
-            results['grid']['total_export'] = r
-
-        elec_unmet_process = ['ES to demand', 'Import to demand']
-        heat_unmet_process = ['HP RES to demand', 'TS to demand',
-                              'HP import to demand', 'ES to HP to demand',
-                              'AUX to demand', 'EAUX RES to demand']
-        RES_left_process = ['HP RES to demand', 'HP RES to TS',
-                            'RES to ES', 'RES to export',
-                            'EAUX RES to demand', 'EAUX RES to TS']
-        hp_usage_process = ['HP RES to demand', 'HP RES to TS',
-                            'HP import to demand', 'HP import to TS']
-        ts_discharge_process = ['TS to demand']
-        ts_charge_process = ['HP RES to TS', 'HP import to TS',
-                             'EAUX RES to TS']
-        soc_process = ['ES to demand', 'ES to HP to demand',
-                       'RES to ES', 'Import to ES']
-        aux_process = ['EAUX RES to demand', 'AUX to demand',
-                       'EAUX RES to TS']
-
-        if process in elec_unmet_process:
-            checks['elec_unmet'] -= r
-        if process in heat_unmet_process:
-            # heat pump has two results
-            # this accounts for this
-            try:
-                checks['heat_unmet'] -= r['h']
-            except:
-                checks['heat_unmet'] -= r
-        if process in RES_left_process:
-            try:
-                checks['RES_left'] -= r['e']
-            except:
-                checks['RES_left'] -= r
-
-        if process in hp_usage_process:
-            checks['hp_usage'] += r['h']
-        if process in ts_discharge_process:
-            checks['ts_discharge'] += r
-        if process in ts_charge_process:
-            try:
-                checks['ts_charge'] += r['h']
-            except:
-                checks['ts_charge'] += r
-        if process in soc_process:
-            if process == 'ES to demand':
-                r = -r
-            elif process == 'ES to HP to demand':
-                r = -r['e']
-            checks['soc'] += r
-        if process in aux_process:
-            checks['aux_left'] -= r
-
-        return checks, results
+    def hour_checks(self, timestep, surplus, deficit, nodes_temp, soc,
+                    hp_performance, heat_demand, source_temp, flow_temp):
+        """energy left to meet at the start of an hour
+
+        The checks also hold the conditions of the hour, so that the
+        arguments of every process are taken from the one dict.
+        """
+        return {'elec_unmet': deficit,
+                'heat_unmet': heat_demand,
+                'RES_left': surplus,
+                'hp_usage': 0.0,
+                'ts_discharge': 0.0,
+                'ts_charge': 0.0,
+                'soc': soc,
+                'aux_left': self.max_heat_demand,
+                # conditions of the hour
+                'timestep': timestep,
+                'nodes_temp': nodes_temp,
+                'source_temp': source_temp,
+                'flow_temp': flow_temp,
+                'heat_demand': heat_demand,
+                'hp_performance': hp_performance,
+                'heat_pump_output': None}
+
+    def run_order(self, steps, results, checks):
+        """run the processes of a compiled order for an hour
+
+        Arguments:
+            steps {list} -- compiled order, see compile_order
+            results {dict} -- results of the hour, updated in place
+            checks {dict} -- checks of the hour, updated in place
+        """
+        for handler, args, fields, effects in steps:
+            r = handler(*[checks[arg] for arg in args])
+            for group, field, part in fields:
+                results[group][field] = r if part is None else r[part]
+            for name, sign, part in effects:
+                value = r if part is None else r[part]
+                if sign > 0:
+                    checks[name] += value
+                else:
+                    checks[name] -= value
 
     def process_key(self):
 
-        above = {1: 'RES to demand',
-                 2: 'ES to demand',
-                 3: 'Import to demand',
-                 4: 'HP RES to demand',
-                 5: 'EAUX RES to demand',
-                 6: 'TS to demand',
-                 7: 'ES to HP to demand',
-                 8: 'HP import to demand',
-                 9: 'AUX to demand',
-                 10: 'HP RES to TS',
-                 11: 'EAUX RES to TS',
-                 12: 'RES to ES',
-                 13: 'RES to export'}
-
-        below = {1: 'RES to demand',
-                 2: 'Import to demand',
-                 3: 'ES to demand',
-                 4: 'HP RES to demand',
-                 5: 'EAUX RES to demand',
-                 6: 'HP import to demand',
-                 7: 'TS to demand',
-                 8: 'ES to HP to demand',
-                 9: 'AUX to demand',
-                 10: 'HP RES to TS',
-                 11: 'EAUX RES to TS',
-                 12: 'HP import to TS',
-                 13: 'RES to ES',
-                 14: 'Import to ES',
-                 15: 'RES to export'}
-
-        return {'above': above, 'below': below}
+        return PROCESS_KEY
 
     def set_of_results(self):
 
@@ -944,7 +964,9 @@ class FixedOrder(object):
                'HP': 0.0,  #
                'ES': 0.0,  #
                'export': 0.0,  #
-               'aux': 0.0
+               'aux': 0.0,  #
+               'HP_to_heat_demand': 0.0,  #
+               'HP_to_TS': 0.0  #
                }
 
         HP = {'heat_total_output': 0.0,  #
@@ -1251,143 +1273,47 @@ class FixedOrder(object):
         return elec_export
 
 
-class CheckFunctions(object):
-
-    def __init__(self, renewable_generation, elec_demand,
-                 heat_demand):
-        self.renewable_generation = renewable_generation
-        self.elec_demand = elec_demand
-        self.heat_demand = heat_demand
-
-    def electrical_surplus_deficit(self):
-
-        """
-        this looks at total renewable generation and total electrical demand
-        works out the surplus and deficit
-        looks every timestep for whole year
-
-        RETURNS
-        pdf: a dataframe containing the following
-            match: RES - elec_demand
-            deficit: where demand exceeds RES
-            surplus: where RES exceeds demand
-        """
-
-        # sum of the wind turbines and PV
-        total_renewables = self.renewable_generation
-        electrical_demand = self.elec_demand
-
-        # match by subtracting between the total renewables and elec_demand
-        match = total_renewables - electrical_demand
-
-        # create empty lists for the deficit and surplus
-        deficit = []
-        surplus = []
-        RES_used = []
-
-        # search for the whole year, h=8760
-        # calculates the deficit or surplus at each timestep,
-        # and produces two separate dataframes
-        for x in range(0, 8760):
-
-            RES_used.append(min(total_renewables[x], electrical_demand[x]))
-
-            if match[x] <= 0.0:
-                deficit.append(-1 * match[x])
-                surplus.append(0.0)
-
-            else:
-                deficit.append(0.0)
-                surplus.append(match[x])
-
-        d = {'match': match, 'deficit': deficit,
-             'surplus': surplus, 'RES_used': RES_used}
-        pdf = pd.DataFrame(data=d)
-
-        return pdf
-
-    def heat_demand_check(self, timestep, heat_generated):
-
-        """Checks if the heat demand has been met
-
-        Args:
-            timestep: a float/int of the timestep to be modelled
-            heat_generated: the total heat generated up to that
-                point in the flow diagram to be checked
-
-        Returns:
-            boolean, TRUE if heat demand met, FALSE if heat demand not met
-       
-        Raises:
-            SystemExit if too much heat generated
-        """
-        # get the heat demand
-        heat_demand = self.heat_demand[timestep]
-
-        # checks how much heat demand still needs to be met
-        heat_met = round(heat_demand, 2) - round(heat_generated, 2)
-        heat_met = round(heat_met, 1)
-
-        # if zero then heat demand is met
-        if heat_met == 0:
-            return True
-        # if > 0 then heat demand not met
-        elif heat_met > 0:
-            return False
-        # if < 0 then too much heat generated for some reason, throw error
-        else:
-            msg = f'Error in heat generation: too much heat generated ({heat_met})'
-            LOG.error(msg)
-            raise SystemExit(msg)
-
-    def surplus_check(self, surplus, RES_used):
-        """Checks if surplus exists at point in flow diagram
-
-        Args:
-            timestep: a float/int of the timestep to be modelled
-            surplus: total surplus in the timestep
-            RES_used: surplus used up to point in the flow diagram
-
-        Returns:
-            bool, TRUE if surplus exists, FALSE if surplus doesn't exist
-        """
-        # calculates how much RES is leftover
-        RES_leftover = round(surplus, 2) - round(RES_used, 2)
-        RES_leftover = round(RES_leftover, 2)
-
-        # if greater than zero then surplus leftover
-        if RES_leftover > 0:
-            return True
-        # if zero then no surplus
-        elif RES_leftover == 0.0:
-            return False
-        # if something else then error
-        else:
-            msg = f'Error in RES usage: too much RES used ({RES_leftover})'
-            LOG.error(msg)
-            raise SystemExit(msg)
-
-    def deficit_check(self, deficit, elec_supplied):
-        """Checks if deficit becomes surplus
-
-        Args:
-            deficit: total deficit in the timestep
-            elec_supplied: surplus used up to point in the flow diagram
-
-        Returns:
-            bool, TRUE if surplus exists, FALSE if surplus doesn't exist
-        """
-        deficit_leftover = round(deficit, 2) - round(elec_supplied, 2)
-        deficit_leftover = round(deficit_leftover, 2)
-
-        # if greater than zero then surplus leftover
-        if deficit_leftover > 0:
-            return True
-        # if zero then no surplus
-        elif deficit_leftover == 0:
-            return False
-        # if something else then error
-        else:
-            msg = f'Error in program: deficit turned into surplus ({deficit_leftover})'
-            LOG.error(msg)
-            raise SystemExit(msg)
+def run_batch(root: Path, subnames: List[str], first_hour: int,
+              timesteps: int):
+    """run the fixed order controller for many combinations in lock-step
+
+    The combinations are stepped forward an hour at a time. Before each
+    hour the maximum energy which can be charged to and discharged from
+    the tank of every combination is solved at once, see
+    pylesa.storage.batch, and the processes of each combination then
+    run as in run_timesteps. The outputs are the same as running each
+    combination on its own.
+
+    Arguments:
+        root {Path} -- output directory of the run
+        subnames {list} -- names of the combinations
+        first_hour {int} -- first hour of the run
+        timesteps {int} -- number of timesteps to run
+    """
+    controllers = [FixedOrder(root, subname) for subname in subnames]
+    for controller in controllers:
+        final_hour = controller.start(first_hour, timesteps)
+
+    # tanks are solved together when they have the same number of nodes
+    groups = {}
+    for controller in controllers:
+        tank = controller.myHotWaterTank
+        groups.setdefault(tank.number_nodes, []).append(controller)
+
+    for timestep in tqdm(
+            range(first_hour, final_hour),
+            desc=f"Solving: {len(subnames)} combinations",
+            leave=False
+        ):
+        for group in groups.values():
+            lead = group[0]
+            tank_batch.seed_max_energy(
+                [controller.myHotWaterTank for controller in group],
+                [controller.nodes_temp for controller in group],
+                lead.source_temp[timestep], lead.flow_temp[timestep],
+                lead.return_temp, timestep)
+        for controller in controllers:
+            controller.run_hour(timestep)
+
+    for controller in controllers:
+        controller.finish()
@@ -0,0 +1,268 @@
+"""linear module
+
+formulates the model predictive control horizon problem as a sparse
+linear programme, or a mixed integer linear programme when the heat
+pump has a minimum output, and solves it with HiGHS through scipy
+"""
+import logging
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+LOG = logging.getLogger(__name__)
+
+# decision variables, each has a value for every step of the horizon
+VARIABLES = (
+    'RES_ed', 'export', 'imp_ed', 'HPtrd', 'HPtrs', 'HPtid', 'HPtis',
+    'HPtesd', 'HPt', 'HP_status', 'TSc', 'TSd', 'soc', 'ESc', 'ESc_res',
+    'ESc_imp', 'ESd', 'ESd_hp', 'ESd_aux', 'ESd_ed', 'soc_ES', 'aux_rd',
+    'aux_rs', 'aux_d', 'aux_s', 'aux')
+# variables which are only used with an electric auxiliary heater
+ELECTRIC_AUX_VARIABLES = ('HPtesd', 'ESd_hp', 'ESd_aux', 'aux_rd', 'aux_rs')
+# fraction of the thermal storage state of charge lost each step
+TS_LOSS = 0.01
+
+
+class _Constraints(object):
+    """sparse constraint rows, one row per step of the horizon"""
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.rows = []
+        self.cols = []
+        self.data = []
+        self.lower = []
+        self.upper = []
+        self.number_rows = 0
+
+    def add(self, terms, lower, upper):
+        """add lower <= sum(coefficient * variable) <= upper
+
+        Arguments:
+            terms {list} -- (variable, coefficient) pairs, coefficients
+                are floats or arrays over the horizon steps
+            lower {float or array} -- lower bound of each row
+            upper {float or array} -- upper bound of each row
+        """
+        steps = np.arange(self.steps)
+        for name, coefficient in terms:
+            self.rows.append(self.number_rows + steps)
+            self.cols.append(VARIABLES.index(name) * self.steps + steps)
+            self.data.append(np.broadcast_to(coefficient, self.steps))
+        self.lower.append(np.broadcast_to(lower, self.steps))
+        self.upper.append(np.broadcast_to(upper, self.steps))
+        self.number_rows += self.steps
+
+    def add_dynamics(self, name, terms, loss, initial):
+        """add the implicit Euler step of a state of charge
+
+        (1 + loss) * soc[k] - soc[k - 1] - sum(terms[k]) = 0, with the
+        state of charge before the first step moved to the right hand
+        side as the initial value
+
+        Arguments:
+            name {str} -- state of charge variable
+            terms {list} -- (variable, coefficient) pairs of the rate
+            loss {float} -- fraction of state of charge lost each step
+            initial {float} -- state of charge at start of horizon
+        """
+        previous = np.arange(self.steps - 1)
+        self.rows.append(self.number_rows + previous + 1)
+        self.cols.append(VARIABLES.index(name) * self.steps + previous)
+        self.data.append(-np.ones(self.steps - 1))
+        rhs = np.zeros(self.steps)
+        rhs[0] = initial
+        self.add([(name, 1. + loss)] + [
+            (var, -np.asarray(coefficient)) for var, coefficient in terms],
+            rhs, rhs)
+
+    def constraint(self):
+        A = sparse.csr_matrix(
+            (np.concatenate(self.data),
+             (np.concatenate(self.rows), np.concatenate(self.cols))),
+            shape=(self.number_rows, len(VARIABLES) * self.steps))
+        return A, np.concatenate(self.lower), np.concatenate(self.upper)
+
+
+class LinearHorizon(object):
+
+    def __init__(self, electrical_storage, aux_cap, export_cost, electric_aux):
+        """linear programme of the predictive control horizon
+
+        Arguments:
+            electrical_storage {ElectricalStorage} -- electrical storage
+            aux_cap {float} -- capacity of auxiliary heater
+            export_cost {float} -- export price in pounds/MWh
+            electric_aux {bool} -- auxiliary heater is electric and can
+                use renewable generation and electrical storage
+        """
+        self.capacity_ES = electrical_storage.capacity
+        self.charge_max_ES = electrical_storage.charge_max
+        self.discharge_max_ES = electrical_storage.discharge_max
+        self.charge_eff = electrical_storage.charge_eff
+        self.discharge_eff = electrical_storage.discharge_eff
+        self.self_discharge = electrical_storage.self_discharge
+        self.aux_cap = aux_cap
+        self.export_cost = export_cost
+        self.electric_aux = electric_aux
+        # iterations of the last solve, branch and bound nodes for a MILP
+        self.iterations = 0
+
+    def solve(self, IC, RES, ed, hd, cop, duty, HP_min, max_cap, aux_cost,
+              init_soc, init_soc_ES, initial):
+        """solve the horizon problem
+
+        Parameters are arrays over the horizon including its first
+        timestep, which holds the initial values and is not optimised.
+
+        Arguments:
+            IC {array} -- import cost in pounds/MWh
+            RES {array} -- renewable generation
+            ed {array} -- electrical demand
+            hd {array} -- heat demand
+            cop {array} -- heat pump coefficient of performance
+            duty {array} -- heat pump duty
+            HP_min {array} -- heat pump minimum output when running
+            max_cap {array} -- thermal storage maximum capacity
+            aux_cost {float or array} -- auxiliary heat cost in pounds/MWh
+            init_soc {float} -- initial thermal storage state of charge
+            init_soc_ES {float} -- initial electrical storage state of charge
+            initial {dict} -- values of variables in the first timestep
+
+        Returns:
+            dict -- arrays of the variables and parameters over the horizon
+        """
+        number_timesteps = len(IC)
+        steps = number_timesteps - 1
+        # parameters over the optimised steps
+        IC_, RES_, ed_, hd_, cop_, duty_, HP_min_, max_cap_ = (
+            np.asarray(p, dtype=float)[1:] for p in
+            (IC, RES, ed, hd, cop, duty, HP_min, max_cap))
+        aux_cost_ = np.broadcast_to(
+            np.asarray(aux_cost, dtype=float), number_timesteps)[1:]
+        integer = bool(np.any(HP_min_ > 0))
+
+        ce = self.charge_eff
+        de = self.discharge_eff
+        con = _Constraints(steps)
+
+        # equalities
+        con.add_dynamics(
+            'soc_ES', [('ESc', ce), ('ESd', -1.)], self.self_discharge,
+            init_soc_ES)
+        con.add_dynamics('soc', [('TSc', 1.), ('TSd', -1.)], TS_LOSS, init_soc)
+        con.add([('ESc', 1.), ('ESc_res', -1.), ('ESc_imp', -1.)], 0., 0.)
+        con.add([('RES_ed', 1.), ('imp_ed', 1.), ('ESd_ed', de)], ed_, ed_)
+        if self.electric_aux:
+            con.add([('ESd', 1.), ('ESd_ed', -1.), ('ESd_hp', -1.),
+                     ('ESd_aux', -1.)], 0., 0.)
+            con.add([('HPtrd', 1.), ('HPtid', 1.), ('HPtesd', 1.),
+                     ('aux_d', 1.), ('aux_rd', 1.), ('ESd_aux', de),
+                     ('TSd', 1.)], hd_, hd_)
+            con.add([('HPtesd', 1.), ('ESd_hp', -cop_ * de)], 0., 0.)
+            con.add([('HPt', 1.), ('HPtrs', -1.), ('HPtrd', -1.),
+                     ('HPtid', -1.), ('HPtis', -1.), ('HPtesd', -1.)], 0., 0.)
+            con.add([('aux', 1.), ('aux_d', -1.), ('aux_s', -1.),
+                     ('aux_rd', -1.), ('aux_rs', -1.), ('ESd_aux', -1.)],
+                    0., 0.)
+            con.add([('TSc', 1.), ('HPtrs', -1.), ('HPtis', -1.),
+                     ('aux_rs', -1.), ('aux_s', -1.)], 0., 0.)
+            con.add([('RES_ed', 1.), ('HPtrs', 1. / cop_),
+                     ('HPtrd', 1. / cop_), ('ESc_res', 1.), ('aux_rd', 1.),
+                     ('aux_rs', 1.), ('export', 1.)], RES_, RES_)
+        else:
+            con.add([('ESd', 1.), ('ESd_ed', -1.)], 0., 0.)
+            con.add([('HPtrd', 1.), ('HPtid', 1.), ('aux_d', 1.),
+                     ('TSd', 1.)], hd_, hd_)
+            con.add([('HPt', 1.), ('HPtrs', -1.), ('HPtrd', -1.),
+                     ('HPtid', -1.), ('HPtis', -1.)], 0., 0.)
+            con.add([('aux', 1.), ('aux_d', -1.), ('aux_s', -1.)], 0., 0.)
+            con.add([('TSc', 1.), ('HPtrs', -1.), ('HPtis', -1.),
+                     ('aux_s', -1.)], 0., 0.)
+            con.add([('RES_ed', 1.), ('HPtrs', 1. / cop_),
+                     ('HPtrd', 1. / cop_), ('ESc_res', 1.),
+                     ('export', 1.)], RES_, RES_)
+
+        # inequalities
+        con.add([('TSc', 1.), ('soc', 1.)], -np.inf, max_cap_)
+        con.add([('TSd', 1.), ('soc', -1.)], -np.inf, 0.)
+        con.add([('ESd', 1.), ('soc_ES', -1.)], -np.inf, 0.)
+        if integer:
+            # heat pump output is zero or between minimum output and duty
+            con.add([('HPt', 1.), ('HP_status', -duty_)], -np.inf, 0.)
+            con.add([('HPt', 1.), ('HP_status', -HP_min_)], 0., np.inf)
+
+        # bounds
+        lower = {name: np.zeros(steps) for name in VARIABLES}
+        upper = {name: np.full(steps, np.inf) for name in VARIABLES}
+        upper['soc'] = max_cap_
+        upper['soc_ES'] = np.full(steps, self.capacity_ES)
+        upper['ESc'] = np.full(steps, self.charge_max_ES * ce)
+        upper['ESd'] = np.full(steps, self.discharge_max_ES)
+        upper['aux'] = np.full(steps, self.aux_cap)
+        upper['HP_status'] = np.ones(steps) if integer else np.zeros(steps)
+        if not integer:
+            upper['HPt'] = duty_
+            lower['HPt'] = HP_min_
+        if not self.electric_aux:
+            for name in ELECTRIC_AUX_VARIABLES:
+                upper[name] = np.zeros(steps)
+
+        # objective
+        c = {name: np.zeros(steps) for name in VARIABLES}
+        c['HPt'] = IC_ / 1000 / cop_
+        for name in ('HPtrd', 'HPtesd', 'HPtrs'):
+            c[name] = -IC_ / 1000 / cop_
+        c['imp_ed'] = IC_ / 1000
+        c['ESc_imp'] = IC_ / 1000
+        c['aux'] = aux_cost_ / 1000
+        for name in ('aux_rs', 'aux_rd', 'ESd_aux'):
+            c[name] = -aux_cost_ / 1000
+        c['export'] = np.full(steps, -self.export_cost / 1000)
+        # disadvantage charging electrical storage with renewables
+        c['ESc_res'] = np.full(steps, 0.00001)
+
+        c = np.concatenate([c[name] for name in VARIABLES])
+        lower = np.concatenate([lower[name] for name in VARIABLES])
+        upper = np.concatenate([upper[name] for name in VARIABLES])
+        A, A_lower, A_upper = con.constraint()
+
+        if integer:
+            integrality = np.zeros(len(c))
+            status = VARIABLES.index('HP_status') * steps
+            integrality[status:status + steps] = 1
+            res = milp(
+                c, constraints=LinearConstraint(A, A_lower, A_upper),
+                integrality=integrality, bounds=Bounds(lower, upper))
+        else:
+            equal = A_lower == A_upper
+            A_ub = sparse.vstack([A[~equal & np.isfinite(A_upper)],
+                                  -A[~equal & np.isfinite(A_lower)]])
+            b_ub = np.concatenate([A_upper[~equal & np.isfinite(A_upper)],
+                                   -A_lower[~equal & np.isfinite(A_lower)]])
+            res = linprog(
+                c, A_ub=A_ub, b_ub=b_ub, A_eq=A[equal], b_eq=A_upper[equal],
+                bounds=np.column_stack([lower, upper]), method='highs')
+
+        if res.status != 0:
+            msg = f'Linear horizon problem could not be solved: {res.message}'
+            LOG.error(msg)
+            raise ValueError(msg)
+        self.iterations = res.mip_node_count if integer else res.nit
+
+        x = res.x.reshape(len(VARIABLES), steps)
+        values = {}
+        for idx, name in enumerate(VARIABLES):
+            values[name] = np.concatenate(([initial.get(name, 0.)], x[idx]))
+        values['soc'][0] = init_soc
+        values['soc_ES'][0] = init_soc_ES
+        if not integer:
+            values['HP_status'] = (values['HPt'] > 0).astype(float)
+        # heat pump output without on/off status
+        values['HPt_var'] = values['HPt'].copy()
+        values.update({
+            'IC': np.asarray(IC, dtype=float),
+            'RES': np.asarray(RES, dtype=float),
+            'ed': np.asarray(ed, dtype=float),
+            'hd': np.asarray(hd, dtype=float)})
+        return values
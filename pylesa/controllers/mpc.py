@@ -6,29 +6,59 @@ import logging
 from gekko import GEKKO
 from pathlib import Path
 import numpy as np
-import pickle
+import time
 from tqdm import tqdm
 
-from .. import initialise_classes, tools
+from .. import initialise_classes, precompute
+from .enums import Backend
+from .linear import VARIABLES, LinearHorizon
 from ..io import inputs
+from ..io.results import ResultsStore
 from ..constants import OUTDIR
 from ..heat.models import PerformanceArray
 from ..heat.enums import Fuel
+from ..storage import batch as tank_batch
 
 LOG = logging.getLogger(__name__)
 
+# variables started from their first timestep value even with a warm start,
+# the heat pump output is the product of its on/off status and output
+# variable and a shifted guess of this pair or of the state of charge can
+# leave APOPT at a worse local solution
+WARM_START_EXCLUDED = ('HPt', 'HP_status', 'HPt_var', 'soc', 'soc_ES')
+
 class Scheduler(object):
 
-    def __init__(self, root: Path, subname: str):
+    def __init__(self, root: Path, subname: str, persistent: bool = False,
+                 backend: Backend = Backend.AUTO, warm_start: bool = False):
+        """model predictive control scheduler
+
+        Arguments:
+            root {Path} -- run directory
+            subname {str} -- name of the parametric combination
+
+        Keyword Arguments:
+            persistent {bool} -- build the GEKKO horizon model once and
+                only update its values each hour (default: {False})
+            backend {Backend} -- solver of the horizon problem, AUTO uses
+                HIGHS when the heat pump has no minimum output and so the
+                problem is linear, else GEKKO (default: {Backend.AUTO})
+            warm_start {bool} -- start each GEKKO solve from the previous
+                solution shifted by one hour (default: {False})
+        """
 
         self.root = Path(root).resolve()
         self.subname = subname
+        self.persistent = persistent
+        self.warm_start = warm_start
+        self._gekko = None
+        self._handles = {}
+        self._previous_solution = None
 
         classes = initialise_classes.init(self.root, subname)
+        # series which are the same for every combination of the run
+        self.shared = precompute.load(self.root, subname)
 
-        self.myUserWindturbine = classes['myUserWindturbine']
-        self.myDatabaseWindturbine = classes['myDatabaseWindturbine']
-        self.myPV = classes['myPV']
         self.myHotWaterTank = classes['myHotWaterTank']
         self.myHeatPump = classes['myHeatPump']
         self.myElectricalStorage = classes['myElectricalStorage']
@@ -47,23 +77,39 @@ class Scheduler(object):
         self.source_delta_t = dem['source_delta_t']
 
         self.myGrid = classes['myGrid']
-        self.import_cost = self.myGrid.import_cost_series()
+        self.import_cost = self.shared['import_cost']
         self.export_cost = self.myGrid.export
 
+        if backend not in Backend:
+            msg = f'Backend {backend} is not one of {[_.value for _ in Backend]}'
+            LOG.error(msg)
+            raise ValueError(msg)
+        backend = Backend.from_value(backend)
+        if backend == Backend.AUTO:
+            if self.myHeatPump.minimum_output == 0:
+                backend = Backend.HIGHS
+            else:
+                backend = Backend.GEKKO
+        self.backend = backend
+        LOG.debug(f'Solving {subname} horizon problems with {backend.value}')
+        if self.backend == Backend.HIGHS:
+            self.myLinearHorizon = LinearHorizon(
+                self.myElectricalStorage, np.amax(self.heat_demand.values),
+                self.export_cost, self.myAux.fuel == Fuel.ELECTRIC)
+
     def pre_calculation(self, first_hour, total_timesteps):
 
         first_hour = first_hour
         total_timesteps = total_timesteps + self.horizon
         horizon = self.horizon
 
-        # calculate renewable generation
-        wind_user = self.myUserWindturbine.user_power()['wind_user']
-        wind_data = (
-            self.myDatabaseWindturbine.database_power()['wind_database'])
+        # renewable generation
+        wind_user = self.shared['wind_user']
+        wind_data = self.shared['wind_database']
         wind = wind_user + wind_data
-        PV = self.myPV.power_output()
+        PV = self.shared['PV']
 
-        RES = wind_user + wind_data + PV
+        RES = self.shared['generation_total']
 
         # heat pump performance over the year
         hp_performance = self.myHeatPump.performance()
@@ -80,21 +126,17 @@ class Scheduler(object):
         if final_hour >= 8759 - horizon:
             final_hour = 8759
 
-        for timestep in range(first_hour, final_hour):
-            t = timestep - first_hour
-            return_temp_nodes = []
-            for n in range(self.myHotWaterTank.number_nodes):
-                return_temp_nodes.append(rt)
-            # charging from return temp to source temp is max capacity
-            max_capacity[t] = self.myHotWaterTank.max_energy_in_out(
-                'charging', return_temp_nodes,
-                st[timestep], ft[timestep], rt, timestep)
-
-        # create instance of Check class
-        myCheck = tools.CheckFunctions(
-            RES, self.elec_demand, self.heat_demand)
+        # charging from return temp to source temp is max capacity,
+        # solved for all hours at once
+        hours = np.arange(first_hour, final_hour)
+        return_temp_nodes = self.myHotWaterTank.init_temps(rt)
+        max_capacity[:len(hours)] = tank_batch.max_energy_hours(
+            self.myHotWaterTank, 'charging', return_temp_nodes,
+            np.asarray(st, dtype=float)[hours],
+            np.asarray(ft, dtype=float)[hours], rt, hours)
+
         # the electricity match metrics are performed over the entire year
-        elec_match = myCheck.electrical_surplus_deficit()
+        elec_match = self.shared['elec_match']
         match = elec_match['match']
         surplus = elec_match['surplus']
         deficit = elec_match['deficit']
@@ -116,127 +158,184 @@ class Scheduler(object):
 
         return pre_calc
 
-    def solve(self, pre_calc, hour, first_hour, final_hour, prev_result):
-
-        # over the whole year
-        hp_performance: PerformanceArray = pre_calc['hp_performance']
-        surplus = pre_calc['surplus']
-        deficit = pre_calc['deficit']
-        match = pre_calc['match']
-        generation_total = pre_calc['generation_total']
-        wind = pre_calc['wind']
-        PV = pre_calc['PV']
+    def gekko_model(self, number_timesteps):
+        """GEKKO model for a horizon of number_timesteps
 
-        # over the first hour to final hour plus horizon
-        # indexed from 0 to final hour plus horizon
-        max_capacity = pre_calc['max_capacity']
+        A new model is built every call unless the scheduler is
+        persistent, in which case the previous model is reused while
+        the horizon length is unchanged.
 
-        # temp parameters
-        rt = self.return_temp
-        st = self.source_temp
-        ft = self.flow_temp
-        sdt = self.source_delta_t
+        Arguments:
+            number_timesteps {int} -- length of the horizon
 
-        number_timesteps = final_hour - hour
-        t1 = hour - first_hour
-        t2 = final_hour - first_hour
+        Returns:
+            tuple -- GEKKO model and True if it was newly built
+        """
+        if (self.persistent and self._gekko is not None and
+                len(self._gekko.time) == number_timesteps):
+            return self._gekko, False
 
+        self.discard_model()
         m = GEKKO(remote=False)
         m.time = np.linspace(
             0, number_timesteps - 1, number_timesteps)
+        self._gekko = m
+        return m, True
+
+    def discard_model(self):
+        """remove the GEKKO model and its temporary run directory"""
+        if self._gekko is not None:
+            self._gekko.cleanup()
+        self._gekko = None
+        self._handles = {}
+
+    def _param(self, name, value):
+        """add a GEKKO Param to the model or update its value"""
+        if name in self._handles:
+            self._handles[name].value = value
+        else:
+            self._handles[name] = self._gekko.Param(value=value)
+        return self._handles[name]
+
+    def _var(self, name, value, **kwargs):
+        """add a GEKKO Var to the model or update its initial value"""
+        value = self._initial_guess(name, value)
+        if name in self._handles:
+            self._handles[name].value = value
+        else:
+            self._handles[name] = self._gekko.Var(value=value, **kwargs)
+        return self._handles[name]
+
+    def _initial_guess(self, name, value):
+        """initial value of a GEKKO Var over the horizon
+
+        Without a warm start this is the value of the first timestep
+        for the whole horizon. With a warm start the rest of the
+        horizon is the previous solution shifted by one hour, with its
+        final value repeated to fill the horizon.
+
+        Arguments:
+            name {str} -- name of variable
+            value {float} -- value of the first timestep
+
+        Returns:
+            float or list -- initial value of the variable
+        """
+        previous = self._previous_solution
+        if not self.warm_start or previous is None or name not in previous:
+            return value
+        shifted = previous[name][2:]
+        guess = np.full(len(self._gekko.time), previous[name][-1])
+        guess[0] = value
+        guess[1:len(shifted) + 1] = shifted[:len(guess) - 1]
+        return list(guess)
+
+    def _const(self, name, value):
+        """add a GEKKO Const to a new model"""
+        if name not in self._handles:
+            self._handles[name] = self._gekko.Const(value)
+        return self._handles[name]
+
+    def _intermediate(self, name, equation):
+        """add a GEKKO Intermediate to a new model"""
+        if name not in self._handles:
+            self._handles[name] = self._gekko.Intermediate(equation)
+        return self._handles[name]
+
+    def gekko_horizon(self, hour, final_hour, generation_total, cop, duty,
+                      HP_min, max_capacity, init_soc, prev_result):
+        """solve the horizon problem with GEKKO
+
+        Arguments:
+            hour {int} -- first hour of the horizon
+            final_hour {int} -- final hour of the horizon
+            generation_total {array} -- renewable generation over the year
+            cop {list} -- heat pump cop over the horizon
+            duty {list} -- heat pump duty over the horizon
+            HP_min {list} -- heat pump minimum output over the horizon
+            max_capacity {array} -- thermal storage capacity over the horizon
+            init_soc {float} -- initial thermal storage state of charge
+            prev_result {dict} -- results of the previous hour
+
+        Returns:
+            dict -- GEKKO variables and parameters of the solved model
+        """
+        number_timesteps = final_hour - hour
+        m, new = self.gekko_model(number_timesteps)
 
         # cost coefficient... import cost
-        IC = m.Param(
-            value=list(self.import_cost[hour:final_hour]))
+        IC = self._param('IC', list(self.import_cost[hour:final_hour]))
 
         # elec demand and res used for elec demand
         # renewable used
-        RES = m.Param(value=list(generation_total[hour:final_hour]))
-        RES_ed = m.Var(value=prev_result['RES_ed'], lb=0)
+        RES = self._param('RES', list(generation_total[hour:final_hour]))
+        RES_ed = self._var('RES_ed', prev_result['RES_ed'], lb=0)
         # elec demand
-        ed = m.Param(value=list(self.elec_demand[hour:final_hour].values))
+        ed = self._param('ed', list(self.elec_demand[hour:final_hour].values))
         # surplus = m.Param(value=surplus[hour:final_hour].values)
-        export = m.Var(value=prev_result['export'], lb=0)
+        export = self._var('export', prev_result['export'], lb=0)
         # import straight to electrical demand
-        imp_ed = m.Var(value=prev_result['imp_ed'], lb=0)
+        imp_ed = self._var('imp_ed', prev_result['imp_ed'], lb=0)
 
         # heat demand
-        hd = m.Param(value=list(self.heat_demand[hour:final_hour].values))
+        hd = self._param('hd', list(self.heat_demand[hour:final_hour].values))
 
         # heat pump output from renewables
         # heat pump renewable thermal output to demand
-        HPtrd = m.Var(value=prev_result['HPtrd'], lb=0)
+        HPtrd = self._var('HPtrd', prev_result['HPtrd'], lb=0)
         # heat pump renewable to storage
         # maximum charging to storage with renewables
-        HPtrs = m.Var(value=prev_result['HPtrs'], lb=0)
+        HPtrs = self._var('HPtrs', prev_result['HPtrs'], lb=0)
         # heat pump output from imports to demand
-        HPtid = m.Var(value=prev_result['HPtid'], lb=0)
+        HPtid = self._var('HPtid', prev_result['HPtid'], lb=0)
         # heat pump output from imports to storage
-        HPtis = m.Var(value=prev_result['HPtis'], lb=0)
+        HPtis = self._var('HPtis', prev_result['HPtis'], lb=0)
         # heat pump output from ES to demand
-        HPtesd = m.Var(value=prev_result['HPtis'], lb=0)
-        # performance of heat pump parameters
-        cop = []
-        duty = []
-        HP_min = []
-        for i in range(hour, final_hour):
-            if self.myHeatPump == 0:
-                duty.append(0.0)
-            else:
-                duty.append(hp_performance[i].duty)
-            cop.append(hp_performance[i].cop)
-            HP_min.append(
-                hp_performance[i].duty *
-                self.myHeatPump.minimum_output *
-                self.myHeatPump.minimum_runtime / 60 /
-                100.0)
-        cop = m.Param(value=cop)
-        duty = m.Param(value=duty)
-        HP_min = m.Param(value=HP_min)
+        HPtesd = self._var('HPtesd', prev_result['HPtis'], lb=0)
+        cop = self._param('cop', cop)
+        duty = self._param('duty', duty)
+        HP_min = self._param('HP_min', HP_min)
         # heat pump on/off status
-        HP_status = m.Var(
-            value=prev_result['HP_status'], lb=0, ub=1, integer=True)
+        HP_status = self._var(
+            'HP_status', prev_result['HP_status'], lb=0, ub=1, integer=True)
         # heat pump output without on/off status
-        HPt_var = m.Var(value=prev_result['HPt_var'], lb=0)
+        HPt_var = self._var('HPt_var', prev_result['HPt_var'], lb=0)
         # heat pump total output
-        HPt = m.Intermediate(HP_status * HPt_var)
+        HPt = self._intermediate('HPt', HP_status * HPt_var)
 
         # thermal storage parameters
         # max capacity
-        max_cap = m.Param(value=list(max_capacity[t1:t2]))
-        # initial state of charge
-        init_soc = self.myHotWaterTank.max_energy_in_out(
-            'discharging', prev_result['final_nodes_temp'],
-            st[hour], ft[hour], rt, hour)
+        max_cap = self._param('max_cap', list(max_capacity))
         # max_charge = m.Intermediate(max_cap - init_soc)
         # for clarity max discharge is simply the soc
         # storage charge/discharge
-        TSc = m.Var(value=prev_result['TSc'], lb=0)
-        TSd = m.Var(value=prev_result['TSd'], lb=0)
+        TSc = self._var('TSc', prev_result['TSc'], lb=0)
+        TSd = self._var('TSd', prev_result['TSd'], lb=0)
         # soc = m.Intermediate(init_soc + TSc - TSd)
-        soc = m.Var(value=init_soc, lb=0)
-        max_charge = m.Intermediate(max_cap - soc)
-        loss = m.Intermediate(0.01 * soc)
+        soc = self._var('soc', init_soc, lb=0)
+        max_charge = self._intermediate('max_charge', max_cap - soc)
+        loss = self._intermediate('loss', 0.01 * soc)
         # loss = m.Intermediate(0.0)
 
         # electrical storage parameters
         # max capacity
-        max_cap_ES = m.Const(self.myElectricalStorage.capacity)
-        max_charge_ES = m.Const(self.myElectricalStorage.charge_max)
-        max_discharge_ES = m.Const(self.myElectricalStorage.discharge_max)
-        charge_eff = m.Const(self.myElectricalStorage.charge_eff)
-        discharge_eff = m.Const(self.myElectricalStorage.discharge_eff)
+        max_cap_ES = self._const('max_cap_ES', self.myElectricalStorage.capacity)
+        max_charge_ES = self._const('max_charge_ES', self.myElectricalStorage.charge_max)
+        max_discharge_ES = self._const('max_discharge_ES', self.myElectricalStorage.discharge_max)
+        charge_eff = self._const('charge_eff', self.myElectricalStorage.charge_eff)
+        discharge_eff = self._const('discharge_eff', self.myElectricalStorage.discharge_eff)
         # for clarity max discharge is simply the soc
         # storage charge/discharge
-        ESc = m.Var(value=prev_result['ESc'], lb=0)
-        ESc_res = m.Var(value=prev_result['ESc_res'], lb=0)
-        ESc_imp = m.Var(value=prev_result['ESc_imp'], lb=0)
-        ESd = m.Var(value=prev_result['ESd'], lb=0)
-        ESd_hp = m.Var(value=prev_result['ESd_hp'], lb=0)
-        ESd_aux = m.Var(value=prev_result['ESd_aux'], lb=0)
-        ESd_ed = m.Var(value=prev_result['ESd_ed'], lb=0)
-        soc_ES = m.Var(value=prev_result['soc_ES'], lb=0)
-        loss_ES = m.Intermediate(self.myElectricalStorage.self_discharge * soc_ES)
+        ESc = self._var('ESc', prev_result['ESc'], lb=0)
+        ESc_res = self._var('ESc_res', prev_result['ESc_res'], lb=0)
+        ESc_imp = self._var('ESc_imp', prev_result['ESc_imp'], lb=0)
+        ESd = self._var('ESd', prev_result['ESd'], lb=0)
+        ESd_hp = self._var('ESd_hp', prev_result['ESd_hp'], lb=0)
+        ESd_aux = self._var('ESd_aux', prev_result['ESd_aux'], lb=0)
+        ESd_ed = self._var('ESd_ed', prev_result['ESd_ed'], lb=0)
+        soc_ES = self._var('soc_ES', prev_result['soc_ES'], lb=0)
+        loss_ES = self._intermediate(
+            'loss_ES', self.myElectricalStorage.self_discharge * soc_ES)
 
         # aux parameters
         # back-up electrical heater
@@ -244,103 +343,190 @@ class Scheduler(object):
         aux_cap = np.amax(self.heat_demand.values)
         # aux from renewables to demand
         # only electric aux
-        aux_rd = m.Var(value=prev_result['aux_rd'], lb=0)
+        aux_rd = self._var('aux_rd', prev_result['aux_rd'], lb=0)
         # only electric aux
         # aux from from renewables to storage
-        aux_rs = m.Var(value=prev_result['aux_rs'], lb=0)
+        aux_rs = self._var('aux_rs', prev_result['aux_rs'], lb=0)
         # aux for demand
-        aux_d = m.Var(value=prev_result['aux_d'], lb=0)
+        aux_d = self._var('aux_d', prev_result['aux_d'], lb=0)
         # aux for storage
-        aux_s = m.Var(value=prev_result['aux_s'], lb=0)
+        aux_s = self._var('aux_s', prev_result['aux_s'], lb=0)
         # aux_cap = 1000
-        aux = m.Var(value=prev_result['aux'], lb=0)
+        aux = self._var('aux', prev_result['aux'], lb=0)
 
         if self.myAux.fuel == Fuel.ELECTRIC:
-            aux_cost = m.Param(
-                value=list(self.import_cost[hour:final_hour]))
+            aux_cost = self._param(
+                'aux_cost', list(self.import_cost[hour:final_hour]))
         else:
-            aux_cost = m.Const(self.myAux.cost)
+            aux_cost = self._const('aux_cost', self.myAux.cost)
 
-        # equations
+        # equations, objective and options are only added to a new model,
+        # a reused model keeps them and only has its values updated
+        if new:
+            # equations
 
-        # different for electric since it can use RES production
-        if self.myAux.fuel == Fuel.ELECTRIC:
-            # equalities
-            m.Equations(
-                [soc_ES.dt() == ESc * charge_eff - ESd - loss_ES,
-                 ESd == ESd_ed + ESd_hp + ESd_aux,
-                 ESc == ESc_res + ESc_imp,
-                 ed == RES_ed + imp_ed + ESd_ed * discharge_eff,
-                 hd == HPtrd + HPtid + HPtesd + aux_d + aux_rd + ESd_aux * discharge_eff + TSd,
-                 soc.dt() == TSc - TSd - loss,
-                 HPtesd == ESd_hp * cop * discharge_eff,
-                 HP_status * HPt_var == HPtrs + HPtrd + HPtid + HPtis + HPtesd,
-                 aux == aux_d + aux_s + aux_rd + aux_rs + ESd_aux,
-                 TSc == HPtrs + HPtis + aux_rs + aux_s,
-                 RES == RES_ed + (HPtrs + HPtrd) / cop + ESc_res + aux_rd + aux_rs + export
-                 ])
-        # other auxiliary sources can't use the RES
-        else:
-            # equalities
+            # different for electric since it can use RES production
+            if self.myAux.fuel == Fuel.ELECTRIC:
+                # equalities
+                m.Equations(
+                    [soc_ES.dt() == ESc * charge_eff - ESd - loss_ES,
+                     ESd == ESd_ed + ESd_hp + ESd_aux,
+                     ESc == ESc_res + ESc_imp,
+                     ed == RES_ed + imp_ed + ESd_ed * discharge_eff,
+                     hd == HPtrd + HPtid + HPtesd + aux_d + aux_rd + ESd_aux * discharge_eff + TSd,
+                     soc.dt() == TSc - TSd - loss,
+                     HPtesd == ESd_hp * cop * discharge_eff,
+                     HP_status * HPt_var == HPtrs + HPtrd + HPtid + HPtis + HPtesd,
+                     aux == aux_d + aux_s + aux_rd + aux_rs + ESd_aux,
+                     TSc == HPtrs + HPtis + aux_rs + aux_s,
+                     RES == RES_ed + (HPtrs + HPtrd) / cop + ESc_res + aux_rd + aux_rs + export
+                     ])
+            # other auxiliary sources can't use the RES
+            else:
+                # equalities
+                m.Equations(
+                    # heat demand must be met,
+                    # but can be exceeded if needed to store more
+                    [soc_ES.dt() == ESc * charge_eff - ESd - loss_ES,
+                     ESd == ESd_ed,
+                     ESc == ESc_res + ESc_imp,
+                     ed == RES_ed + imp_ed + ESd_ed * discharge_eff,
+                     hd == HPtrd + HPtid + aux_d + TSd,
+                     soc.dt() == TSc - TSd - loss,
+                     HP_status * HPt_var == HPtrs + HPtrd + HPtid + HPtis,
+                     aux == aux_d + aux_s,
+                     TSc == HPtrs + HPtis + aux_s,
+                     RES == RES_ed + (HPtrs + HPtrd) / cop + ESc_res + export
+                     ])
+
+            # inequalities
             m.Equations(
-                # heat demand must be met,
-                # but can be exceeded if needed to store more
-                [soc_ES.dt() == ESc * charge_eff - ESd - loss_ES,
-                 ESd == ESd_ed,
-                 ESc == ESc_res + ESc_imp,
-                 ed == RES_ed + imp_ed + ESd_ed * discharge_eff,
-                 hd == HPtrd + HPtid + aux_d + TSd,
-                 soc.dt() == TSc - TSd - loss,
-                 HP_status * HPt_var == HPtrs + HPtrd + HPtid + HPtis,
-                 aux == aux_d + aux_s,
-                 TSc == HPtrs + HPtis + aux_s,
-                 RES == RES_ed + (HPtrs + HPtrd) / cop + ESc_res + export
-                 ])
-
-        # inequalities
-        m.Equations(
-            [HPt_var <= duty,
-             HPt_var >= HP_min,
-             soc <= max_cap,
-             TSc <= max_charge,
-             TSd <= soc,
-             soc_ES <= max_cap_ES,
-             ESc <= max_charge_ES * charge_eff,
-             ESd <= max_discharge_ES,
-             ESd <= soc_ES,
-             aux <= aux_cap])
-
-        # self.export_cost = 1
-        # objective
-        # last term is to disadvantage charging e store with res
-        m.Obj(IC / 1000 *
-              ((HPt - HPtrd - HPtesd - HPtrs) / cop +
-               imp_ed + ESc_imp) +
-              (aux - aux_rs - aux_rd - ESd_aux) * aux_cost / 1000 -
-              export * self.export_cost / 1000 + 0.00001 * ESc_res)
-
-        m.options.IMODE = 6  # MPC mode
-        m.options.SOLVER = 1  # APOPT for solving MINLP problems
-        if self.myHeatPump.minimum_output == 0:
-            i = 'minlp_as_nlp 1'
-        else:
-            i = 'minlp_as_nlp 0'
-        m.solver_options = ['minlp_maximum_iterations 500', \
-                            # minlp iterations with integer solution
-                            'minlp_max_iter_with_int_sol 500', \
-                            # treat minlp as nlp
-                            'minlp_as_nlp 1', \
-                            # nlp sub-problem max iterations
-                            'nlp_maximum_iterations 500', \
-                            # 1 = depth first, 2 = breadth first
-                            'minlp_branch_method 1', \
-                            # maximum deviation from whole number
-                            'minlp_integer_tol 0.05', \
-                            # covergence tolerance
-                            'minlp_gap_tol 0.05']
+                [HPt_var <= duty,
+                 HPt_var >= HP_min,
+                 soc <= max_cap,
+                 TSc <= max_charge,
+                 TSd <= soc,
+                 soc_ES <= max_cap_ES,
+                 ESc <= max_charge_ES * charge_eff,
+                 ESd <= max_discharge_ES,
+                 ESd <= soc_ES,
+                 aux <= aux_cap])
+
+            # self.export_cost = 1
+            # objective
+            # last term is to disadvantage charging e store with res
+            m.Obj(IC / 1000 *
+                  ((HPt - HPtrd - HPtesd - HPtrs) / cop +
+                   imp_ed + ESc_imp) +
+                  (aux - aux_rs - aux_rd - ESd_aux) * aux_cost / 1000 -
+                  export * self.export_cost / 1000 + 0.00001 * ESc_res)
+
+            m.options.IMODE = 6  # MPC mode
+            m.options.SOLVER = 1  # APOPT for solving MINLP problems
+            if self.myHeatPump.minimum_output == 0:
+                i = 'minlp_as_nlp 1'
+            else:
+                i = 'minlp_as_nlp 0'
+            m.solver_options = ['minlp_maximum_iterations 500', \
+                                # minlp iterations with integer solution
+                                'minlp_max_iter_with_int_sol 500', \
+                                # treat minlp as nlp
+                                'minlp_as_nlp 1', \
+                                # nlp sub-problem max iterations
+                                'nlp_maximum_iterations 500', \
+                                # 1 = depth first, 2 = breadth first
+                                'minlp_branch_method 1', \
+                                # maximum deviation from whole number
+                                'minlp_integer_tol 0.05', \
+                                # covergence tolerance
+                                'minlp_gap_tol 0.05']
+            # a reused model is solved from the values written for each
+            # hour rather than the previous solution shifted in time
+            m.options.TIME_SHIFT = 0
 
         m.solve(disp=False)
 
+        return self._handles
+
+    def solve(self, pre_calc, hour, first_hour, final_hour, prev_result):
+
+        # over the whole year
+        hp_performance: PerformanceArray = pre_calc['hp_performance']
+        surplus = pre_calc['surplus']
+        deficit = pre_calc['deficit']
+        match = pre_calc['match']
+        generation_total = pre_calc['generation_total']
+        wind = pre_calc['wind']
+        PV = pre_calc['PV']
+
+        # over the first hour to final hour plus horizon
+        # indexed from 0 to final hour plus horizon
+        max_capacity = pre_calc['max_capacity']
+
+        # temp parameters
+        rt = self.return_temp
+        st = self.source_temp
+        ft = self.flow_temp
+        sdt = self.source_delta_t
+
+        t1 = hour - first_hour
+        t2 = final_hour - first_hour
+
+        # performance of heat pump parameters
+        cop = []
+        duty = []
+        HP_min = []
+        for i in range(hour, final_hour):
+            if self.myHeatPump == 0:
+                duty.append(0.0)
+            else:
+                duty.append(hp_performance[i].duty)
+            cop.append(hp_performance[i].cop)
+            HP_min.append(
+                hp_performance[i].duty *
+                self.myHeatPump.minimum_output *
+                self.myHeatPump.minimum_runtime / 60 /
+                100.0)
+        # initial state of charge
+        init_soc = self.myHotWaterTank.max_energy_in_out(
+            'discharging', prev_result['final_nodes_temp'],
+            st[hour], ft[hour], rt, hour)
+
+        then = time.perf_counter()
+        if self.backend == Backend.HIGHS:
+            if self.myAux.fuel == Fuel.ELECTRIC:
+                aux_cost = self.import_cost[hour:final_hour]
+            else:
+                aux_cost = self.myAux.cost
+            v = self.myLinearHorizon.solve(
+                self.import_cost[hour:final_hour],
+                generation_total[hour:final_hour],
+                self.elec_demand[hour:final_hour].values,
+                self.heat_demand[hour:final_hour].values,
+                cop, duty, HP_min, max_capacity[t1:t2], aux_cost,
+                init_soc, prev_result['soc_ES'], prev_result)
+            iterations = self.myLinearHorizon.iterations
+        else:
+            v = self.gekko_horizon(
+                hour, final_hour, generation_total, cop, duty, HP_min,
+                max_capacity[t1:t2], init_soc, prev_result)
+            iterations = self._gekko.options.ITERATIONS
+        solve_time = time.perf_counter() - then
+
+        # solution over the horizon
+        IC, hd = v['IC'], v['hd']
+        RES_ed, imp_ed, export = v['RES_ed'], v['imp_ed'], v['export']
+        HPt, HPt_var, HP_status = v['HPt'], v['HPt_var'], v['HP_status']
+        HPtrd, HPtrs, HPtid, HPtis, HPtesd = (
+            v['HPtrd'], v['HPtrs'], v['HPtid'], v['HPtis'], v['HPtesd'])
+        TSc, TSd = v['TSc'], v['TSd']
+        ESc, ESc_res, ESc_imp = v['ESc'], v['ESc_res'], v['ESc_imp']
+        ESd, ESd_ed, ESd_hp, ESd_aux = (
+            v['ESd'], v['ESd_ed'], v['ESd_hp'], v['ESd_aux'])
+        soc_ES = v['soc_ES']
+        aux, aux_d, aux_s, aux_rd, aux_rs = (
+            v['aux'], v['aux_d'], v['aux_s'], v['aux_rd'], v['aux_rs'])
+
         h = 1
 
         TSc_ = round(TSc[h] - TSd[h], 2)
@@ -525,6 +711,17 @@ class Scheduler(object):
         results['grid']['deficit'] = deficit[timestep]
         results['grid']['match'] = match[timestep]
 
+        # solver results
+        results['solver']['iterations'] = iterations
+        results['solver']['solve_time'] = solve_time
+
+        # keep the solution over the horizon for the next warm start
+        if self.warm_start:
+            self._previous_solution = {
+                name: np.array(list(v[name]), dtype=float)
+                for name in VARIABLES
+                if name in v and name not in WARM_START_EXCLUDED}
+
         next_results = {
             'HPt': HPt[h], 'HPtrs': HPtrs[h],
             'HPtrd': HPtrd[h], 'HPtid': HPtid[h],
@@ -553,7 +750,9 @@ class Scheduler(object):
             LOG.error(msg)
             raise ValueError(msg)
 
-        results = []
+        results = ResultsStore(
+            self.set_of_results(), timesteps,
+            self.myHotWaterTank.number_nodes)
         next_results = []
         for hour in tqdm(
                 range(first_hour, final_hour - 1),
@@ -637,6 +836,9 @@ class Scheduler(object):
                     results.append(r['results'])
                     next_results.append(r['next_results'])
                 except:
+                    # rebuild rather than reuse the model which failed
+                    self.discard_model()
+                    self._previous_solution = None
                     # prev_result = next_results[hour - first_hour - 1]
                     # r = self.solve(
                     #     pre_calc, hour, first_hour, final_horizon_hour,
@@ -666,13 +868,34 @@ class Scheduler(object):
                     results.append(r['results'])
                     next_results.append(r['next_results'])
 
-        # write the outputs to a pickle
-        file = self.root / OUTDIR / self.subname / 'outputs.pkl'
-        with open(file, 'wb') as output_file:
-            pickle.dump(results, output_file,
-                        protocol=pickle.HIGHEST_PROTOCOL)
-
-        return results
+        self.myHotWaterTank.log_cache_info(self.subname)
+        self.discard_model()
+        self._previous_solution = None
+        self.log_solver_stats(results.results())
+
+        # write the outputs to a binary file
+        results.save(self.root / OUTDIR / self.subname)
+
+        return results.results()
+
+    def log_solver_stats(self, results):
+        """write the horizon solve iterations and time to the log
+
+        Arguments:
+            results {np.ndarray} -- results with a row per hour
+        """
+        # the first hour is set rather than solved
+        solver = results['solver']
+        solved = solver[solver['solve_time'] > 0]
+        if not len(solved):
+            return
+        iterations = solved['iterations']
+        solve_time = solved['solve_time']
+        LOG.info(
+            f'{self.backend.value} horizon solves for {self.subname}: '
+            f'mean {np.mean(iterations):.1f} iterations, '
+            f'mean {np.mean(solve_time):.3f} s, '
+            f'total {np.sum(solve_time):.1f} s')
 
     def set_of_results(self):
 
@@ -766,6 +989,11 @@ class Scheduler(object):
                 'match': 0.0  #
                 }
 
+        # iterations and wall time of the horizon solve
+        solver = {'iterations': 0,
+                  'solve_time': 0.0
+                  }
+
         outputs = {'elec_demand': elec_demand,
                    'heat_demand': heat_demand,
                    'RES': RES,
@@ -773,6 +1001,7 @@ class Scheduler(object):
                    'TS': TS,
                    'aux': aux,
                    'ES': ES,
-                   'grid': grid}
+                   'grid': grid,
+                   'solver': solver}
 
         return outputs
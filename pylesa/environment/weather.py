@@ -39,7 +39,7 @@ class Weather(object):
                      'GHI': 'ghi',
                      'DNI': 'dni'})
         PV_weather = PV_weather.dropna(axis='columns')
-        PV_weather.index = t.timeindex()
+        PV_weather.index = t.timeindex(PV_weather)
 
         return PV_weather
 
@@ -71,7 +71,7 @@ class Weather(object):
         HP_resource = pd.concat([self.air_temperature,
                                  self.water_temperature],
                                 axis=1)
-        HP_resource.index = t.timeindex()
+        HP_resource.index = t.timeindex(HP_resource)
 
         return HP_resource
 
@@ -24,47 +24,12 @@ def init(root: Path, subname: str) -> Dict[str, object]:
         subname: name of specific parametric run configuration
 
     Returns:
-        Dictionary of initialised objects
+        Dictionary of initialised objects, the renewables are the same
+        for every combination so are initialised by init_renewables
     """
     myInputs = inputs.Inputs(root, subname)
-
-    # initialise instance of classes
-    input_windturbine = myInputs.windturbine_user()
     input_weather = myInputs.weather()
 
-    myUserWindturbine = renewables.Windturbine(
-        turbine_name=input_windturbine['turbine_name'],
-        hub_height=input_windturbine['hub_height'],
-        rotor_diameter=input_windturbine['rotor_diameter'],
-        multiplier=input_windturbine['multiplier'],
-        nominal_power=input_windturbine['nominal_power'],
-        power_curve=input_windturbine['power_curve'],
-        weather_input=input_weather)
-
-    input_windturbine = myInputs.windturbine_database()
-
-    myDatabaseWindturbine = renewables.Windturbine(
-        turbine_name=input_windturbine['turbine_name'],
-        hub_height=input_windturbine['hub_height'],
-        rotor_diameter=input_windturbine['rotor_diameter'],
-        multiplier=input_windturbine['multiplier'],
-        weather_input=input_weather)
-
-    input_PV_model = myInputs.PV_model()
-
-    myPV = renewables.PV(
-        module_name=input_PV_model['module_name'],
-        inverter_name=input_PV_model['inverter_name'],
-        multiplier=input_PV_model['multiplier'],
-        surface_tilt=input_PV_model['surface_tilt'],
-        surface_azimuth=input_PV_model['surface_azimuth'],
-        surface_type=input_PV_model['surface_type'],
-        loc_name=input_PV_model['loc_name'],
-        latitude=input_PV_model['latitude'],
-        longitude=input_PV_model['longitude'],
-        altitude=input_PV_model['altitude'],
-        weather_input=input_weather)
-
     ts_inputs = myInputs.hot_water_tank()
 
     myHotWaterTank = hot_water_tank.HotWaterTank(
@@ -75,7 +40,9 @@ def init(root: Path, subname: str) -> Dict[str, object]:
         ts_inputs['dimensions'],
         ts_inputs['tank_openings'],
         ts_inputs['correction_factors'],
-        air_temperature=input_weather)
+        air_temperature=input_weather,
+        integrator=ts_inputs['integrator'],
+        step_tolerance=ts_inputs['step_tolerance'])
 
     # Setup heat pump class
     inputs_basics = myInputs.heatpump_basics()
@@ -137,6 +104,79 @@ def init(root: Path, subname: str) -> Dict[str, object]:
         aux_inputs['efficiency'],
         aux_inputs['fuel_info'])
 
+    myGrid = init_grid(root, subname, myInputs)
+
+    dict = {'myHotWaterTank': myHotWaterTank,
+            'myHeatPump': myHeatPump,
+            'myElectricalStorage': myElectricalStorage,
+            'myAux': myAux,
+            'myGrid': myGrid}
+
+    return dict
+
+
+def init_renewables(myInputs: inputs.Inputs) -> Dict[str, object]:
+    """Initialise the wind turbines and PV
+
+    Args:
+        myInputs: inputs of the run or of a combination
+
+    Returns:
+        Dictionary of initialised objects
+    """
+    # initialise instance of classes
+    input_windturbine = myInputs.windturbine_user()
+    input_weather = myInputs.weather()
+
+    myUserWindturbine = renewables.Windturbine(
+        turbine_name=input_windturbine['turbine_name'],
+        hub_height=input_windturbine['hub_height'],
+        rotor_diameter=input_windturbine['rotor_diameter'],
+        multiplier=input_windturbine['multiplier'],
+        nominal_power=input_windturbine['nominal_power'],
+        power_curve=input_windturbine['power_curve'],
+        weather_input=input_weather)
+
+    input_windturbine = myInputs.windturbine_database()
+
+    myDatabaseWindturbine = renewables.Windturbine(
+        turbine_name=input_windturbine['turbine_name'],
+        hub_height=input_windturbine['hub_height'],
+        rotor_diameter=input_windturbine['rotor_diameter'],
+        multiplier=input_windturbine['multiplier'],
+        weather_input=input_weather)
+
+    input_PV_model = myInputs.PV_model()
+
+    myPV = renewables.PV(
+        module_name=input_PV_model['module_name'],
+        inverter_name=input_PV_model['inverter_name'],
+        multiplier=input_PV_model['multiplier'],
+        surface_tilt=input_PV_model['surface_tilt'],
+        surface_azimuth=input_PV_model['surface_azimuth'],
+        surface_type=input_PV_model['surface_type'],
+        loc_name=input_PV_model['loc_name'],
+        latitude=input_PV_model['latitude'],
+        longitude=input_PV_model['longitude'],
+        altitude=input_PV_model['altitude'],
+        weather_input=input_weather)
+
+    return {'myUserWindturbine': myUserWindturbine,
+            'myDatabaseWindturbine': myDatabaseWindturbine,
+            'myPV': myPV}
+
+
+def init_grid(root: Path, subname: str, myInputs: inputs.Inputs) -> grid.Grid:
+    """Initialise the grid with the chosen tariff
+
+    Args:
+        root: root directory of simulation
+        subname: name of specific parametric run configuration
+        myInputs: inputs of the run or of a combination
+
+    Returns:
+        Initialised grid
+    """
     grid_inputs = myInputs.grid()
     export = grid_inputs['export']
     tariff_choice = grid_inputs['tariff_choice']
@@ -213,13 +253,4 @@ def init(root: Path, subname: str) -> Dict[str, object]:
             higher_percent=higher_percent, higher_discount=higher_discount,
             lower_penalty=lower_penalty)
 
-    dict = {'myUserWindturbine': myUserWindturbine,
-            'myDatabaseWindturbine': myDatabaseWindturbine,
-            'myPV': myPV,
-            'myHotWaterTank': myHotWaterTank,
-            'myHeatPump': myHeatPump,
-            'myElectricalStorage': myElectricalStorage,
-            'myAux': myAux,
-            'myGrid': myGrid}
-
-    return dict
+    return myGrid
@@ -4,19 +4,104 @@ reads input pickle files for use in other modules
 """
 import logging
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 import pandas as pd
 
 from ..constants import INDIR
 from ..heat.enums import HP, ModelName, DataInput
+from ..storage.enums import Integrator
 
 LOG = logging.getLogger(__name__)
 
+# inputs read from the Excel workbook, shared by every combination
+BASE_FILE = 'inputs.pkl'
+# key of a combination pickle naming the base file it overlays
+BASE_KEY = '__base__'
+
+
+# containers read in this process with the modification time and size
+# of their file when read
+_CACHE: Dict[Path, Tuple[Tuple[int, int], Mapping]] = {}
+
+
+def read(path: Path) -> Mapping:
+    """input container of a pickle, read once per process
+
+    A container is read again when the modification time or size of
+    its file changes. The container is shared by every caller and is
+    returned as a read-only mapping, copy any entry before changing it.
+
+    Arguments:
+        path {Path} -- path of the inputs pickle
+
+    Returns:
+        Mapping -- input container
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    container = MappingProxyType(pd.read_pickle(path))
+    _CACHE[path] = (stamp, container)
+    return container
+
+
+def load_base(path: Path) -> Mapping:
+    """base inputs, see read
+
+    Arguments:
+        path {Path} -- path of the base inputs pickle
+
+    Returns:
+        Mapping -- input container
+    """
+    return read(path)
+
+
+def clear_cache(path: Optional[Path] = None):
+    """forget containers read so far, e.g. after rewriting them
+
+    Keyword Arguments:
+        path {Path} -- forget only this file (default: {None}, all)
+    """
+    if path is None:
+        _CACHE.clear()
+    else:
+        _CACHE.pop(Path(path).resolve(), None)
+
+
+def load(root: Path, subname: str) -> Mapping:
+    """inputs of a combination
+
+    A combination pickle holds only the entries which differ from the
+    base inputs, these replace the entries of the base. Pickles without
+    a base are complete containers, as written by older versions.
+
+    Arguments:
+        root {Path} -- output directory of the run
+        subname {str} -- name of the combination
+
+    Returns:
+        Mapping -- read-only input container
+    """
+    folder = Path(root).resolve() / INDIR
+    container = read(folder / (subname + '.pkl'))
+    base = container.get(BASE_KEY)
+    if base is None:
+        return container
+    merged = dict(read(folder / base))
+    merged.update(container)
+    del merged[BASE_KEY]
+    return MappingProxyType(merged)
+
+
 class Inputs(object):
 
     def __init__(self, root: Path, subname: str):
-        self.container = pd.read_pickle(
-            Path(root).resolve() / INDIR / (subname + '.pkl')
-        )
+        self.container = load(root, subname)
 
     def controller(self):
 
@@ -64,7 +149,7 @@ class Inputs(object):
     def windturbine_user(self):
 
         wind_user = self.container['wind_user']
-        power_curve = self.container['power_curve']
+        power_curve = self.container['power_curve'].copy()
 
         # create two dicts for holding csv data
         myTurbine = wind_user.to_dict('list')
@@ -350,13 +435,30 @@ class Inputs(object):
         correction_factors = {'insulation_factor': ts['insulation_factor'][0],
                               'overall_factor': ts['overall_factor'][0]}
 
+        # optional input, older input sheets do not include the integrator
+        integrator = Integrator.ODEINT
+        if 'integrator' in ts and not pd.isna(ts['integrator'][0]):
+            _integrator = str(ts['integrator'][0]).upper().strip()
+            if _integrator not in Integrator:
+                msg = f"Thermal storage integrator {_integrator} is not one of {[_.value for _ in Integrator]}"
+                LOG.error(msg)
+                raise ValueError(msg)
+            integrator = Integrator.from_value(_integrator)
+
+        # optional input, only set from the command line
+        step_tolerance = None
+        if 'step_tolerance' in ts and not pd.isna(ts['step_tolerance'][0]):
+            step_tolerance = float(ts['step_tolerance'][0])
+
         inputs = {'capacity': capacity,
                   'insulation': insulation,
                   'location': location,
                   'number_nodes': number_nodes,
                   'dimensions': dimensions,
                   'tank_openings': tank_openings,
-                  'correction_factors': correction_factors}
+                  'correction_factors': correction_factors,
+                  'integrator': integrator,
+                  'step_tolerance': step_tolerance}
 
         return inputs
 
@@ -12,6 +12,7 @@ from tqdm import tqdm
 from typing import Dict
 
 from . import inputs
+from .results import load_results
 from .. import tools as t
 from ..constants import INDIR, OUTDIR
 from ..heat.enums import Fuel
@@ -117,8 +118,7 @@ class Plot(object):
         # period can be 'Summer', 'Winter', 'Year', 'User'
         self.period = period
 
-        file_output_pickle = self.root / OUTDIR / subname / 'outputs.pkl'
-        self.results = pd.read_pickle(file_output_pickle)
+        self.results = load_results(self.root / OUTDIR / subname)
 
         self.myInputs = inputs.Inputs(self.root, subname)
         # controller inputs
@@ -173,21 +173,13 @@ class Plot(object):
         results = self.results
         timesteps = self.timesteps
 
-        HPt = []
-        aux = []
-        final_nodes_temp = []
-        IC = []
-        surplus = []
-        hd = []
-        export = []
-        for i in range(timesteps):
-            HPt.append(results[i]['HP']['heat_total_output'])
-            hd.append(results[i]['heat_demand']['heat_demand'])
-            aux.append(results[i]['aux']['demand'])
-            final_nodes_temp.append(results[i]['TS']['final_nodes_temp'])
-            IC.append(results[i]['grid']['import_price'])
-            surplus.append(results[i]['grid']['surplus'])
-            export.append(results[i]['grid']['total_export'])
+        HPt = results['HP']['heat_total_output'][:timesteps]
+        hd = results['heat_demand']['heat_demand'][:timesteps]
+        aux = results['aux']['demand'][:timesteps]
+        final_nodes_temp = results['TS']['final_nodes_temp'][:timesteps]
+        IC = results['grid']['import_price'][:timesteps]
+        surplus = results['grid']['surplus'][:timesteps]
+        export = results['grid']['total_export'][:timesteps]
 
         pt = self.period_timesteps()
         first_hour = pt['first_hour']
@@ -236,30 +228,15 @@ class Plot(object):
         first_hour = self.first_hour
         final_hour = first_hour + timesteps
 
-        RES = []
-        ES = []
-        imp = []
-        dem = []
-        generation_total = []
-        wind = []
-        PV = []
-        elec_demand = []
-        HP = []
-        aux = []
-        export = []
-
-        for i in range(timesteps):
-            RES.append(results[i]['elec_demand']['RES'])
-            ES.append(results[i]['elec_demand']['ES'])
-            imp.append(results[i]['elec_demand']['import'])
-            dem.append(results[i]['elec_demand']['elec_demand'])
-            generation_total.append(results[i]['RES']['generation_total'])
-            wind.append(results[i]['RES']['wind'])
-            PV.append(results[i]['RES']['PV'])
-            elec_demand.append(results[i]['RES']['elec_demand'])
-            HP.append(results[i]['RES']['HP'])
-            aux.append(results[i]['RES']['aux'])
-            export.append(results[i]['RES']['export'])
+        RES = results['elec_demand']['RES'][:timesteps]
+        ES = results['elec_demand']['ES'][:timesteps]
+        imp = results['elec_demand']['import'][:timesteps]
+        wind = results['RES']['wind'][:timesteps]
+        PV = results['RES']['PV'][:timesteps]
+        elec_demand = results['RES']['elec_demand'][:timesteps]
+        HP = results['RES']['HP'][:timesteps]
+        aux = results['RES']['aux'][:timesteps]
+        export = results['RES']['export'][:timesteps]
 
         pt = self.period_timesteps()
         first_hour = pt['first_hour']
@@ -318,49 +295,20 @@ class Plot(object):
         first_hour = self.first_hour
         final_hour = first_hour + timesteps
 
-        HP = []
-        TS = []
-        aux = []
-        hd = []
-
-        heat_to_heat_demand = []
-        heat_to_TS = []
-        heat_total_output = []
-
-        elec_total_usage = []
-        elec_RES_usage = []
-        elec_ES_usage = []
-        elec_import_usage = []
-
-        cop = []
-        duty = []
-
-        for i in range(timesteps):
-            HP.append(results[i]['heat_demand']['HP'])
-            TS.append(results[i]['heat_demand']['TS'])
-            aux.append(
-                results[i]['heat_demand']['heat_demand'] -
-                results[i]['heat_demand']['HP'] -
-                results[i]['heat_demand']['TS'])
-            hd.append(results[i]['heat_demand']['heat_demand'])
-            heat_to_heat_demand.append(
-                results[i]['HP']['heat_to_heat_demand'])
-            heat_to_TS.append(
-                results[i]['HP']['heat_to_TS'])
-            heat_total_output.append(
-                results[i]['HP']['heat_total_output'])
-            elec_total_usage.append(
-                results[i]['HP']['elec_total_usage'])
-            elec_RES_usage.append(
-                results[i]['HP']['elec_RES_usage'])
-            elec_ES_usage.append(
-                results[i]['HP']['elec_from_ES_to_demand'])
-            elec_import_usage.append(
-                results[i]['HP']['elec_import_usage'])
-            cop.append(
-                results[i]['HP']['cop'])
-            duty.append(
-                results[i]['HP']['duty'])
+        HP = results['heat_demand']['HP'][:timesteps]
+        TS = results['heat_demand']['TS'][:timesteps]
+        hd = results['heat_demand']['heat_demand'][:timesteps]
+        aux = hd - HP - TS
+
+        heat_to_heat_demand = results['HP']['heat_to_heat_demand'][:timesteps]
+        heat_to_TS = results['HP']['heat_to_TS'][:timesteps]
+
+        elec_RES_usage = results['HP']['elec_RES_usage'][:timesteps]
+        elec_ES_usage = results['HP']['elec_from_ES_to_demand'][:timesteps]
+        elec_import_usage = results['HP']['elec_import_usage'][:timesteps]
+
+        cop = results['HP']['cop'][:timesteps]
+        duty = results['HP']['duty'][:timesteps]
 
         pt = self.period_timesteps()
         first_hour = pt['first_hour']
@@ -435,14 +383,9 @@ class Plot(object):
         first_hour = self.first_hour
         final_hour = first_hour + timesteps
 
-        charging_total = []
-        discharging_total = []
-        final_nodes_temp = []
-
-        for i in range(timesteps):
-            charging_total.append(results[i]['TS']['charging_total'])
-            discharging_total.append(results[i]['TS']['discharging_total'])
-            final_nodes_temp.append(results[i]['TS']['final_nodes_temp'])
+        charging_total = results['TS']['charging_total'][:timesteps]
+        discharging_total = results['TS']['discharging_total'][:timesteps]
+        final_nodes_temp = results['TS']['final_nodes_temp'][:timesteps]
 
         pt = self.period_timesteps()
         first_hour = pt['first_hour']
@@ -497,26 +440,15 @@ class Plot(object):
         first_hour = self.first_hour
         final_hour = first_hour + timesteps
 
-        ES_to_demand = []
-        ES_to_HP_to_demand = []
-        RES_to_ES = []
-        import_for_ES = []
-        soc = []
-        IC = []
-        surplus = []
-        export = []
-        # dem = []
-
-        for i in range(timesteps):
-            ES_to_demand.append(-1 * results[i]['ES']['discharging_to_demand'])
-            ES_to_HP_to_demand.append(-1 * results[i]['ES']['discharging_to_HP'])
-            RES_to_ES.append(results[i]['ES']['charging_from_RES'])
-            import_for_ES.append(results[i]['ES']['charging_from_import'])
-            soc.append(results[i]['ES']['final_soc'])
-            IC.append(results[i]['grid']['import_price'])
-            surplus.append(results[i]['grid']['surplus'])
-            export.append(results[i]['grid']['total_export'])
-            # dem.append(results[i]['elec_demand']['elec_demand'])
+        ES_to_demand = -1 * results['ES']['discharging_to_demand'][:timesteps]
+        ES_to_HP_to_demand = -1 * results['ES']['discharging_to_HP'][:timesteps]
+        RES_to_ES = results['ES']['charging_from_RES'][:timesteps]
+        import_for_ES = results['ES']['charging_from_import'][:timesteps]
+        soc = results['ES']['final_soc'][:timesteps]
+        IC = results['grid']['import_price'][:timesteps]
+        surplus = results['grid']['surplus'][:timesteps]
+        export = results['grid']['total_export'][:timesteps]
+        # dem = results['elec_demand']['elec_demand'][:timesteps]
 
         pt = self.period_timesteps()
         first_hour = pt['first_hour']
@@ -567,16 +499,10 @@ class Plot(object):
         first_hour = self.first_hour
         final_hour = first_hour + timesteps
 
-        total_export = []
-        total_import = []
-        import_price = []
-        cashflow = []
-
-        for i in range(timesteps):
-            total_export.append(results[i]['grid']['total_export'])
-            total_import.append(results[i]['grid']['total_import'])
-            import_price.append(results[i]['grid']['import_price'])
-            cashflow.append(results[i]['grid']['cashflow'])
+        total_export = results['grid']['total_export'][:timesteps]
+        total_import = results['grid']['total_import'][:timesteps]
+        import_price = results['grid']['import_price'][:timesteps]
+        cashflow = results['grid']['cashflow'][:timesteps]
 
         pt = self.period_timesteps()
         first_hour = pt['first_hour']
@@ -621,14 +547,9 @@ class Plot(object):
         results = self.results
         timesteps = self.timesteps
 
-        PV = np.zeros(timesteps)
-        wind = np.zeros(timesteps)
-        RES = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            RES[i] = results[i]['RES']['generation_total']
-            wind[i] = results[i]['RES']['wind']
-            PV[i] = results[i]['RES']['PV']
+        PV = results['RES']['PV'][:timesteps]
+        wind = results['RES']['wind'][:timesteps]
+        RES = results['RES']['generation_total'][:timesteps]
 
         wind_monthly = t.sum_monthly(wind)
         wind_year = round(wind.sum() / 1000, 2)
@@ -677,9 +598,43 @@ class Plot(object):
         plt.close()
 
 
+# series of the results used by the KPIs, {name: (group, field)}
+KPI_SERIES = {
+    'HPt': ('HP', 'heat_total_output'),
+    'HPe': ('HP', 'elec_total_usage'),
+    'HPe_RES': ('HP', 'elec_RES_usage'),
+    'HPe_import': ('HP', 'elec_import_usage'),
+    'cop': ('HP', 'cop'),
+    'hd': ('heat_demand', 'heat_demand'),
+    'ed': ('elec_demand', 'elec_demand'),
+    'ed_RES': ('RES', 'elec_demand'),
+    'ed_import': ('grid', 'import_for_elec_demand'),
+    'aux': ('aux', 'demand'),
+    'aux_RES': ('RES', 'aux'),
+    'aux_cost': ('aux', 'cost'),
+    'RES': ('RES', 'generation_total'),
+    'import': ('grid', 'total_import'),
+    'export': ('grid', 'total_export'),
+    'import_price': ('grid', 'import_price'),
+    'cashflow': ('grid', 'cashflow'),
+}
+
+# KPIs written to the csv files and plotted, in the order of the columns
+ECONOMIC_KPIS = [
+    'capital_cost', 'opex', 'cost_of_heat', 'cost_elec', 'lifetime_cost',
+    'levelised_cost_of_heat', 'levelised_cost_of_energy']
+TECHNICAL_KPIS = [
+    'local_RES_used', 'total_RES_self_consumption', 'grid_RES_used',
+    'total_RES_used', 'heat_met_RES', 'demand_met_RES', 'HP_met_RES',
+    'HP_size_ratio', 'HP_utilisation', 'days_storage_content']
+OUTPUT_KPIS = [
+    'sum_hp_output', 'sum_hp_usage', 'scop', 'sum_aux_output',
+    'sum_ed_import', 'sum_RES', 'sum_import', 'sum_export']
+
+
 class Calcs(object):
 
-    def __init__(self, root: Path, subname: str, results: Dict[str, pd.DataFrame]):
+    def __init__(self, root: Path, subname: str, results: Dict[str, np.ndarray]):
 
         self.root = Path(root).resolve()
         self.folder_path = self.root / OUTDIR / subname
@@ -692,77 +647,67 @@ class Calcs(object):
         self.timesteps = controller_info['total_timesteps']
         self.first_hour = controller_info['first_hour']
 
+        # each series is extracted once and the KPIs are reductions of them
+        self.series = {
+            name: np.ascontiguousarray(
+                self.results[group][field][:self.timesteps])
+            for name, (group, field) in KPI_SERIES.items()}
+        self.electric_aux = self.myInputs.aux()['fuel'] == Fuel.ELECTRIC
+        self.RHI_info = self.myInputs.RHI()
+        # hours when the wind farm is above the higher band of the PPA
+        self._grid_RES_hours = None
+
+    def kpis(self):
+        """all of the KPIs of the combination
+
+        Returns:
+            dict -- KPIs by name, see ECONOMIC_KPIS, TECHNICAL_KPIS
+                and OUTPUT_KPIS
+        """
+        return {
+            'capital_cost': self.capital_cost(),
+            'opex': self.operating_cost(),
+            'cost_of_heat': self.cost_of_heat(),
+            'cost_elec': self.cost_elec(),
+            'lifetime_cost': self.lifetime_cost(),
+            'levelised_cost_of_heat': self.levelised_cost_of_heat(),
+            'levelised_cost_of_energy': self.levelised_cost_of_energy(),
+            'local_RES_used': self.RES_self_consumption(),
+            'total_RES_self_consumption': self.total_RES_self_consumption(),
+            'grid_RES_used': self.grid_RES_used(),
+            'total_RES_used': self.total_RES_used(),
+            'heat_met_RES': self.heat_met_RES(),
+            'demand_met_RES': self.demand_met_RES(),
+            'HP_met_RES': self.HP_met_RES(),
+            'HP_size_ratio': self.HP_size_ratio(),
+            'HP_utilisation': self.HP_utilisation(),
+            'days_storage_content': self.days_storage_content(),
+            'sum_hp_output': self.sum_hp_output(),
+            'sum_hp_usage': self.sum_hp_usage(),
+            'scop': self.calc_scop(),
+            'sum_aux_output': self.sum_aux_output(),
+            'sum_ed_import': self.sum_ed_import(),
+            'sum_RES': self.sum_RES(),
+            'sum_import': self.sum_import(),
+            'sum_export': self.sum_export(),
+        }
+
     # technical outputs
 
     def max_heat_pump_output(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        HPt = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            HPt[i] = results[i]['HP']['heat_total_output']
-
-        max_HPt = np.amax(HPt)
-
-        return max_HPt
+        return np.amax(self.series['HPt'])
 
     def max_heat_demand(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        hd = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            hd[i] = results[i]['heat_demand']['heat_demand']
-
-        max_hd = np.amax(hd)
-
-        return max_hd
+        return np.amax(self.series['hd'])
 
     def sum_aux_output(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        aux = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            aux[i] = results[i]['aux']['demand']
-
-        sum_aux = np.sum(aux)
-
-        return sum_aux
+        return np.sum(self.series['aux'])
 
     def sum_hp_output(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        HPt = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            HPt[i] = results[i]['HP']['heat_total_output']
-
-        sum_HPt = np.sum(HPt)
-
-        return sum_HPt
+        return np.sum(self.series['HPt'])
 
     def sum_hp_usage(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        HPe = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            HPe[i] = results[i]['HP']['elec_total_usage']
-
-        sum_HPe = np.sum(HPe)
-
-        return sum_HPe
+        return np.sum(self.series['HPe'])
 
     def calc_scop(self):
 
@@ -770,102 +715,25 @@ class Calcs(object):
         return scop
 
     def sum_hd(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        hd = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            hd[i] = results[i]['heat_demand']['heat_demand']
-
-        sum_hd = np.sum(hd)
-
-        return sum_hd
+        return np.sum(self.series['hd'])
 
     def sum_ed(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        ed = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            ed[i] = results[i]['elec_demand']['elec_demand']
-
-        sum_ed = np.sum(ed)
-
-        return sum_ed
+        return np.sum(self.series['ed'])
 
     def sum_ed_import(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        ed = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            ed[i] = results[i]['grid']['import_for_elec_demand']
-
-        sum_ed = np.sum(ed)
-
-        return sum_ed
+        return np.sum(self.series['ed_import'])
 
     def sum_ed_RES(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        ed = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            ed[i] = results[i]['RES']['elec_demand']
-
-        sum_ed = np.sum(ed)
-
-        return sum_ed
+        return np.sum(self.series['ed_RES'])
 
     def sum_import(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        imp = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            imp[i] = results[i]['grid']['total_import']
-
-        sum_imp = np.sum(imp)
-
-        return sum_imp
+        return np.sum(self.series['import'])
 
     def sum_export(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        exp = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            exp[i] = results[i]['grid']['total_export']
-
-        sum_exp = np.sum(exp)
-
-        return sum_exp
+        return np.sum(self.series['export'])
 
     def sum_RES(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        RES = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            RES[i] = results[i]['RES']['generation_total']
-
-        sum_RES = np.sum(RES)
-
-        return sum_RES
+        return np.sum(self.series['RES'])
 
     # technical KPIs
 
@@ -909,370 +777,63 @@ class Calcs(object):
 
         return _sum_RES
 
-    def grid_RES_used(self):
+    def grid_RES_hours(self):
+        """hours when imports are from the wind farm of a PPA tariff
 
-        subname = self.subname
+        Returns:
+            np.ndarray -- True when the wind farm power is at or above
+                the higher band, or None if the tariff has no PPA
+        """
+        if self._grid_RES_hours is not None:
+            return self._grid_RES_hours
 
-        results = self.results
-        timesteps = self.timesteps
-        # what is the discount price?
         grid_inputs = self.myInputs.grid()
-        export = grid_inputs['export']
-        tariff_choice = grid_inputs['tariff_choice']
-        balancing_mechanism = grid_inputs['balancing_mechanism']
-        grid_services = grid_inputs['grid_services']
-        tariff_choice = grid_inputs['tariff_choice']
-        balancing_mechanism = grid_inputs['balancing_mechanism']
-        grid_services = grid_inputs['grid_services']
-        variable_periods_year = grid_inputs['variable_periods_year']
-        premium = grid_inputs['wm_info']['premium']
-        maximum = grid_inputs['wm_info']['maximum']
-        lower_percent = grid_inputs['ppa_info']['lower_percent']
-        higher_percent = grid_inputs['ppa_info']['higher_percent']
-        lower_penalty = grid_inputs['ppa_info']['lower_penalty']
-        higher_discount = grid_inputs['ppa_info']['higher_discount']
-
-        if tariff_choice == 'Flat rates':
-
-            return 0.
-
-        elif tariff_choice == 'Variable periods':
-
-            return 0.
-
-        elif tariff_choice == 'Time of use - WM':
-
-            return 0.
-
-        elif tariff_choice == 'Time of use - PPA + FR':
-
-            fr = grid_inputs['flat_rates']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                flat_rate=fr, lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        elif tariff_choice == 'Time of use - PPA + WM':
-
-            twm = grid_inputs['wholesale_market']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                wholesale_market=twm, premium=premium,
-                maximum=maximum, lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        elif tariff_choice == 'Time of use - PPA + VP':
-
-            vp = grid_inputs['variable_periods']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                variable_periods=vp,
-                variable_periods_year=variable_periods_year,
-                lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        wind_farm = myGrid.wind_farm_info()
+        if grid_inputs['tariff_choice'] not in grid.PPA_TARIFFS:
+            return None
+
+        # shared by every combination of the run
+        wind_farm = grid.wind_farm_info(
+            self.root, self.subname,
+            grid_inputs['ppa_info']['lower_percent'],
+            grid_inputs['ppa_info']['higher_percent'])
         higher_band = wind_farm['higher_band']
-        power = wind_farm['power']
-
-        grid_RES_import = np.zeros(timesteps)
-        for i in range(timesteps):
-            if power[i] >= higher_band:
-                grid_RES_import[i] = (
-                    results[i]['grid']['total_import'])
-            else:
-                grid_RES_import[i] = 0.
-
-        return np.sum(grid_RES_import)
-
-    def heat_grid_RES_used(self):
+        power = np.asarray(wind_farm['power'])[:self.timesteps]
 
-        subname = self.subname
-
-        results = self.results
-        timesteps = self.timesteps
-        # what is the discount price?
-        grid_inputs = self.myInputs.grid()
-        export = grid_inputs['export']
-        tariff_choice = grid_inputs['tariff_choice']
-        balancing_mechanism = grid_inputs['balancing_mechanism']
-        grid_services = grid_inputs['grid_services']
-        tariff_choice = grid_inputs['tariff_choice']
-        balancing_mechanism = grid_inputs['balancing_mechanism']
-        grid_services = grid_inputs['grid_services']
-        variable_periods_year = grid_inputs['variable_periods_year']
-        premium = grid_inputs['wm_info']['premium']
-        maximum = grid_inputs['wm_info']['maximum']
-        lower_percent = grid_inputs['ppa_info']['lower_percent']
-        higher_percent = grid_inputs['ppa_info']['higher_percent']
-        lower_penalty = grid_inputs['ppa_info']['lower_penalty']
-        higher_discount = grid_inputs['ppa_info']['higher_discount']
-
-        if tariff_choice == 'Flat rates':
-
-            return 0.
-
-        elif tariff_choice == 'Variable periods':
-
-            return 0.
-
-        elif tariff_choice == 'Time of use - WM':
+        self._grid_RES_hours = power >= higher_band
+        return self._grid_RES_hours
 
+    def _sum_grid_RES(self, grid_RES_import):
+        # sum over the hours when imports are from the wind farm
+        hours = self.grid_RES_hours()
+        if hours is None:
             return 0.
+        return np.sum(np.where(hours, grid_RES_import, 0.))
 
-        elif tariff_choice == 'Time of use - PPA + FR':
-
-            fr = grid_inputs['flat_rates']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                flat_rate=fr, lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        elif tariff_choice == 'Time of use - PPA + WM':
-
-            twm = grid_inputs['wholesale_market']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                wholesale_market=twm, premium=premium,
-                maximum=maximum, lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        elif tariff_choice == 'Time of use - PPA + VP':
-
-            vp = grid_inputs['variable_periods']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                variable_periods=vp,
-                variable_periods_year=variable_periods_year,
-                lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        wind_farm = myGrid.wind_farm_info()
-        higher_band = wind_farm['higher_band']
-        power = wind_farm['power']
-
-        grid_RES_import = np.zeros(timesteps)
-        for i in range(timesteps):
-            if power[i] >= higher_band:
-                grid_RES_import[i] = (
-                    results[i]['aux']['demand'] - results[i]['RES']['aux'] +
-                    results[i]['HP']['elec_import_usage'])
-            else:
-                grid_RES_import[i] = 0.
+    def grid_RES_used(self):
+        return self._sum_grid_RES(self.series['import'])
 
-        return np.sum(grid_RES_import)
+    def heat_grid_RES_used(self):
+        s = self.series
+        return self._sum_grid_RES(
+            s['aux'] - s['aux_RES'] + s['HPe_import'])
 
     def heat_from_grid_RES(self):
-
-        subname = self.subname
-
-        results = self.results
-        timesteps = self.timesteps
-        # what is the discount price?
-        grid_inputs = self.myInputs.grid()
-        export = grid_inputs['export']
-        tariff_choice = grid_inputs['tariff_choice']
-        balancing_mechanism = grid_inputs['balancing_mechanism']
-        grid_services = grid_inputs['grid_services']
-        tariff_choice = grid_inputs['tariff_choice']
-        balancing_mechanism = grid_inputs['balancing_mechanism']
-        grid_services = grid_inputs['grid_services']
-        variable_periods_year = grid_inputs['variable_periods_year']
-        premium = grid_inputs['wm_info']['premium']
-        maximum = grid_inputs['wm_info']['maximum']
-        lower_percent = grid_inputs['ppa_info']['lower_percent']
-        higher_percent = grid_inputs['ppa_info']['higher_percent']
-        lower_penalty = grid_inputs['ppa_info']['lower_penalty']
-        higher_discount = grid_inputs['ppa_info']['higher_discount']
-
-        if tariff_choice == 'Flat rates':
-
-            return 0.
-
-        elif tariff_choice == 'Variable periods':
-
-            return 0.
-
-        elif tariff_choice == 'Time of use - WM':
-
-            return 0.
-
-        elif tariff_choice == 'Time of use - PPA + FR':
-
-            fr = grid_inputs['flat_rates']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                flat_rate=fr, lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        elif tariff_choice == 'Time of use - PPA + WM':
-
-            twm = grid_inputs['wholesale_market']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                wholesale_market=twm, premium=premium,
-                maximum=maximum, lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        elif tariff_choice == 'Time of use - PPA + VP':
-
-            vp = grid_inputs['variable_periods']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                variable_periods=vp,
-                variable_periods_year=variable_periods_year,
-                lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        wind_farm = myGrid.wind_farm_info()
-        higher_band = wind_farm['higher_band']
-        power = wind_farm['power']
-
-        grid_RES_import = np.zeros(timesteps)
-        for i in range(timesteps):
-            if power[i] >= higher_band:
-                grid_RES_import[i] = (
-                    results[i]['aux']['demand'] - results[i]['RES']['aux'] +
-                    results[i]['HP']['elec_import_usage'] *
-                    results[i]['HP']['cop'])
-            else:
-                grid_RES_import[i] = 0.
-
-        return np.sum(grid_RES_import)
+        s = self.series
+        return self._sum_grid_RES(
+            s['aux'] - s['aux_RES'] + s['HPe_import'] * s['cop'])
 
     def HP_from_grid_RES(self):
-
-        subname = self.subname
-
-        results = self.results
-        timesteps = self.timesteps
-        # what is the discount price?
-        grid_inputs = self.myInputs.grid()
-        export = grid_inputs['export']
-        tariff_choice = grid_inputs['tariff_choice']
-        balancing_mechanism = grid_inputs['balancing_mechanism']
-        grid_services = grid_inputs['grid_services']
-        tariff_choice = grid_inputs['tariff_choice']
-        balancing_mechanism = grid_inputs['balancing_mechanism']
-        grid_services = grid_inputs['grid_services']
-        variable_periods_year = grid_inputs['variable_periods_year']
-        premium = grid_inputs['wm_info']['premium']
-        maximum = grid_inputs['wm_info']['maximum']
-        lower_percent = grid_inputs['ppa_info']['lower_percent']
-        higher_percent = grid_inputs['ppa_info']['higher_percent']
-        lower_penalty = grid_inputs['ppa_info']['lower_penalty']
-        higher_discount = grid_inputs['ppa_info']['higher_discount']
-
-        if tariff_choice == 'Flat rates':
-
-            return 0.
-
-        elif tariff_choice == 'Variable periods':
-
-            return 0.
-
-        elif tariff_choice == 'Time of use - WM':
-
-            return 0.
-
-        elif tariff_choice == 'Time of use - PPA + FR':
-
-            fr = grid_inputs['flat_rates']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                flat_rate=fr, lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        elif tariff_choice == 'Time of use - PPA + WM':
-
-            twm = grid_inputs['wholesale_market']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                wholesale_market=twm, premium=premium,
-                maximum=maximum, lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        elif tariff_choice == 'Time of use - PPA + VP':
-
-            vp = grid_inputs['variable_periods']
-            myGrid = grid.Grid(
-                self.root, subname, export,
-                tariff_choice, balancing_mechanism, grid_services,
-                variable_periods=vp,
-                variable_periods_year=variable_periods_year,
-                lower_percent=lower_percent,
-                higher_percent=higher_percent, higher_discount=higher_discount,
-                lower_penalty=lower_penalty)
-
-        wind_farm = myGrid.wind_farm_info()
-        higher_band = wind_farm['higher_band']
-        power = wind_farm['power']
-
-        grid_RES_import = np.zeros(timesteps)
-        for i in range(timesteps):
-            if power[i] >= higher_band:
-                grid_RES_import[i] = (
-                    results[i]['HP']['elec_import_usage'] *
-                    results[i]['HP']['cop'])
-            else:
-                grid_RES_import[i] = 0.
-
-        return np.sum(grid_RES_import)
+        s = self.series
+        return self._sum_grid_RES(s['HPe_import'] * s['cop'])
 
     def heat_from_local_RES(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        aux_res = np.zeros(timesteps)
-        hp_res = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            aux_res[i] = results[i]['RES']['aux']
-            hp_res[i] = (
-                results[i]['HP']['elec_RES_usage'] *
-                results[i]['HP']['cop'])
-
-        tot = np.sum(aux_res) + np.sum(hp_res)
-
+        s = self.series
+        tot = np.sum(s['aux_RES']) + np.sum(s['HPe_RES'] * s['cop'])
         return tot
 
     def HP_from_local_RES(self):
-
-        results = self.results
-        timesteps = self.timesteps
-
-        hp_res = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            hp_res[i] = (
-                results[i]['HP']['elec_RES_usage'] *
-                results[i]['HP']['cop'])
-
-        tot = np.sum(hp_res)
-
+        s = self.series
+        tot = np.sum(s['HPe_RES'] * s['cop'])
         return tot
 
     def HP_total_RES_used(self):
@@ -1353,7 +914,7 @@ class Calcs(object):
         str = str.replace("_", " ")
         t = [int(s) for s in str.split() if s.isdigit()]
         HP_capacity = t[0]
-        RHI_info = self.myInputs.RHI()
+        RHI_info = self.RHI_info
 
         if RHI_info['tariff_type'] == 'Fixed':
             year_income = HP_eligble * RHI_info['fixed_rate'] / 100.
@@ -1410,47 +971,38 @@ class Calcs(object):
         # operating cost includes covering
         # electrical and thermal demand
 
-        results = self.results
-        timesteps = self.timesteps
-
-        cashflow = np.zeros(timesteps)
-        aux_cost = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            cashflow[i] = results[i]['grid']['cashflow']
-            aux_cost[i] = results[i]['aux']['cost'] / 1000.
+        cashflow = self.series['cashflow']
+        aux_cost = self.series['aux_cost'] / 1000.
 
         # different for electric aux/non electric aux
         # with electric aux cost included in import
 
-        if self.myInputs.aux()['fuel'] == Fuel.ELECTRIC:
+        if self.electric_aux:
             opex = np.sum(-cashflow)
         else:
             opex = np.sum(-cashflow) + np.sum(aux_cost)
 
         return opex / 1000
 
-    def cost_of_heat(self):
-
-        results = self.results
-        timesteps = self.timesteps
+    def heat_cost(self):
+        """cost of heat in each hour, imports for the heat pump and
+        electric auxiliary heater or the fuel of the auxiliary heater"""
+        s = self.series
+        heat_cost = (s['import'] - s['ed_import']) * s['import_price'] / 1000.
+        if not self.electric_aux:
+            heat_cost = heat_cost + s['aux_cost'] / 1000.
+        return heat_cost
+
+    def energy_cost(self):
+        """cost of electricity and auxiliary fuel in each hour"""
+        energy_cost = -self.series['cashflow'] / 1000.
+        if not self.electric_aux:
+            energy_cost = energy_cost + self.series['aux_cost'] / 1000
+        return energy_cost
 
-        heat_cost = np.zeros(timesteps)
-
-        if self.myInputs.aux()['fuel'] == Fuel.ELECTRIC:
-            for i in range(timesteps):
-                heat_cost[i] = (
-                    (results[i]['grid']['total_import'] -
-                     results[i]['grid']['import_for_elec_demand']) *
-                    results[i]['grid']['import_price'] / 1000.)
+    def cost_of_heat(self):
 
-        else:
-            for i in range(timesteps):
-                heat_cost[i] = (
-                    ((results[i]['grid']['total_import'] -
-                     results[i]['grid']['import_for_elec_demand']) *
-                     results[i]['grid']['import_price'] / 1000.) +
-                    results[i]['aux']['cost'] / 1000.)
+        heat_cost = self.heat_cost()
 
         # total heat output from aux and heatpump
         aux_tot = self.sum_aux_output()
@@ -1464,25 +1016,7 @@ class Calcs(object):
 
     def levelised_cost_of_heat(self):
 
-        results = self.results
-        timesteps = self.timesteps
-
-        heat_cost = np.zeros(timesteps)
-
-        if self.myInputs.aux()['fuel'] == Fuel.ELECTRIC:
-            for i in range(timesteps):
-                heat_cost[i] = (
-                    (results[i]['grid']['total_import'] -
-                     results[i]['grid']['import_for_elec_demand']) *
-                    results[i]['grid']['import_price'] / 1000.)
-
-        else:
-            for i in range(timesteps):
-                heat_cost[i] = (
-                    (results[i]['grid']['total_import'] -
-                     results[i]['grid']['import_for_elec_demand']) *
-                    results[i]['grid']['import_price'] / 1000. +
-                    results[i]['aux']['cost'] / 1000)
+        heat_cost = self.heat_cost()
 
         # capital cost + operating cost divided by total energy output
         capex = self.capital_cost() * 1000
@@ -1504,21 +1038,7 @@ class Calcs(object):
 
     def levelised_cost_of_energy(self):
 
-        results = self.results
-        timesteps = self.timesteps
-
-        cashflow = np.zeros(timesteps)
-
-        if self.myInputs.aux()['fuel'] == Fuel.ELECTRIC:
-            for i in range(timesteps):
-                cashflow[i] = (
-                    (-results[i]['grid']['cashflow'] / 1000.))
-
-        else:
-            for i in range(timesteps):
-                cashflow[i] = (
-                    (-results[i]['grid']['cashflow'] / 1000. +
-                     results[i]['aux']['cost'] / 1000))
+        cashflow = self.energy_cost()
 
         # capital cost + operating cost divided by total energy output
         capex = self.capital_cost() * 1000
@@ -1541,34 +1061,13 @@ class Calcs(object):
 
     def cost_elec(self):
 
-        results = self.results
-        timesteps = self.timesteps
-
-        elec_cost = np.zeros(timesteps)
-
-        for i in range(timesteps):
-            elec_cost[i] = (
-                (-results[i]['grid']['cashflow'] / 1000.))
+        elec_cost = -self.series['cashflow'] / 1000.
 
         return np.sum(elec_cost)
 
     def lifetime_cost(self):
 
-        results = self.results
-        timesteps = self.timesteps
-
-        energy_cost = np.zeros(timesteps)
-
-        if self.myInputs.aux()['fuel'] == Fuel.ELECTRIC:
-            for i in range(timesteps):
-                energy_cost[i] = (
-                    (-results[i]['grid']['cashflow'] / 1000.))
-
-        else:
-            for i in range(timesteps):
-                energy_cost[i] = (
-                    (-results[i]['grid']['cashflow'] / 1000. +
-                     results[i]['aux']['cost'] / 1000))
+        energy_cost = self.energy_cost()
 
         # capital cost + operating cost divided by total energy output
         capex = self.capital_cost()
@@ -1601,8 +1100,7 @@ class ThreeDPlots(object):
             self.folder_path.mkdir()
 
         # read in set of parameters from input
-        file1 = self.root / INDIR / "inputs.pkl"
-        self.input = pd.read_pickle(file1)
+        self.input = inputs.load_base(self.root / INDIR / inputs.BASE_FILE)
         pa = self.input['parametric_analysis']
         # list set of heat pump sizes
         hp_sizes = []
@@ -1632,11 +1130,25 @@ class ThreeDPlots(object):
         for i in range(len(combos)):
             subname = 'hp_' + str(combos[i][0]) + '_ts_' + str(combos[i][1])
             subnames.append(subname)
-            # read pickle output file
-            file_output_pickle = self.root / OUTDIR / subname / 'outputs.pkl'
-            results[subname] = pd.read_pickle(file_output_pickle)
+            # read output file
+            results[subname] = load_results(self.root / OUTDIR / subname)
         self.results = results
         self.subnames = subnames
+        self._kpis = None
+
+    def kpis(self):
+        """KPIs of every combination
+
+        Computed once and shared by the csv files and the plots.
+
+        Returns:
+            pd.DataFrame -- a row per combination and a column per KPI
+        """
+        if self._kpis is None:
+            self._kpis = pd.DataFrame(
+                [Calcs(self.root, subname, self.results).kpis()
+                 for subname in self.subnames], dtype=float)
+        return self._kpis
 
     def heat_pump_sizes_x(self):
 
@@ -1654,15 +1166,7 @@ class ThreeDPlots(object):
 
     def plot_opex(self):
 
-        opex = []
-
-        for x in range(len(self.subnames)):
-            _opex = Calcs(
-                self.root, self.subnames[x],
-                self.results).operating_cost()
-            opex.append(_opex)
-
-        z = opex
+        z = list(self.kpis()['opex'])
 
         plt.style.use('classic')
 
@@ -1691,15 +1195,7 @@ class ThreeDPlots(object):
 
     def plot_RES(self):
 
-        RES_used = []
-
-        for x in range(len(self.subnames)):
-            _RES_used = Calcs(
-                self.root, self.subnames[x],
-                self.results).RES_self_consumption()
-            RES_used.append(_RES_used)
-
-        z = RES_used
+        z = list(self.kpis()['local_RES_used'])
 
         plt.style.use('classic')
 
@@ -1727,15 +1223,7 @@ class ThreeDPlots(object):
 
     def plot_heat_from_RES(self):
 
-        RES_used = []
-
-        for x in range(len(self.subnames)):
-            _RES_used = Calcs(
-                self.root, self.subnames[x],
-                self.results).heat_met_RES()
-            RES_used.append(_RES_used)
-
-        z = RES_used
+        z = list(self.kpis()['heat_met_RES'])
 
         plt.style.use('classic')
 
@@ -1763,15 +1251,7 @@ class ThreeDPlots(object):
 
     def plot_HP_size_ratio(self):
 
-        HP_size_ratio = []
-
-        for x in range(len(self.subnames)):
-            _HP_size_ratio = Calcs(
-                self.root, self.subnames[x],
-                self.results).HP_size_ratio()
-            HP_size_ratio.append(_HP_size_ratio)
-
-        z = HP_size_ratio
+        z = list(self.kpis()['HP_size_ratio'])
 
         plt.style.use('classic')
 
@@ -1799,15 +1279,7 @@ class ThreeDPlots(object):
 
     def plot_HP_utilisation(self):
 
-        HP_utilisation = []
-
-        for x in range(len(self.subnames)):
-            _HP_utilisation = Calcs(
-                self.root, self.subnames[x],
-                self.results).HP_utilisation()
-            HP_utilisation.append(_HP_utilisation)
-
-        z = HP_utilisation
+        z = list(self.kpis()['HP_utilisation'])
 
         plt.style.use('classic')
 
@@ -1836,15 +1308,7 @@ class ThreeDPlots(object):
 
     def plot_capital_cost(self):
 
-        capital_cost = []
-
-        for x in range(len(self.subnames)):
-            _capital_cost = Calcs(
-                self.root, self.subnames[x],
-                self.results).capital_cost()
-            capital_cost.append(_capital_cost)
-
-        z = capital_cost
+        z = list(self.kpis()['capital_cost'])
 
         plt.style.use('classic')
 
@@ -1872,15 +1336,7 @@ class ThreeDPlots(object):
 
     def plot_COH(self):
 
-        cost_of_heat = []
-
-        for x in range(len(self.subnames)):
-            _cost_of_heat = Calcs(
-                self.root, self.subnames[x],
-                self.results).cost_of_heat()
-            cost_of_heat.append(_cost_of_heat)
-
-        z = cost_of_heat
+        z = list(self.kpis()['cost_of_heat'])
 
         plt.style.use('classic')
 
@@ -1909,15 +1365,7 @@ class ThreeDPlots(object):
 
     def plot_LCOH(self):
 
-        levelised_cost_of_heat = []
-
-        for x in range(len(self.subnames)):
-            _levelised_cost_of_heat = Calcs(
-                self.root, self.subnames[x],
-                self.results).levelised_cost_of_heat()
-            levelised_cost_of_heat.append(_levelised_cost_of_heat)
-
-        z = levelised_cost_of_heat
+        z = list(self.kpis()['levelised_cost_of_heat'])
 
         plt.style.use('classic')
 
@@ -1949,77 +1397,11 @@ class ThreeDPlots(object):
         hp_sizes = self.heat_pump_sizes_x()
         ts_sizes = self.thermal_store_sizes_y()
 
-        opex = np.zeros(len(self.subnames))
-        RES_used = np.zeros(len(self.subnames))
-        total_RES_self_consumption = np.zeros(len(self.subnames))
-        grid_RES_used = np.zeros(len(self.subnames))
-        total_RES_used = np.zeros(len(self.subnames))
-        HP_size_ratio = np.zeros(len(self.subnames))
-        HP_utilisation = np.zeros(len(self.subnames))
-        capital_cost = np.zeros(len(self.subnames))
-        cost_of_heat = np.zeros(len(self.subnames))
-        levelised_cost_of_heat = np.zeros(len(self.subnames))
-        levelised_cost_of_energy = np.zeros(len(self.subnames))
-        cost_elec = np.zeros(len(self.subnames))
-        lifetime_cost = np.zeros(len(self.subnames))
-        sum_hp_output = np.zeros(len(self.subnames))
-        sum_hp_usage = np.zeros(len(self.subnames))
-        scop = np.zeros(len(self.subnames))
-        sum_aux_output = np.zeros(len(self.subnames))
-        sum_ed_import = np.zeros(len(self.subnames))
-        sum_RES = np.zeros(len(self.subnames))
-        sum_import = np.zeros(len(self.subnames))
-        sum_export = np.zeros(len(self.subnames))
-        demand_met_RES = np.zeros(len(self.subnames))
-        HP_met_RES = np.zeros(len(self.subnames))
-        days_storage_content = np.zeros(len(self.subnames))
-        heat_met_RES = np.zeros(len(self.subnames))
-
-        for x in range(len(self.subnames)):
-
-            myCalcs = Calcs(self.root, self.subnames[x], self.results)
-
-            opex[x] = myCalcs.operating_cost()
-            RES_used[x] = myCalcs.RES_self_consumption()
-            total_RES_self_consumption[x] = myCalcs.total_RES_self_consumption()
-            grid_RES_used[x] = myCalcs.grid_RES_used()
-            total_RES_used[x] = myCalcs.total_RES_used()
-            HP_size_ratio[x] = myCalcs.HP_size_ratio()
-            HP_utilisation[x] = myCalcs.HP_utilisation()
-            capital_cost[x] = myCalcs.capital_cost()
-            cost_of_heat[x] = myCalcs.cost_of_heat()
-            levelised_cost_of_heat[x] = myCalcs.levelised_cost_of_heat()
-            levelised_cost_of_energy[x] = myCalcs.levelised_cost_of_energy()
-            cost_elec[x] = myCalcs.cost_elec()
-            lifetime_cost[x] = myCalcs.lifetime_cost()
-            sum_hp_output[x] = myCalcs.sum_hp_output()
-            sum_hp_usage[x] = myCalcs.sum_hp_usage()
-            scop[x] = myCalcs.calc_scop()
-            sum_aux_output[x] = myCalcs.sum_aux_output()
-            sum_ed_import[x] = myCalcs.sum_ed_import()
-            sum_RES[x] = myCalcs.sum_RES()
-            sum_import[x] = myCalcs.sum_import()
-            sum_export[x] = myCalcs.sum_export()
-            demand_met_RES[x] = myCalcs.demand_met_RES()
-            HP_met_RES[x] = myCalcs.HP_met_RES()
-            days_storage_content[x] = myCalcs.days_storage_content()
-            heat_met_RES[x] = myCalcs.heat_met_RES()
-
-        economic_data = np.array(
-            [hp_sizes, ts_sizes,
-             capital_cost, opex, cost_of_heat,
-             cost_elec, lifetime_cost,
-             levelised_cost_of_heat,
-             levelised_cost_of_energy])
-        df = pd.DataFrame(
-            economic_data)
-        df = df.transpose()
-        df.columns = ['hp_sizes', 'ts_sizes',
-                      'capital_cost', 'opex', 'cost_of_heat',
-                      'cost_elec', 'lifetime_cost',
-                      'levelised_cost_of_heat',
-                      'levelised_cost_of_energy'
-                      ]
+        kpis = self.kpis()
+        sizes = pd.DataFrame(
+            {'hp_sizes': hp_sizes, 'ts_sizes': ts_sizes}, dtype=float)
+
+        df = pd.concat([sizes, kpis[ECONOMIC_KPIS]], axis=1)
 
         pickleout = self.folder_path / ('KPI_economic_' + self.root.name + '.pkl')
         with open(pickleout, 'wb') as handle:
@@ -2028,25 +1410,7 @@ class ThreeDPlots(object):
         fileout = self.folder_path / ('KPI_economic_' + self.root.name + '.csv')
         df.to_csv(fileout, index=False)
 
-        technical_data = np.array(
-            [hp_sizes, ts_sizes, RES_used,
-             total_RES_self_consumption,
-             grid_RES_used, total_RES_used,
-             heat_met_RES, demand_met_RES,
-             HP_met_RES,
-             HP_size_ratio, HP_utilisation,
-             days_storage_content])
-        df = pd.DataFrame(
-            technical_data)
-        df = df.transpose()
-        df.columns = ['hp_sizes', 'ts_sizes', 'local_RES_used',
-                      'total_RES_self_consumption',
-                      'grid_RES_used', 'total_RES_used',
-                      'heat_met_RES', 'demand_met_RES',
-                      'HP_met_RES',
-                      'HP_size_ratio', 'HP_utilisation',
-                      'days_storage_content'
-                      ]
+        df = pd.concat([sizes, kpis[TECHNICAL_KPIS]], axis=1)
 
         pickleout = self.folder_path / ('KPI_technical_' + self.root.name + '.pkl')
         with open(pickleout, 'wb') as handle:
@@ -2055,19 +1419,7 @@ class ThreeDPlots(object):
         fileout = self.folder_path / ('KPI_technical_' + self.root.name + '.csv')
         df.to_csv(fileout, index=False)
 
-        output = np.array(
-            [hp_sizes, ts_sizes,
-             sum_hp_output, sum_hp_usage, scop,
-             sum_aux_output, sum_ed_import, sum_RES,
-             sum_import, sum_export])
-        df = pd.DataFrame(
-            output)
-        df = df.transpose()
-        df.columns = ['hp_sizes', 'ts_sizes',
-                      'sum_hp_output', 'sum_hp_usage', 'scop',
-                      'sum_aux_output', 'sum_ed_import', 'sum_RES',
-                      'sum_import', 'sum_export'
-                      ]
+        df = pd.concat([sizes, kpis[OUTPUT_KPIS]], axis=1)
 
         pickleout = self.folder_path / ('output_' + self.root.name + '.pkl')
         with open(pickleout, 'wb') as handle:
@@ -8,18 +8,22 @@ import pickle
 import shutil
 import pandas as pd
 
+from . import inputs
 from .paths import valid_fpath
 from ..constants import INDIR, OUTDIR
 from ..heat.enums import Fuel
 
 LOG = logging.getLogger(__name__)
 
-def read_inputs(xlsxpath: str | Path, root: Path) -> None:
+def read_inputs(xlsxpath: str | Path, root: Path, integrator: str | None = None,
+                step_tolerance: float | None = None) -> None:
     """Read all inputs from MS Excel workbook and setup directories
     
     Args:
         xlsxpath: path to MS Excel workbook containing inputs
         root: path to directory to store intermediary inputs and outputs
+        integrator: thermal storage integrator, overrides the workbook if set
+        step_tolerance: estimated error in degC of the thermal storage node temperatures, if set
     """
     xlsxpath = valid_fpath(xlsxpath)
     LOG.info(f'Reading MS Excel file: {xlsxpath}')
@@ -40,10 +44,17 @@ def read_inputs(xlsxpath: str | Path, root: Path) -> None:
     myInput.thermal_storage()
     myInput.heat_pump()
 
+    if integrator is not None:
+        myInput.container['thermal_storage']['integrator'] = integrator
+    if step_tolerance is not None:
+        myInput.container['thermal_storage']['step_tolerance'] = step_tolerance
+
     # write to pickle file
-    file = root / INDIR / 'inputs.pkl'
+    file = root / INDIR / inputs.BASE_FILE
     with open(file, 'wb') as handle:
         pickle.dump(myInput.container, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    # base inputs read before are out of date
+    inputs.clear_cache(file)
 
     LOG.info(f'Completed reading MS Excel file: {xlsxpath.name}')
 
@@ -458,7 +469,9 @@ class XlsxInput(object):
                                 16: 'insulated_connections',
                                 17: 'insulated_connections_diameter',
                                 20: 'insulation_factor',
-                                21: 'overall_factor'
+                                21: 'overall_factor',
+                                # optional row, not in older input sheets
+                                22: 'integrator'
                                 })
         df = df.reset_index(drop=True)
         self.container['thermal_storage'] = df
@@ -0,0 +1,145 @@
+"""columnar store of controller results
+
+each hour of a controller run is a row of a NumPy structured array,
+with a float64 column for each group and field of the results and
+the final node temperatures of the thermal store as a 2-D column
+"""
+import logging
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+LOG = logging.getLogger(__name__)
+
+FILENAME = 'outputs.npy'
+# results written as a list of dicts by earlier versions
+LEGACY_FILENAME = 'outputs.pkl'
+NODES_FIELD = ('TS', 'final_nodes_temp')
+
+
+def results_dtype(template: Dict[str, dict], number_nodes: int) -> np.dtype:
+    """structured dtype of the results
+
+    Arguments:
+        template {dict} -- results of one hour, {group: {field: value}}
+        number_nodes {int} -- number of thermal store nodes
+
+    Returns:
+        np.dtype -- nested dtype with a field per group
+    """
+    groups = []
+    for group, fields in template.items():
+        columns = []
+        for field in fields:
+            if (group, field) == NODES_FIELD:
+                columns.append((field, np.float64, (number_nodes,)))
+            else:
+                columns.append((field, np.float64))
+        groups.append((group, columns))
+    return np.dtype(groups)
+
+
+class ResultsStore(object):
+
+    def __init__(self, template: Dict[str, dict], timesteps: int,
+                 number_nodes: int):
+        """preallocated results of a controller run
+
+        Arguments:
+            template {dict} -- results of one hour, {group: {field: value}}
+            timesteps {int} -- number of hours to store
+            number_nodes {int} -- number of thermal store nodes
+        """
+        self.data = np.zeros(
+            timesteps, dtype=results_dtype(template, number_nodes))
+        # views of each column so that a row is written in place
+        self._columns = {
+            (group, field): self.data[group][field]
+            for group, fields in template.items() for field in fields}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, record: Dict[str, dict]):
+        """write the results of the next hour
+
+        Arguments:
+            record {dict} -- results of one hour, {group: {field: value}}
+        """
+        if self.size == len(self.data):
+            msg = f'Results store is full with {self.size} hours'
+            LOG.error(msg)
+            raise ValueError(msg)
+        row = self.size
+        for group, fields in record.items():
+            for field, value in fields.items():
+                self._columns[(group, field)][row] = value
+        self.size += 1
+
+    def results(self) -> np.ndarray:
+        """structured array of the hours written so far"""
+        return self.data[:self.size]
+
+    def save(self, folder: Path):
+        """write the results to the binary NumPy file in folder
+
+        Arguments:
+            folder {Path} -- output folder of the combination
+        """
+        np.save(Path(folder) / FILENAME, self.results())
+
+
+def from_records(records: List[Dict[str, dict]]) -> np.ndarray:
+    """structured array of results stored as a list of dicts
+
+    Arguments:
+        records {list} -- results of each hour, {group: {field: value}}
+
+    Returns:
+        np.ndarray -- structured array with a row per hour
+    """
+    if not records:
+        msg = 'Cannot create results from an empty list'
+        LOG.error(msg)
+        raise ValueError(msg)
+    # fields which are only set in some hours are zero in the others
+    template = {}
+    for record in records:
+        for group, fields in record.items():
+            template.setdefault(group, {}).update(dict.fromkeys(fields))
+    group, field = NODES_FIELD
+    number_nodes = max(np.size(r[group][field]) for r in records)
+    store = ResultsStore(template, len(records), number_nodes)
+    for record in records:
+        store.append(record)
+    return store.results()
+
+
+def load_results(folder: Path) -> np.ndarray:
+    """read the results of a combination
+
+    Columns are accessed as results['HP']['heat_total_output'] and the
+    results of an hour as results[i]['HP']['heat_total_output'].
+
+    Arguments:
+        folder {Path} -- output folder of the combination
+
+    Returns:
+        np.ndarray -- structured array with a row per hour
+    """
+    folder = Path(folder)
+    file = folder / FILENAME
+    if file.exists():
+        return np.load(file)
+
+    legacy = folder / LEGACY_FILENAME
+    if legacy.exists():
+        LOG.info(f'Converting results from {legacy}')
+        return from_records(pd.read_pickle(legacy))
+
+    msg = f'No results found in {folder}'
+    LOG.error(msg)
+    raise FileNotFoundError(msg)
@@ -3,19 +3,24 @@ from pathlib import Path
 import shutil
 import time
 from tqdm import tqdm
+from typing import List
 
-from . import parametric_analysis
+from . import parametric_analysis, precompute
 from .constants import DEFAULT_LOGLEVEL
 from .controllers import fixed_order
 from .controllers import mpc
 from .logging import setup_logging
 from .io import inputs, outputs, read_excel
 from .io.paths import valid_dir, valid_fpath
-from .mp.process import OutputProcess
+from .mp.process import JobPool, OutputProcess
+from .controllers.enums import Backend
+from .storage.enums import Integrator
 
 LOG = logging.getLogger(__name__)
 
-def run_solver(controller: str, subname:  str, outdir: Path, first_hour: int, timesteps: int):
+def run_solver(controller: str, subname:  str, outdir: Path, first_hour: int, timesteps: int,
+               persistent_mpc: bool = False, mpc_backend: Backend = Backend.AUTO,
+               warm_start_mpc: bool = False):
     then = time.time()
     if controller == 'Fixed order control':
         fixed_order.FixedOrder(
@@ -25,7 +30,8 @@ def run_solver(controller: str, subname:  str, outdir: Path, first_hour: int, ti
 
     elif controller == 'Model predictive control':
         myScheduler = mpc.Scheduler(
-            outdir, subname)
+            outdir, subname, persistent=persistent_mpc, backend=mpc_backend,
+            warm_start=warm_start_mpc)
         pre_calc = myScheduler.pre_calculation(
             first_hour, timesteps)
         myScheduler.moving_horizon(
@@ -37,7 +43,29 @@ def run_solver(controller: str, subname:  str, outdir: Path, first_hour: int, ti
         LOG.error(msg)
         raise ValueError(msg)
 
-def main(xlsxpath: str, outdir: str, overwrite: bool = False, singlecore: bool = False):
+def run_job(controller: str, subname: str, outdir: Path, first_hour: int, timesteps: int,
+            persistent_mpc: bool = False, mpc_backend: Backend = Backend.AUTO,
+            warm_start_mpc: bool = False):
+    """Run the solver and write the outputs for a single combination"""
+    run_solver(controller, subname, outdir, first_hour, timesteps, persistent_mpc, mpc_backend,
+               warm_start_mpc)
+    outputs.run_plots(outdir, subname)
+
+def run_batch_solver(subnames: List[str], outdir: Path, first_hour: int, timesteps: int):
+    """Run the fixed order controller for a batch of combinations in lock-step"""
+    then = time.time()
+    fixed_order.run_batch(outdir, subnames, first_hour, timesteps)
+    LOG.info(f'Ran fixed order controller: {", ".join(subnames)}. Time taken: {int(round(time.time() - then, 0))} seconds')
+
+def run_batch_job(subnames: List[str], outdir: Path, first_hour: int, timesteps: int):
+    """Run the solver and write the outputs for a batch of combinations"""
+    run_batch_solver(subnames, outdir, first_hour, timesteps)
+    for subname in subnames:
+        outputs.run_plots(outdir, subname)
+
+def main(xlsxpath: str, outdir: str, overwrite: bool = False, singlecore: bool = False, workers: int = 0,
+         integrator: str = None, persistent_mpc: bool = False, mpc_backend: str = Backend.AUTO.value,
+         warm_start_mpc: bool = False, batch: int = 0, step_tolerance: float = None):
     """Run PyLESA, an open source tool capable of modelling local energy systems.
     
     By default, this function runs the PyLESA solver in the main process but
@@ -51,8 +79,43 @@ def main(xlsxpath: str, outdir: str, overwrite: bool = False, singlecore: bool =
         xlsxpath: path to Excel input file\n
         outdir: path to output directory, a sub-directory matching the Excel filename will be created\n
         overwrite: bool flag to overwrite existing output, default: False\n
-        singlecore: bool flag to run on a single core rather than two cores, default: False (uses two cores)
+        singlecore: bool flag to run on a single core rather than two cores, default: False (uses two cores)\n
+        workers: number of worker processes which each solve and write outputs for whole combinations, default: 0 (not used)\n
+        integrator: thermal storage integrator, one of odeint, exact or expm, overrides the Excel input, default: None (use Excel input)\n
+        persistent_mpc: bool flag to build the predictive controller model once per combination and update it each hour, default: False\n
+        mpc_backend: predictive controller solver, one of auto, gekko or highs, default: auto (highs when the heat pump has no minimum output, else gekko)\n
+        warm_start_mpc: bool flag to start each gekko solve of the predictive controller from the previous solution, default: False\n
+        batch: number of combinations the fixed order controller steps through the year together, default: 0 (each combination on its own)\n
+        step_tolerance: estimated error in degC of the thermal storage node temperatures each hour, the internal steps are chosen to meet it, default: None (one step per node mass of flow)
     """
+    if workers < 0:
+        msg = f"Number of workers must not be negative, got {workers}"
+        LOG.error(msg)
+        raise ValueError(msg)
+    if batch < 0:
+        msg = f"Batch size must not be negative, got {batch}"
+        LOG.error(msg)
+        raise ValueError(msg)
+    if step_tolerance is not None and not step_tolerance > 0:
+        msg = f"Step tolerance must be positive, got {step_tolerance}"
+        LOG.error(msg)
+        raise ValueError(msg)
+    if singlecore and workers:
+        msg = "Options --singlecore and --workers cannot be used together"
+        LOG.error(msg)
+        raise ValueError(msg)
+    if integrator is not None:
+        integrator = integrator.upper().strip()
+        if integrator not in Integrator:
+            msg = f"Integrator {integrator} is not one of {[_.value for _ in Integrator]}"
+            LOG.error(msg)
+            raise ValueError(msg)
+    mpc_backend = mpc_backend.upper().strip()
+    if mpc_backend not in Backend:
+        msg = f"MPC backend {mpc_backend} is not one of {[_.value for _ in Backend]}"
+        LOG.error(msg)
+        raise ValueError(msg)
+
     xlsxpath = valid_fpath(xlsxpath)
     outdir = valid_dir(outdir) / xlsxpath.stem
     if outdir.exists():
@@ -75,7 +138,11 @@ def main(xlsxpath: str, outdir: str, overwrite: bool = False, singlecore: bool =
     t0 = time.time()
 
     # generate pickle inputs from excel sheet
-    read_excel.read_inputs(xlsxpath, outdir)
+    read_excel.read_inputs(xlsxpath, outdir, integrator=integrator,
+                           step_tolerance=step_tolerance)
+
+    # series which are the same for every combination
+    precompute.run(outdir)
 
     # generate pickle inputs for parametric analysis
     myPara = parametric_analysis.Para(outdir)
@@ -99,15 +166,40 @@ def main(xlsxpath: str, outdir: str, overwrite: bool = False, singlecore: bool =
     timesteps = controller_info['total_timesteps']
     first_hour = controller_info['first_hour']
 
-    if singlecore:
+    if batch:
+        if controller != 'Fixed order control':
+            msg = f'Batches can only be run with the fixed order controller, got {controller}'
+            LOG.error(msg)
+            raise ValueError(msg)
+        batches = [combinations[i:i + batch] for i in range(0, num_combos, batch)]
+        LOG.info(f"Running {len(batches)} batches of up to {batch} combinations")
+
+    if workers and batch:
+        LOG.info(f"Running pylesa using a pool of {workers} worker processes.")
+        # Each worker runs the solver and the output for a whole batch
+        jobs = [[subnames, outdir, first_hour, timesteps] for subnames in batches]
+        JobPool(workers).run(run_batch_job, jobs)
+    elif workers:
+        LOG.info(f"Running pylesa using a pool of {workers} worker processes.")
+        # Each worker runs the solver and the output for a whole combination
+        jobs = [
+            [controller, subname, outdir, first_hour, timesteps, persistent_mpc, mpc_backend,
+             warm_start_mpc]
+            for subname in combinations
+        ]
+        JobPool(workers).run(run_job, jobs)
+    elif singlecore and batch:
+        LOG.info("Running pylesa using a single compute core.")
+        for subnames in tqdm(batches, desc="Jobs"):
+            run_batch_job(subnames, outdir, first_hour, timesteps)
+    elif singlecore:
         LOG.info("Running pylesa using a single compute core.")
         # Single core
         for i in tqdm(range(num_combos), desc="Jobs"):
             # combo to be run
             subname = combinations[i]
-            run_solver(controller, subname, outdir, first_hour, timesteps)
-            # Run output
-            outputs.run_plots(outdir, subname)
+            run_job(controller, subname, outdir, first_hour, timesteps, persistent_mpc, mpc_backend,
+                    warm_start_mpc)
     else:
         LOG.info("Running pylesa using 2 compute cores.")
         # Run two processes:
@@ -121,12 +213,20 @@ def main(xlsxpath: str, outdir: str, overwrite: bool = False, singlecore: bool =
             p.start(outputs.run_plots)
 
             # Run controller for all combinations
-            for i in tqdm(range(num_combos), desc="Jobs"):
-                # combo to be run
-                subname = combinations[i]
-                run_solver(controller, subname, outdir, first_hour, timesteps)
-                # Submit job to output queue for writing
-                p.submit([outdir, subname])
+            if batch:
+                for subnames in tqdm(batches, desc="Jobs"):
+                    run_batch_solver(subnames, outdir, first_hour, timesteps)
+                    # Submit jobs to output queue for writing
+                    for subname in subnames:
+                        p.submit([outdir, subname])
+            else:
+                for i in tqdm(range(num_combos), desc="Jobs"):
+                    # combo to be run
+                    subname = combinations[i]
+                    run_solver(controller, subname, outdir, first_hour, timesteps, persistent_mpc,
+                               mpc_backend, warm_start_mpc)
+                    # Submit job to output queue for writing
+                    p.submit([outdir, subname])
 
         except Exception as e:
             p.cancel()
@@ -1,9 +1,11 @@
 """Run jobs in separate process"""
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import logging.handlers
 from multiprocessing import Process, Queue
 import logging
 from threading import Thread
+from tqdm import tqdm
 from typing import Callable, List, Any
 
 from .constants import SENTINEL, TIMEOUT
@@ -93,3 +95,60 @@ class OutputProcess:
                 return False
         except ValueError:
             return False
+
+
+class JobPool:
+    """Run func for a list of jobs on a pool of worker processes
+
+    Log messages emitted in the workers are passed back to the handlers of the
+    main process through a queue, in the same way as for OutputProcess.
+    """
+
+    def __init__(self, workers: int):
+        if workers < 1:
+            msg = f"Number of workers must be at least 1, got {workers}"
+            LOG.error(msg)
+            raise ValueError(msg)
+        self.workers = workers
+
+    def run(self, func: Callable, jobs: List[List[Any]], desc: str = "Jobs") -> None:
+        """Run func(*job) for every job, failing fast on the first error
+
+        Jobs that have not yet started are cancelled as soon as any job raises
+        and the error is re-raised in the main process with the failed job
+        attached.
+
+        Args:
+            func: picklable callable run in the worker processes
+            jobs: list of positional arguments, one entry per job
+            desc: label used for the progress bar
+        """
+        log_queue = Queue()
+        listener = logging.handlers.QueueListener(
+            log_queue, *logging.getLogger().handlers, respect_handler_level=True
+        )
+        listener.start()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=setup_mp_logging,
+            initargs=(logging.getLogger().level, log_queue),
+        )
+        try:
+            futures = {executor.submit(func, *job): job for job in jobs}
+            with tqdm(total=len(futures), desc=desc) as progress:
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        msg = f"Job {job} failed: {e!r}"
+                        LOG.error(msg)
+                        for pending in futures:
+                            pending.cancel()
+                        raise RuntimeError(msg) from e
+                    progress.update()
+                    LOG.info(f"Completed job {progress.n}/{len(futures)}: {job}")
+        finally:
+            # wait for any running jobs, pending jobs have already been cancelled
+            executor.shutdown(wait=True, cancel_futures=True)
+            listener.stop()
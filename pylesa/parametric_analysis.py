@@ -4,12 +4,12 @@ sets up the model to run the ranges defined
 only set up for hot water tank capacity and heat pump
 """
 
-import pandas as pd
 from pathlib import Path
 import pickle
 import shutil
 
 from .constants import OUTDIR, INDIR
+from .io import inputs
 from .io.paths import valid_dir
 
 
@@ -22,7 +22,7 @@ class Para(object):
         self.outdir = valid_dir(self.root / OUTDIR)
 
         # read in set of parameters from input
-        self.input = pd.read_pickle(self.indir / "inputs.pkl")
+        self.input = inputs.load_base(self.indir / inputs.BASE_FILE)
         pa = self.input['parametric_analysis']
 
         # list set of heat pump sizes
@@ -69,60 +69,41 @@ class Para(object):
     def create_pickles(self):
 
         # create new set of pickles for each combo
+        # each holds only the inputs which differ from the base inputs
         for i in range(len(self.folder_name)):
 
-            # read in set of parameters from input
-            self.input = pd.read_pickle(self.indir / "inputs.pkl")
+            overlay = {inputs.BASE_KEY: inputs.BASE_FILE}
 
-            # read heat pump pickle for changing the basics capacity
-            hp_basics = self.input['hp_basics']
+            # copy heat pump basics for changing the capacity
+            hp_basics = self.input['hp_basics'].copy()
             # original capacity input
             capacity = hp_basics['capacity'][0]
             # modify
             hp_basics.loc[0, 'capacity'] = self.combos[i][0]
             # save
-            self.input['hp_basics'] = hp_basics
+            overlay['hp_basics'] = hp_basics
 
-            # read heat pump pickle for changing the st reg duties
-            reg1 = self.input['regression1']
-            # modify
+            # ratio for changing the st reg duties
             if capacity == 0:
                 ratio = 0
             else:
                 ratio = round(float(self.combos[i][0]) / float(capacity), 2)
-            reg1['duty'] = reg1['duty'] * ratio
-            # save
-            self.input['regression1'] = reg1
-
-            # read heat pump pickle for changing the st reg duties
-            reg2 = self.input['regression2']
-            # modify
-            reg2['duty'] = reg2['duty'] * ratio
-            # save
-            self.input['regression2'] = reg2
-
-            # read heat pump pickle for changing the st reg duties
-            reg3 = self.input['regression3']
-            # modify
-            reg3['duty'] = reg3['duty'] * ratio
-            # save
-            self.input['regression3'] = reg3
-
-            # read heat pump pickle for changing the st reg duties
-            reg4 = self.input['regression4']
-            # modify
-            reg4['duty'] = reg4['duty'] * ratio
-            # save
-            self.input['regression4'] = reg4
-
-            # read ts pickle
-            ts = self.input['thermal_storage']
+            for name in ('regression1', 'regression2',
+                         'regression3', 'regression4'):
+                reg = self.input[name].copy()
+                # modify
+                reg['duty'] = reg['duty'] * ratio
+                # save
+                overlay[name] = reg
+
+            # copy ts inputs
+            ts = self.input['thermal_storage'].copy()
             # modify
             ts.loc[0, 'capacity'] = self.combos[i][1]
             # save
-            self.input['thermal_storage'] = ts
+            overlay['thermal_storage'] = ts
 
             # save new pickle output
             file = self.root / INDIR / (self.folder_name[i] + ".pkl")
             with open(file, 'wb') as handle:
-                pickle.dump(self.input, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(overlay, handle, protocol=pickle.HIGHEST_PROTOCOL)
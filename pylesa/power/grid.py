@@ -1,6 +1,7 @@
 """grid module for generating electricity tariffs
 """
 from importlib.resources import files as ifiles
+import logging
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -8,10 +9,194 @@ import datetime
 import matplotlib.pyplot as plt
 
 from . import renewables
+from .. import tools
+from ..constants import ANNUAL_HOURS, INDIR
 from ..io import inputs
 
+LOG = logging.getLogger(__name__)
+
 plt.style.use('ggplot')
 
+# wind farm power and PPA bands, written to the inputs folder of a run
+WIND_FARM_FILE = 'wind_farm.pkl'
+PPA_TARIFFS = ['Time of use - PPA + FR', 'Time of use - PPA + WM',
+               'Time of use - PPA + VP']
+# columns of the variable periods tariff, in the order of weekday()
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+        'Saturday', 'Sunday']
+# hours of the day with a premium on the wholesale market tariff
+PEAK_HOURS = [16, 17, 18]
+
+
+def hour_of_day(timesteps):
+    """hour of the day of each timestep
+
+    Arguments:
+        timesteps {int} -- number of hours from the start of the year
+
+    Returns:
+        array -- hour of the day, 0 to 23
+    """
+    return np.arange(timesteps) % 24
+
+
+def day_of_week(year, timesteps):
+    """day of the week of each timestep
+
+    Arguments:
+        year {int} -- calendar year starting at the first timestep
+        timesteps {int} -- number of hours from the start of the year
+
+    Returns:
+        array -- day of the week, Monday is 0 and Sunday is 6
+    """
+    first_day = datetime.date(int(year), 1, 1).weekday()
+    return (first_day + np.arange(timesteps) // 24) % 7
+
+
+def horizon(series, timesteps, name):
+    """first timesteps of an hourly input series as an array
+
+    Arguments:
+        series {array-like} -- hourly input series
+        timesteps {int} -- number of hours of the tariff
+        name {str} -- name of series for the error message
+
+    Returns:
+        array -- float array of length timesteps
+    """
+    series = np.asarray(series, dtype=float).ravel()
+    if len(series) < timesteps:
+        msg = (f'{name} has {len(series)} hours, '
+               f'fewer than the {timesteps} hours of the tariff')
+        LOG.error(msg)
+        raise ValueError(msg)
+    return series[:timesteps]
+
+
+def ppa_tariff(tariff, power, lower_band, higher_band,
+               lower_penalty, higher_discount):
+    """adjust a tariff by the output of the PPA wind farm
+
+    Arguments:
+        tariff {array} -- import cost of each timestep
+        power {array-like} -- wind farm power of each timestep
+        lower_band {float} -- penalty applies at or below this power
+        higher_band {float} -- discount applies at or above this power
+        lower_penalty {float} -- added to the tariff at low power
+        higher_discount {float} -- taken off the tariff at high power
+
+    Returns:
+        array -- adjusted import cost of each timestep
+    """
+    power = horizon(power, len(tariff), 'Wind farm power')
+    return np.where(
+        power >= higher_band, tariff - higher_discount,
+        np.where(power <= lower_band, tariff + lower_penalty, tariff))
+
+
+def wind_farm_bands(power, lower_percent, higher_percent):
+    """power of the wind farm at the lower and higher exceedence
+
+    Arguments:
+        power {pd.Series} -- hourly power of the wind farm
+        lower_percent {float} -- exceedence of the lower band
+        higher_percent {float} -- exceedence of the higher band
+
+    Returns:
+        tuple -- lower band and higher band
+    """
+    data = power.values
+    sort = np.sort(data)[::-1]
+    exceedence = np.arange(1., len(sort) + 1) / len(sort)
+    exceedence_rounded = np.around(exceedence, decimals=2)
+
+    lower_band_array = np.where(
+        exceedence_rounded == lower_percent)[0]
+    lower_band_array_median = np.median(lower_band_array)
+    lower_band = sort[int(lower_band_array_median)]
+
+    higher_band_array = np.where(
+        exceedence_rounded == higher_percent)[0]
+    higher_band_array_median = np.median(higher_band_array)
+    higher_band = sort[int(higher_band_array_median)]
+
+    return lower_band, higher_band
+
+
+def wind_farm_info(root, subname, lower_percent, higher_percent):
+    """wind farm power and bands of the PPA tariffs
+
+    The wind farm inputs are the same for every combination of a run,
+    so the power and bands are calculated once and written to the
+    inputs folder, where they are read by the tariffs and the KPIs of
+    every combination.
+
+    Arguments:
+        root {Path} -- folder of the run
+        subname {str} -- name of the inputs of the combination
+        lower_percent {float} -- exceedence of the lower band
+        higher_percent {float} -- exceedence of the higher band
+
+    Returns:
+        dict -- lower_band, higher_band and hourly power
+    """
+    file = Path(root).resolve() / INDIR / WIND_FARM_FILE
+    if file.exists():
+        cache = pd.read_pickle(file)
+        power = cache['power']
+        if (cache['lower_percent'], cache['higher_percent']) == (
+                lower_percent, higher_percent):
+            return {'lower_band': cache['lower_band'],
+                    'higher_band': cache['higher_band'],
+                    'power': power}
+    else:
+        myInputs = inputs.Inputs(root, subname)
+        input_windturbine = myInputs.wind_farm()
+        input_weather = myInputs.wind_farm_weather()
+
+        myWindfarm = renewables.Windturbine(
+            turbine_name=input_windturbine['turbine_name'],
+            hub_height=input_windturbine['hub_height'],
+            rotor_diameter=input_windturbine['rotor_diameter'],
+            multiplier=input_windturbine['number_of_turbines'],
+            wind_farm_efficiency=input_windturbine['efficiency'],
+            weather_input=input_weather)
+
+        power = myWindfarm.wind_farm_power()['wind_farm']
+
+    lower_band, higher_band = wind_farm_bands(
+        power, lower_percent, higher_percent)
+    cache = {'power': power,
+             'lower_percent': lower_percent, 'higher_percent': higher_percent,
+             'lower_band': lower_band, 'higher_band': higher_band}
+    tools.write_pickle(cache, file)
+
+    return {'lower_band': lower_band, 'higher_band': higher_band,
+            'power': power}
+
+
+def cache_wind_farm(root):
+    """calculate the wind farm power and bands of a run once
+
+    Called after the inputs of the run are read, which replaces
+    any cache of previous inputs.
+
+    Arguments:
+        root {Path} -- folder of the run
+    """
+    file = Path(root).resolve() / INDIR / WIND_FARM_FILE
+    if file.exists():
+        file.unlink()
+
+    myInputs = inputs.Inputs(root, 'inputs')
+    grid_inputs = myInputs.grid()
+    if grid_inputs['tariff_choice'] in PPA_TARIFFS:
+        wind_farm_info(
+            root, 'inputs',
+            grid_inputs['ppa_info']['lower_percent'],
+            grid_inputs['ppa_info']['higher_percent'])
+
 
 class Grid(object):
 
@@ -22,7 +207,8 @@ class Grid(object):
                  wholesale_market=None, bm_series=None, PPA_series=None,
                  grid_services_series=None, premium=None, maximum=None,
                  lower_percent=None, higher_percent=None,
-                 lower_penalty=None, higher_discount=None):
+                 lower_penalty=None, higher_discount=None,
+                 timesteps=ANNUAL_HOURS):
 
         self.export = export
         self.root = Path(root).resolve()
@@ -43,6 +229,8 @@ class Grid(object):
         self.higher_percent = higher_percent
         self.lower_penalty = lower_penalty
         self.higher_discount = higher_discount
+        # every tariff is an array of this number of hours
+        self.timesteps = timesteps
 
     def import_cost_series(self):
 
@@ -66,199 +254,50 @@ class Grid(object):
 
     def wind_farm_info(self):
 
-        myInputs = inputs.Inputs(self.root, self.subname)
-        input_windturbine = myInputs.wind_farm()
-        input_weather = myInputs.wind_farm_weather()
-
-        myWindfarm = renewables.Windturbine(
-            turbine_name=input_windturbine['turbine_name'],
-            hub_height=input_windturbine['hub_height'],
-            rotor_diameter=input_windturbine['rotor_diameter'],
-            multiplier=input_windturbine['number_of_turbines'],
-            wind_farm_efficiency=input_windturbine['efficiency'],
-            weather_input=input_weather)
-
-        power = myWindfarm.wind_farm_power()['wind_farm']
-        data = power.values
-        sort = np.sort(data)[::-1]
-        exceedence = np.arange(1., len(sort) + 1) / len(sort)
-        exceedence_rounded = np.around(exceedence, decimals=2)
-
-        lower_band_array = np.where(
-            exceedence_rounded == self.lower_percent)[0]
-        lower_band_array_median = np.median(lower_band_array)
-        lower_band = sort[int(lower_band_array_median)]
-
-        higher_band_array = np.where(
-            exceedence_rounded == self.higher_percent)[0]
-        higher_band_array_median = np.median(higher_band_array)
-        higher_band = sort[int(higher_band_array_median)]
+        return wind_farm_info(
+            self.root, self.subname, self.lower_percent, self.higher_percent)
 
-        dic = {'lower_band': lower_band, 'higher_band': higher_band,
-               'power': power}
+    def ppa_series(self, tariff):
+        """adjust a tariff by the output of the PPA wind farm"""
 
-        return dic
+        wind_farm = self.wind_farm_info()
+        return ppa_tariff(
+            tariff, wind_farm['power'],
+            wind_farm['lower_band'], wind_farm['higher_band'],
+            self.lower_penalty, self.higher_discount)
 
     def flat_rates_series(self):
 
-        import_cost = self.flat_rate['import']
-        ic = np.empty(8760)
-        for t in range(8760):
-            ic[t] = import_cost
-        return ic
+        return np.full(self.timesteps, float(self.flat_rate['import']))
 
     def flat_rates_wind(self):
 
-        fr = self.flat_rates_series()
-
-        wind_farm = self.wind_farm_info()
-        higher_band = wind_farm['higher_band']
-        lower_band = wind_farm['lower_band']
-        power = wind_farm['power']
-
-        new_tou = np.empty(8760)
-        diff_tou = np.empty(8760)
-        for t in range(8760):
-            if power[t] >= higher_band:
-                new_tou[t] = fr[t] - self.higher_discount
-            elif power[t] <= lower_band:
-                new_tou[t] = fr[t] + self.lower_penalty
-            else:
-                new_tou[t] = fr[t]
-            diff_tou[t] = new_tou[t] - fr[t]
-
-        # plt.plot(diff_tou)
-        # plt.show()
-
-        hour1 = 1930
-        hour2 = 2026
-
-        lb = []
-        for x in range(hour2 - hour1):
-            lb.append(lower_band)
-        ub = []
-        for x in range(hour2 - hour1):
-            ub.append(higher_band)
-
-        return new_tou
+        return self.ppa_series(self.flat_rates_series())
 
     def variable_periods_series(self):
 
-        year = self.variable_periods_year
-        # first day of year
-        day_list = []
-        for day in range(1, 8):
-            a = datetime.datetime(year, 1, day)
-            day_list.append(a.strftime("%A"))
-        z = datetime.datetime(year, 12, 31)
-        last_day = z.strftime("%A")
-
-        variable_periods_cost = self.variable_periods
-
-        vpc = []
-        for week in range(52):
-            for day in range(7):
-                for hour in range(24):
-                    vpc.append(variable_periods_cost[day_list[day]][hour])
-        for hour in range(24):
-            vpc.append(variable_periods_cost[last_day][hour])
-
-        # plt.plot(vpc[1930:2026], linewidth=2)
-        # plt.ylabel('Import cost (pound/MWh)')
-        # plt.xlabel('Time (h)')
-        # plt.show()
-        return vpc
+        # cost of each hour of each day of the week, rows follow DAYS
+        costs = np.asarray(
+            [self.variable_periods[day][:24] for day in DAYS], dtype=float)
+        days = day_of_week(self.variable_periods_year, self.timesteps)
+        return costs[days, hour_of_day(self.timesteps)]
 
     def variable_periods_wind(self):
 
-        vp = self.variable_periods_series()
-
-        wind_farm = self.wind_farm_info()
-        higher_band = wind_farm['higher_band']
-        lower_band = wind_farm['lower_band']
-        power = wind_farm['power']
-
-        new_tou = np.empty(8760)
-        diff_tou = np.empty(8760)
-        for t in range(8760):
-            if power[t] >= higher_band:
-                new_tou[t] = vp[t] - self.higher_discount
-            elif power[t] <= lower_band:
-                new_tou[t] = vp[t] + self.lower_penalty
-            else:
-                new_tou[t] = vp[t]
-            diff_tou[t] = new_tou[t] - vp[t]
-
-        # plt.plot(diff_tou)
-        # plt.show()
-
-        hour1 = 1930
-        hour2 = 2026
-
-        lb = []
-        for x in range(hour2 - hour1):
-            lb.append(lower_band)
-        ub = []
-        for x in range(hour2 - hour1):
-            ub.append(higher_band)
-
-        return new_tou
+        return self.ppa_series(self.variable_periods_series())
 
     def tou_wm_series(self):
 
-        wm = self.wholesale_market['wholesale_market']
-
-        tou_wm = []
-        for day in range(365):
-            for hour in range(24):
-                # premium between 4pm and 7pm
-                current_hour = hour + day * 24
-                if hour == 16 or hour == 17 or hour == 18:
-                    tou_wm.append(
-                        min(2.2 * wm[current_hour] +
-                            self.premium, self.maximum))
-                else:
-                    tou_wm.append(
-                        min(2.2 * wm[current_hour], self.maximum))
-        # plt.plot(tou_wm[:72])
-        # plt.plot(wm[:72])
-        # plt.show()
-        return tou_wm
+        wm = 2.2 * horizon(
+            self.wholesale_market['wholesale_market'], self.timesteps,
+            'Wholesale market price')
+        # premium between 4pm and 7pm
+        peak = np.isin(hour_of_day(self.timesteps), PEAK_HOURS)
+        return np.minimum(np.where(peak, wm + self.premium, wm), self.maximum)
 
     def tou_wm_wind_ppa(self):
 
-        wind_farm = self.wind_farm_info()
-        higher_band = wind_farm['higher_band']
-        lower_band = wind_farm['lower_band']
-        power = wind_farm['power']
-
-        # get tou from tou_wm_series
-        tou = self.tou_wm_series()
-
-        new_tou = np.empty(8760)
-        diff_tou = np.empty(8760)
-        for t in range(8760):
-            if power[t] >= higher_band:
-                new_tou[t] = tou[t] - self.higher_discount
-            elif power[t] <= lower_band:
-                new_tou[t] = tou[t] + self.lower_penalty
-            else:
-                new_tou[t] = tou[t]
-            diff_tou[t] = new_tou[t] - tou[t]
-        # plt.plot(diff_tou)
-        # plt.show()
-
-        hour1 = 1930
-        hour2 = 2000
-
-        lb = []
-        for x in range(hour2 - hour1):
-            lb.append(lower_band)
-        ub = []
-        for x in range(hour2 - hour1):
-            ub.append(higher_band)
-
-        return new_tou
+        return self.ppa_series(self.tou_wm_series())
 
     def findhorn_tariff(self):
 
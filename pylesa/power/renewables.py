@@ -6,10 +6,8 @@ additionally includes methods for analysis relating to modelling outputs
 from importlib.resources import files as ifiles
 import logging
 import pandas as pd
-import math
 import numpy as np
 
-import pvlib
 from pvlib.pvsystem import PVSystem
 from pvlib.location import Location
 from pvlib.modelchain import ModelChain as ModelChainPV
@@ -23,11 +21,41 @@ from windpowerlib.wind_farm import WindFarm
 
 from ..io import inputs
 from ..environment import weather
+from . import sam
 
 LOG = logging.getLogger(__name__)
 
 np.seterr(invalid='ignore')
 
+# monthly correction factors for correcting MEERA solar data set
+PV_MONTH_FACTORS = np.array([1.042785944,
+                             1.059859907,
+                             1.037299072,
+                             0.984286745,
+                             0.995849527,
+                             0.973795815,
+                             1.003315908,
+                             1.014427134,
+                             1.046833,
+                             1.091837017,
+                             1.039504694,
+                             0.95520793])
+
+
+def month_factors(index):
+    """PV correction factor of each timestep
+
+    months are taken from the calendar so that any length or
+    resolution of series is corrected
+
+    Arguments:
+        index {DatetimeIndex} -- timestamps of the PV series
+
+    Returns:
+        array -- correction factor of each timestamp
+    """
+    return PV_MONTH_FACTORS[np.asarray(index.month) - 1]
+
 def sum_renewable_generation():
 
     tot = wind_user_power() + wind_database_power() + PV_power()
@@ -142,39 +170,11 @@ class PV(object):
             weather_input {dataframe} -- dataframe with PV weather inputs
         """
 
-        # this replaces the whitespace or invalid characters
-        # with underscores so it fits with PVlib calc
-        module1 = module_name.replace(' ', '_').\
-            replace('-', '_').replace('.', '_').\
-            replace('(', '_').replace(')', '_').\
-            replace('[', '_').replace(']', '_').\
-            replace(':', '_').replace('+', '_').\
-            replace('/', '_').replace('"', '_').\
-            replace(',', '_')
-        inverter1 = inverter_name.replace(' ', '_').\
-            replace('-', '_').replace('.', '_').\
-            replace('(', '_').replace(')', '_').\
-            replace('[', '_').replace(']', '_').\
-            replace(':', '_').replace('+', '_').\
-            replace('/', '_').replace('"', '_').\
-            replace(',', '_')
-
-        cec_modules = pvlib.pvsystem.retrieve_sam('CECMod')
-        sandia_modules = pvlib.pvsystem.retrieve_sam('SandiaMod')
-
-        if module1 in cec_modules:
-            self.module = cec_modules[module1]
-        elif module1 in sandia_modules:
-            self.module = sandia_modules[module1]
-        else:
-            msg = f"Could not retrieve PV module data for {module1} from CEC or Sandia libraries"
-            LOG.error(msg)
-            raise KeyError(msg)
-
-        # of inverters and returns a pandas df
-        CEC_inverters = pvlib.pvsystem.retrieve_sam('cecinverter')
+        # the names are sanitised to fit with the PVlib libraries,
+        # which are read from the indexed copy in the sam module
+        self.module = sam.module(module_name)
         inverter1 = 'iPower__SHO_4_8__240V_'
-        self.inverter = CEC_inverters[inverter1]
+        self.inverter = sam.inverter(inverter1)
 
         # tech parameters
         self.multiplier = multiplier
@@ -211,11 +211,13 @@ class PV(object):
         """calculates the power output of PV
 
         Returns:
-            df -- power output
+            df -- power output of each timestep of the weather data
         """
 
+        weather = self.weather_data()
+
         if self.multiplier == 0:
-            data = np.zeros(8760)
+            data = np.zeros(len(weather))
             df = pd.Series(data)
             return df
 
@@ -235,42 +237,24 @@ class PV(object):
 
         mc = ModelChainPV(
             system, location)
-        weather = self.weather_data()
 
-        weather.index = pd.date_range(
-            start='01/01/2017', end='01/01/2018',
-            freq='1h', tz='Europe/London', inclusive='left')
+        # timestamps without a time zone are taken as GMT
+        if weather.index.tz is None:
+            weather.index = weather.index.tz_localize('UTC')
+        weather.index = weather.index.tz_convert('Europe/London')
 
         mc.run_model(weather=weather)
+        ac = mc.results.ac.to_numpy(dtype=float)
         # multiply by system losses
         # also multiply by correction factor
-        power = (mc.results.ac.infer_objects(copy=False).fillna(value=0).round(2) *
+        power = (np.round(np.where(np.isnan(ac), 0., ac), 2) *
                  self.multiplier * 0.001 * 0.85 * 0.85)
         # remove negative values
-        power[power < 0] = 0
-        # multiply by monthly correction factors
-        # for correcting MEERA solar data set
-        cf = [1.042785944,
-              1.059859907,
-              1.037299072,
-              0.984286745,
-              0.995849527,
-              0.973795815,
-              1.003315908,
-              1.014427134,
-              1.046833,
-              1.091837017,
-              1.039504694,
-              0.95520793]
-
-        # multiply by correction factor for each hour
-        for hour in range(8760):
-            month = int(math.floor(hour / 730))
-            power.iloc[hour] = power.iloc[hour] * cf[month]
-
-        power = power.reset_index(drop=True)
-
-        return power
+        power = np.maximum(power, 0.)
+        # multiply by correction factor of the month of each timestep
+        power *= month_factors(weather.index)
+
+        return pd.Series(power)
 
 
 class Windturbine(object):
@@ -0,0 +1,212 @@
+"""on-disk index of the SAM module and inverter libraries
+
+pvlib parses the whole CSV of a library on every retrieve_sam call,
+so each library is converted once into a file of pickled rows and an
+index of their offsets, keyed by the sanitised name. A lookup reads
+the index, which is kept for the life of the process, and unpickles
+only the requested row.
+
+The index is written to the cache folder of the user, or to the folder
+set by the PYLESA_CACHE_DIR environment variable. If it cannot be
+written there the libraries are read with pvlib instead.
+"""
+from functools import lru_cache
+import logging
+import os
+from pathlib import Path
+import pickle
+import re
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+import pvlib
+
+from .. import tools
+
+try:
+    from platformdirs import user_cache_dir
+except ImportError:
+    def user_cache_dir(appname: str) -> str:
+        """XDG cache folder of the user when platformdirs is missing"""
+        root = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        return str(Path(root) / appname)
+
+LOG = logging.getLogger(__name__)
+
+CACHE_DIR_VARIABLE = 'PYLESA_CACHE_DIR'
+
+LIBRARIES = ('CECMod', 'SandiaMod', 'cecinverter')
+MODULE_LIBRARIES = ('CECMod', 'SandiaMod')
+INVERTER_LIBRARY = 'cecinverter'
+
+# characters which pvlib replaces with underscores in the library names
+_INVALID = re.compile(r'[ \-.()\[\]:+/",]')
+
+
+def sanitise(name: str) -> str:
+    """name of a module or inverter as it appears in the libraries
+
+    Arguments:
+        name {str} -- name of module or inverter
+
+    Returns:
+        str -- name with whitespace and invalid characters replaced
+    """
+    return _INVALID.sub('_', name)
+
+
+def cache_dir() -> Path:
+    """folder of the library index, specific to the pvlib version"""
+    root = os.environ.get(CACHE_DIR_VARIABLE) or user_cache_dir('pylesa')
+    return Path(root) / 'sam' / f'pvlib-{pvlib.__version__}'
+
+
+def _files(library: str) -> Tuple[Path, Path]:
+    folder = cache_dir()
+    return folder / f'{library}.idx', folder / f'{library}.bin'
+
+
+def build(library: str) -> Dict[str, Tuple[int, int]]:
+    """convert a library to the indexed binary format
+
+    Arguments:
+        library {str} -- name of library, one of LIBRARIES
+
+    Returns:
+        dict -- offset and length of each row in the binary file
+    """
+    if library not in LIBRARIES:
+        msg = f'Unknown SAM library {library}, expected one of {LIBRARIES}'
+        LOG.error(msg)
+        raise ValueError(msg)
+
+    LOG.info(f'Building index of SAM library {library}')
+    table = pvlib.pvsystem.retrieve_sam(library)
+    index_file, data_file = _files(library)
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+
+    index = {}
+    tmp = data_file.with_name(f'{data_file.stem}_{os.getpid()}.tmp')
+    with open(tmp, 'wb') as handle:
+        for name, row in table.items():
+            data = pickle.dumps(row, protocol=pickle.HIGHEST_PROTOCOL)
+            index[name] = (handle.tell(), len(data))
+            handle.write(data)
+    os.replace(tmp, data_file)
+    # the index is written last so that it only exists for a complete file
+    tools.write_pickle(index, index_file)
+    return index
+
+
+@lru_cache(maxsize=None)
+def index(library: str) -> Optional[Dict[str, Tuple[int, int]]]:
+    """offsets of the rows of a library, built on first use
+
+    Arguments:
+        library {str} -- name of library, one of LIBRARIES
+
+    Returns:
+        dict -- offset and length of each row in the binary file,
+            None if the index could not be written
+    """
+    index_file, _ = _files(library)
+    if index_file.exists():
+        return pd.read_pickle(index_file)
+    try:
+        return build(library)
+    except OSError as err:
+        LOG.warning(
+            f'Could not write index of SAM library {library} to '
+            f'{index_file.parent}, reading it with pvlib instead: {err}')
+        return None
+
+
+@lru_cache(maxsize=None)
+def table(library: str) -> pd.DataFrame:
+    """whole library as read by pvlib, used when there is no index
+
+    Arguments:
+        library {str} -- name of library, one of LIBRARIES
+
+    Returns:
+        pd.DataFrame -- parameters of each module or inverter
+    """
+    return pvlib.pvsystem.retrieve_sam(library)
+
+
+def contains(library: str, name: str) -> bool:
+    """whether a module or inverter is in a library
+
+    Arguments:
+        library {str} -- name of library, one of LIBRARIES
+        name {str} -- sanitised name of module or inverter
+
+    Returns:
+        bool -- True if name is in the library
+    """
+    rows = index(library)
+    if rows is None:
+        return name in table(library)
+    return name in rows
+
+
+def lookup(library: str, name: str) -> pd.Series:
+    """parameters of a module or inverter
+
+    Arguments:
+        library {str} -- name of library, one of LIBRARIES
+        name {str} -- sanitised name of module or inverter
+
+    Raises:
+        KeyError -- if name is not in the library
+
+    Returns:
+        pd.Series -- parameters as returned by pvlib retrieve_sam
+    """
+    if not contains(library, name):
+        msg = f'Could not find {name} in SAM library {library}'
+        LOG.error(msg)
+        raise KeyError(msg)
+
+    rows = index(library)
+    if rows is None:
+        return table(library)[name]
+    offset, length = rows[name]
+    _, data_file = _files(library)
+    with open(data_file, 'rb') as handle:
+        handle.seek(offset)
+        return pickle.loads(handle.read(length))
+
+
+def module(name: str) -> pd.Series:
+    """parameters of a PV module from the CEC or Sandia library
+
+    Arguments:
+        name {str} -- name of module, sanitised if necessary
+
+    Raises:
+        KeyError -- if name is in neither library
+
+    Returns:
+        pd.Series -- parameters as returned by pvlib retrieve_sam
+    """
+    name = sanitise(name)
+    for library in MODULE_LIBRARIES:
+        if contains(library, name):
+            return lookup(library, name)
+
+    msg = f"Could not retrieve PV module data for {name} from CEC or Sandia libraries"
+    LOG.error(msg)
+    raise KeyError(msg)
+
+
+def inverter(name: str) -> pd.Series:
+    """parameters of an inverter from the CEC library
+
+    Arguments:
+        name {str} -- name of inverter, sanitised if necessary
+
+    Returns:
+        pd.Series -- parameters as returned by pvlib retrieve_sam
+    """
+    return lookup(INVERTER_LIBRARY, sanitise(name))
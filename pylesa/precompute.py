@@ -0,0 +1,99 @@
+"""sweep-invariant precalculation
+
+only the heat pump capacity and thermal storage size vary across the
+combinations of a parametric analysis, so the renewable generation,
+import tariff and electrical match are calculated once per run and
+shared by the controllers of every combination
+"""
+import logging
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+from . import initialise_classes, tools
+from .constants import INDIR
+from .io import inputs
+from .power import grid
+
+LOG = logging.getLogger(__name__)
+
+FILENAME = 'precompute.pkl'
+
+
+def calculate(root: Path, subname: str) -> Dict[str, object]:
+    """calculate the series which are the same for every combination
+
+    Args:
+        root: root directory of simulation
+        subname: name of the inputs, either 'inputs' or a combination
+
+    Returns:
+        Dictionary of wind_user, wind_database, PV, generation_total,
+        import_cost and elec_match series
+    """
+    myInputs = inputs.Inputs(root, subname)
+    renewables = initialise_classes.init_renewables(myInputs)
+
+    wind_user = renewables['myUserWindturbine'].user_power()['wind_user']
+    wind_database = (
+        renewables['myDatabaseWindturbine'].database_power()['wind_database'])
+    PV = renewables['myPV'].power_output()
+    generation_total = wind_user + wind_database + PV
+
+    myGrid = initialise_classes.init_grid(root, subname, myInputs)
+    import_cost = myGrid.import_cost_series()
+
+    dem = myInputs.demands()
+    myCheck = tools.CheckFunctions(
+        generation_total, dem['elec_demand'], dem['heat_demand'])
+    # the electricity match metrics are performed over the entire year
+    elec_match = myCheck.electrical_surplus_deficit()
+
+    return {'wind_user': wind_user,
+            'wind_database': wind_database,
+            'PV': PV,
+            'generation_total': generation_total,
+            'import_cost': import_cost,
+            'elec_match': elec_match}
+
+
+def run(root: Path) -> None:
+    """calculate and write the series shared by every combination
+
+    Called after the inputs of the run are read, which replaces
+    the series of any previous inputs.
+
+    Args:
+        root: root directory of simulation
+    """
+    root = Path(root).resolve()
+    file = root / INDIR / FILENAME
+    if file.exists():
+        file.unlink()
+
+    grid.cache_wind_farm(root)
+    tools.write_pickle(calculate(root, 'inputs'), file)
+    LOG.info('Calculated the renewable generation and tariff of the run')
+
+
+def load(root: Path, subname: str) -> Dict[str, object]:
+    """read the series shared by every combination
+
+    They are calculated and written if the run has not been
+    precalculated, for example when the inputs are written directly.
+
+    Args:
+        root: root directory of simulation
+        subname: name of specific parametric run configuration
+
+    Returns:
+        Dictionary of series, see calculate
+    """
+    file = Path(root).resolve() / INDIR / FILENAME
+    if file.exists():
+        return pd.read_pickle(file)
+
+    series = calculate(root, subname)
+    tools.write_pickle(series, file)
+    return series
@@ -0,0 +1,222 @@
+"""hot water tanks of many combinations stepped in lock-step
+
+The combinations of a run only differ in a few scalars of the tank,
+such as the capacity, while the conditions of each hour are the same.
+The maximum energy which can be charged to or discharged from every
+tank is solved at once as an array of tanks x nodes, with the same
+arithmetic as HotWaterTank.max_energy_in_out for each row, and handed
+to the tanks as seeds for the hour. The hours of one tank, such as
+the capacity of each hour of the predictive controller, are solved in
+the same way with one row per distinct set of conditions.
+"""
+import logging
+from typing import Sequence
+
+import numpy as np
+
+from . import kernels
+from .enums import Integrator
+from .hot_water_tank import (HotWaterTank, STATE_CODES, STATES, discharged,
+                              seed_key)
+
+LOG = logging.getLogger(__name__)
+
+# states solved for every hour, as used by the fixed order controller
+SEEDED_STATES = ('charging', 'discharging')
+
+
+def max_energy_in_out(tanks: Sequence[HotWaterTank], state, nodes_temp,
+                      source_temp, flow_temp, return_temp, timestep):
+    """maximum energy which can be charged to or discharged from tanks
+
+    Each result is equal to the max_energy_in_out of the tank solved
+    without the cache. The temperatures and hour are the same for
+    every row or given for each row.
+
+    Arguments:
+        tanks {list} -- HotWaterTank of each row, with the same
+            number of nodes
+        state {str} -- charging, discharging or standby
+        nodes_temp {array} -- temperature of each node, tanks x nodes
+        source_temp {float or array} -- temperature of heat source
+        flow_temp {float or array} -- flow temperature to demand
+        return_temp {float or array} -- return temperature from demand
+        timestep {int or array} -- hour of year
+
+    Returns:
+        array -- energy in kWh of each tank
+    """
+    if state not in STATES:
+        msg = f'State {state} not valid, must be one of {STATES}'
+        LOG.error(msg)
+        raise ValueError(msg)
+
+    nodes_temp = np.array(nodes_temp, dtype=float, ndmin=2)
+    count, n = nodes_temp.shape
+    if len(tanks) != count:
+        msg = f'Got node temperatures of {count} tanks for {len(tanks)} tanks'
+        LOG.error(msg)
+        raise ValueError(msg)
+    if any(tank.number_nodes != n for tank in tanks):
+        msg = f'All tanks must have {n} nodes to be solved together'
+        LOG.error(msg)
+        raise ValueError(msg)
+    source_temp, flow_temp, return_temp = (
+        np.broadcast_to(np.asarray(value, dtype=float), (count,))
+        for value in (source_temp, flow_temp, return_temp))
+    timestep = np.broadcast_to(timestep, (count,))
+
+    # summed node by node as the built in sum of the tank
+    nodes_temp_sum = np.zeros(count)
+    for node in range(n):
+        nodes_temp_sum = nodes_temp_sum + nodes_temp[:, node]
+
+    solved = np.array([tank.capacity == 0 or state == 'standby'
+                       for tank in tanks], dtype=bool)
+    if state == 'charging':
+        solved |= nodes_temp_sum >= source_temp * n
+    elif state == 'discharging':
+        solved |= nodes_temp_sum <= return_temp * n
+
+    energy = np.zeros(count)
+    rows = np.flatnonzero(~solved)
+    if not rows.size:
+        return energy
+
+    tanks = [tanks[row] for row in rows]
+    nodes_temp = nodes_temp[rows]
+    source_temp = source_temp[rows]
+    flow_temp = flow_temp[rows]
+    return_temp = return_temp[rows]
+    timestep = timestep[rows]
+    node_mass, UA, Ta, connection_loss = np.array(
+        [tank.node_constants(hour) for tank, hour in zip(tanks, timestep)]).T
+    mass_flow = node_mass
+    cp = np.array([tank.specific_heat_water(temp)
+                   for tank, temp in zip(tanks, source_temp)])
+    cp_tables = np.array([tank.cp_array for tank in tanks])
+    exact = np.array([tank.integrator == Integrator.EXACT for tank in tanks])
+    rise = np.array([tank.max_rise(hour)
+                     for tank, hour in zip(tanks, timestep)])
+
+    # rows still solved, see HotWaterTank._max_energy_in_out
+    active = np.ones(len(rows), dtype=bool)
+    energy_total = np.zeros(len(rows))
+    for i in range(1, n):
+        if state == 'charging':
+            step_energy = np.where(
+                source_temp > nodes_temp[:, -1],
+                mass_flow * cp * (source_temp - nodes_temp[:, -1]), 0.)
+        else:
+            step_energy = np.where(
+                nodes_temp[:, 0] > flow_temp,
+                mass_flow * cp * (nodes_temp[:, 0] - return_temp), 0.)
+        energy_total = energy_total + step_energy
+
+        if i == n - 1:
+            break
+        if state == 'discharging':
+            active &= ~discharged(
+                nodes_temp, flow_temp, return_temp, rise * (n - 1 - i))
+            if not active.any():
+                break
+
+        # solve for next step with the maximum mass flow
+        index = np.flatnonzero(active)
+        temps = nodes_temp[index]
+        nodes_cp = kernels.batch_specific_heat(temps, cp_tables[index])
+        coefficients = kernels.batch_coefficients(
+            STATE_CODES[state], temps, nodes_cp, mass_flow[index],
+            source_temp[index], flow_temp[index], return_temp[index],
+            node_mass[index], UA[index], Ta[index], connection_loss[index])
+
+        tspan = [i - 1, i]
+        A, B, C, D = coefficients
+        new_temp = np.empty_like(temps)
+        solve_exact = exact[index]
+        if solve_exact.any():
+            dTdt = A * temps + D
+            dTdt[:, 1:] += B[:, 1:] * temps[:, :-1]
+            dTdt[:, :-1] += C[:, :-1] * temps[:, 1:]
+            new_temp[solve_exact] = (temps + dTdt * (tspan[1] - tspan[0]))[solve_exact]
+        for row in np.flatnonzero(~solve_exact):
+            new_temp[row] = tanks[index[row]].integrate_step(
+                temps[row], (A[row], B[row], C[row], D[row]), tspan)
+        # the temperatures of the other rows are no longer needed
+        nodes_temp[index] = new_temp
+
+    # convert J to kWh by divide by 3600000
+    energy[rows] = energy_total / 3600000
+    return energy
+
+
+def max_energy_hours(tank: HotWaterTank, state, nodes_temp, source_temp,
+                     flow_temp, return_temp, timesteps):
+    """maximum energy of one tank from the same node temperatures over hours
+
+    Hours with the same source, flow, return and ambient temperatures
+    have the same result, which is solved once. The flow and return
+    temperatures are only used while discharging, so when charging
+    the hours only need the same source and ambient temperatures.
+    Each result is equal to the max_energy_in_out of the tank for the
+    hour.
+
+    Arguments:
+        tank {HotWaterTank} -- tank
+        state {str} -- charging, discharging or standby
+        nodes_temp {list} -- temperature of each node at every hour
+        source_temp {float or array} -- temperature of heat source
+        flow_temp {float or array} -- flow temperature to demand
+        return_temp {float or array} -- return temperature from demand
+        timesteps {array} -- hours of year
+
+    Returns:
+        array -- energy in kWh of each hour
+    """
+    timesteps = np.asarray(timesteps, dtype=int)
+    count = len(timesteps)
+    conditions = np.column_stack(
+        [np.broadcast_to(np.asarray(value, dtype=float), (count,))
+         for value in (source_temp, flow_temp, return_temp)] +
+        [[tank.amb_temp(hour) for hour in timesteps]])
+    key = conditions if state == 'discharging' else conditions[:, [0, 3]]
+    _, first, inverse = np.unique(
+        key, axis=0, return_index=True, return_inverse=True)
+    LOG.debug(f'Solving max energy of {count} hours as {len(first)} '
+              f'distinct conditions')
+
+    nodes_temp = np.asarray(nodes_temp, dtype=float)
+    energy = max_energy_in_out(
+        [tank] * len(first), state, np.tile(nodes_temp, (len(first), 1)),
+        conditions[first, 0], conditions[first, 1], conditions[first, 2],
+        timesteps[first])
+    return energy[inverse.reshape(-1)]
+
+
+def seed_max_energy(tanks: Sequence[HotWaterTank], nodes_temp, source_temp,
+                    flow_temp, return_temp, timestep, states=SEEDED_STATES):
+    """solve the maximum energy of the hour of many tanks and seed them
+
+    Arguments:
+        tanks {list} -- HotWaterTank of each row, with the same
+            number of nodes
+        nodes_temp {list} -- node temperatures of each tank
+        source_temp {float} -- temperature of heat source
+        flow_temp {float} -- flow temperature to demand
+        return_temp {float} -- return temperature from demand
+        timestep {int} -- hour of year
+
+    Keyword Arguments:
+        states {tuple} -- states to solve (default: {SEEDED_STATES})
+    """
+    seeds = [{} for _ in tanks]
+    for state in states:
+        energy = max_energy_in_out(
+            tanks, state, nodes_temp, source_temp, flow_temp, return_temp,
+            timestep)
+        for tank_seeds, temps, value in zip(seeds, nodes_temp, energy):
+            key = seed_key(state, temps, source_temp, flow_temp,
+                           return_temp, timestep)
+            tank_seeds[key] = float(value)
+    for tank, tank_seeds in zip(tanks, seeds):
+        tank.seed_max_energy(tank_seeds)
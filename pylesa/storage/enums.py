@@ -0,0 +1,9 @@
+from enum import Enum
+
+from ..heat.enums import SingleTypeCheck
+
+
+class Integrator(str, Enum, metaclass=SingleTypeCheck):
+    ODEINT = "ODEINT"
+    EXACT = "EXACT"
+    EXPM = "EXPM"
@@ -5,11 +5,17 @@ lowest capacity is 100L, this can be used as
 """
 from importlib.resources import files as ifiles
 import logging
+from collections import OrderedDict, namedtuple
+from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 import math
 
 from scipy.integrate import odeint
+from scipy.linalg import expm
 
+from . import kernels
+from .enums import Integrator
 from ..environment import weather
 
 LOG = logging.getLogger(__name__)
@@ -21,12 +27,82 @@ INSULATION_K = {
 }
 INSIDE = 'inside'
 OUTSIDE = 'outside'
+STATES = ('charging', 'discharging', 'standby')
+STATE_CODES = {'charging': kernels.CHARGING,
+               'discharging': kernels.DISCHARGING,
+               'standby': kernels.STANDBY}
+# number of max_energy_in_out results held in the least recently used cache
+MAX_ENERGY_CACHE_SIZE = 4096
+# decimal places node temperatures are rounded to in the cache key
+MAX_ENERGY_CACHE_DECIMALS = 6
+# degC below the flow temperature the top node must be held to stop
+# solving max_energy_in_out early, which covers the rounding of odeint
+DISCHARGED_MARGIN = 1e-6
+# times a step of new_nodes_temp may be halved to meet step_tolerance
+MAX_STEP_HALVINGS = 12
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+@dataclass(frozen=True)
+class TankConstants:
+    """terms of the node equations fixed by the design of a tank
+
+    Attributes:
+        node_mass: mass of one node, kg
+        insulation: overall and insulation correction factors times
+            the k-value of the insulation
+        thickness: thickness of the insulation, m
+        surface: geometric term of the tank surface, r1^2 + h(r2 + r1)
+        UA: heat loss through the insulation per degree of temperature
+            difference
+        connection_loss: heat loss of the openings and connections
+            times the overall correction factor
+    """
+    node_mass: float
+    insulation: float
+    thickness: float
+    surface: float
+    UA: float
+    connection_loss: float
+
+
+def discharged(nodes_temp, flow_temp, return_temp, rise):
+    """whether the top node stays at or below the flow temperature
+
+    Arguments:
+        nodes_temp {array} -- temperature of each node, or tanks x nodes
+        flow_temp {float} -- flow temperature to demand
+        return_temp {float} -- return temperature from demand
+        rise {float or array} -- upper bound of the rise of the node
+            temperatures until the end, see HotWaterTank.max_rise
+
+    Returns:
+        bool or array -- True if no more energy can be discharged
+    """
+    highest = np.maximum(np.max(nodes_temp, axis=-1), return_temp)
+    return highest + rise + DISCHARGED_MARGIN < flow_temp
+
+
+def water_in_range(nodes_temp):
+    """whether every node is within the 0 to 100 degC of the cp table"""
+    return bool(np.all((nodes_temp >= 0.) & (nodes_temp <= 100.)))
+
+
+def seed_key(state, nodes_temp, source_temp, flow_temp, return_temp,
+             timestep):
+    """key of a seeded max_energy_in_out result, the exact arguments"""
+    return (state, np.asarray(nodes_temp, dtype=float).tobytes(),
+            float(source_temp), float(flow_temp), float(return_temp),
+            timestep)
+
 
 class HotWaterTank(object):
 
     def __init__(self, capacity, insulation, location, number_nodes,
                  dimensions, tank_openings, correction_factors,
-                 air_temperature=None):
+                 air_temperature=None, integrator=Integrator.ODEINT,
+                 cache_size=MAX_ENERGY_CACHE_SIZE, step_tolerance=None):
         """hot water tank class object
 
         Arguments:
@@ -45,8 +121,21 @@ class HotWaterTank(object):
 
         Keyword Arguments:
             air_temperature {dataframe} -- (default: {None})
+            integrator {Integrator} -- method used to step the node
+                temperatures (default: {Integrator.ODEINT})
+            cache_size {int} -- maximum number of max_energy_in_out
+                results cached, 0 disables the cache
+                (default: {MAX_ENERGY_CACHE_SIZE})
+            step_tolerance {float} -- estimated error in degC of the
+                node temperatures at the end of an hour, the internal
+                steps of new_nodes_temp are chosen to meet it, see
+                adaptive_steps (default: {None}, one step per node mass
+                of flow)
         """
 
+        # dic inputs, dimensions are calculated from the capacity
+        self.dimensions = dimensions
+
         # float or str inputs
         self.capacity = capacity
         self.insulation = str(insulation).lower().strip()
@@ -54,22 +143,38 @@ class HotWaterTank(object):
         self.number_nodes = number_nodes
         self.node_list = list(range(self.number_nodes))
 
-        # dic inputs
-        self.dimensions = dimensions
-        # using new calc for dimensions
-        # assuming a ratio of height to width of 2.5
-        factor = 2.5
-        self.dimensions['width'] = 2 * (self.capacity / (factor * math.pi)) ** (1. / 3)
-        self.dimensions['height'] = 0.5 * factor * self.dimensions['width']
-        # assuming a ratio of width to insulation thickness
-        ins_divider = 8
-        self.dimensions['insulation_thickness'] = self.dimensions['width'] / ins_divider
-
         self.tank_openings = tank_openings
         self.correction_factors = correction_factors
 
         # optional input, needed if location is set to outside
         self.air_temperature = air_temperature
+        # outdoor temperature of each hour as an array for amb_temp
+        self.outdoor_temperature = None
+        if self.location == OUTSIDE and air_temperature is not None:
+            w = weather.Weather(
+                air_temperature=air_temperature).hot_water_tank()
+            self.outdoor_temperature = np.asarray(
+                w['air_temperature']['air_temperature'], dtype=float)
+
+        if integrator not in Integrator:
+            msg = f'Integrator {integrator} is not one of {[_.value for _ in Integrator]}'
+            LOG.error(msg)
+            raise ValueError(msg)
+        self.integrator = Integrator.from_value(integrator)
+
+        if cache_size < 0:
+            msg = f'Cache size must not be negative, got {cache_size}'
+            LOG.error(msg)
+            raise ValueError(msg)
+        self.cache_size = cache_size
+
+        if step_tolerance is not None and not step_tolerance > 0:
+            msg = f'Step tolerance must be positive, got {step_tolerance}'
+            LOG.error(msg)
+            raise ValueError(msg)
+        self.step_tolerance = step_tolerance
+
+        self.clear_cache()
 
         self.cp_spec = pd.read_pickle(
             # Use importlib.resources to manage files required by package
@@ -79,6 +184,77 @@ class HotWaterTank(object):
         self.cp = {
             temp: cp * 1000 for (temp, cp) in zip(self.cp_spec['t'], self.cp_spec['Cp'])
         }
+        # same table as an array indexed by temp / 10 for node arrays
+        self.cp_array = np.array(
+            [self.cp[temp] for temp in sorted(self.cp)], dtype=float)
+
+    @property
+    def capacity(self):
+        """capacity in L of tank"""
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        self._capacity = capacity
+        # using new calc for dimensions
+        # assuming a ratio of height to width of 2.5
+        factor = 2.5
+        self.dimensions['width'] = 2 * (capacity / (factor * math.pi)) ** (1. / 3)
+        self.dimensions['height'] = 0.5 * factor * self.dimensions['width']
+        # assuming a ratio of width to insulation thickness
+        ins_divider = 8
+        self.dimensions['insulation_thickness'] = self.dimensions['width'] / ins_divider
+        self._constants = None
+        # max_energy_in_out results were computed for the old geometry
+        self.clear_cache()
+
+    @property
+    def constants(self):
+        """terms of the node equations fixed by the tank
+
+        Calculated on first use and kept until the capacity changes.
+
+        Returns:
+            TankConstants -- node mass, insulation and connection losses
+        """
+        if self._constants is None:
+            self._constants = self.tank_constants()
+        return self._constants
+
+    def tank_constants(self):
+        """calculates the terms of the node equations fixed by the tank
+
+        Returns:
+            TankConstants -- node mass, insulation and connection losses
+        """
+        node_mass = float(self.capacity) / self.number_nodes
+
+        # thermal conductivity of insulation material
+        k = self.insulation_k_value()
+
+        # dimensions
+        r1 = self.internal_radius()
+        r2 = self.dimensions['width']
+        h = self.dimensions['height']
+
+        # correction factors
+        Fi = self.correction_factors['insulation_factor']
+        Fe = self.correction_factors['overall_factor']
+
+        # heat loss through insulation per degree of temperature difference,
+        # a tank without capacity has no insulation and no losses
+        if r2 == r1:
+            UA = 0.
+        else:
+            UA = Fe * Fi * k * math.pi * ((r1 ** 2) + h * (r2 + r1)) / (r2 - r1)
+
+        return TankConstants(
+            node_mass=node_mass,
+            insulation=Fe * Fi * k,
+            thickness=r2 - r1,
+            surface=(r1 ** 2) + h * (r2 + r1),
+            UA=UA,
+            connection_loss=Fe * self.connection_losses())
 
     def init_temps(self, initial_temp):
         nodes_temp = []
@@ -92,9 +268,7 @@ class HotWaterTank(object):
         Returns:
             float -- mass of one node kg
         """
-
-        node_mass = float(self.capacity) / self.number_nodes
-        return node_mass
+        return self.constants.node_mass
 
     def insulation_k_value(self):
         """selects k for insulation
@@ -115,25 +289,44 @@ class HotWaterTank(object):
     def specific_heat_water(self, temp):
         """cp of water
 
+        Interpolated linearly between the 10 degC entries of the cp
+        table, for Python and NumPy numbers alike.
+
         Arguments:
-            temp {float} -- temperature of water
+            temp {float or array} -- temperature of water
 
         Returns:
-            float -- cp of water at given temp - j/(kg deg C)
+            float or array -- cp of water at given temp - j/(kg deg C)
         """
+        if np.ndim(temp):
+            return self.specific_heat_nodes(temp)
+
         # input temp must be between 0 and 100 deg
-        if isinstance(temp, (int, float)):
-            if 100. >= temp >= 0.:
-                T = round(float(temp), -1)
-                cp = self.cp[T]
-            else:
-                msg = f"Water temperature {temp} is outside of allowable range of 0<=temp<=100"
-                LOG.error(msg)
-                raise ValueError(msg)
-        else:
-            cp = 4180
+        if not 100. >= temp >= 0.:
+            msg = f"Water temperature {temp} is outside of allowable range of 0<=temp<=100"
+            LOG.error(msg)
+            raise ValueError(msg)
+        return float(kernels.interpolate_cp(float(temp), self.cp_array))
 
-        return cp
+    def specific_heat_nodes(self, nodes_temp):
+        """cp of water for an array of node temperatures
+
+        Vectorised version of specific_heat_water.
+
+        Arguments:
+            nodes_temp {array} -- temperatures of water
+
+        Returns:
+            array -- cp of water at given temps - j/(kg deg C)
+        """
+        temps = np.asarray(nodes_temp, dtype=float)
+        try:
+            return kernels.specific_heat(
+                temps.ravel(), self.cp_array).reshape(temps.shape)
+        except ValueError:
+            msg = f"Water temperatures {temps} are outside of allowable range of 0<=temp<=100"
+            LOG.error(msg)
+            raise ValueError(msg)
 
     def internal_radius(self):
         """calculates internal radius
@@ -150,19 +343,27 @@ class HotWaterTank(object):
 
         If location of storage is inside then a 15 deg ambient
         condition is assumed else if location is outside then
-        outdoor temperature is used.
+        outdoor temperature is used. The outdoor temperature of a
+        timestep between two hours is interpolated linearly.
 
         Arguments:
-            timestep {int} --
+            timestep {int or float} -- hour of year
 
         Returns:
             float -- ambient temp surrounding tank degC
         """
         if self.location == OUTSIDE:
+            temps = self.outdoor_temperature
+            if temps is None:
+                msg = f'Air temperature is needed for a tank {OUTSIDE}'
+                LOG.error(msg)
+                raise ValueError(msg)
 
-            w = weather.Weather(
-                air_temperature=self.air_temperature).hot_water_tank()
-            ambient_temp = w['air_temperature']['air_temperature'][timestep]
+            hour = int(timestep)
+            ambient_temp = float(temps[hour])
+            if timestep != hour and hour + 1 < len(temps):
+                ambient_temp += (timestep - hour) * (
+                    float(temps[hour + 1]) - ambient_temp)
 
         elif self.location == INSIDE:
             ambient_temp = 15.0
@@ -492,17 +693,8 @@ class HotWaterTank(object):
         # specific heat at temperature of node i
         cp = self.specific_heat_water(nodes_temp[node])
 
-        # thermal conductivity of insulation material
-        k = self.insulation_k_value()
-
-        # dimensions
-        r1 = self.internal_radius()
-        r2 = self.dimensions['width']
-        h = self.dimensions['height']
-
-        # correction factors
-        Fi = self.correction_factors['insulation_factor']
-        Fe = self.correction_factors['overall_factor']
+        # insulation, dimensions and correction factors
+        c = self.constants
         Fd = self.discharging_function(state, nodes_temp, flow_temp, node)[node]
         mf = self.mixing_function(state, node, nodes_temp,
                                   source_temp, flow_temp)
@@ -512,8 +704,8 @@ class HotWaterTank(object):
              mf['Fdnt'] * mass_flow * cp -
              mf['Fcnb'] * mass_flow * cp -
              Fco * mass_flow * cp -
-             Fe * Fi * k * ((1) / (r2 - r1)) *
-             math.pi * ((r1 ** 2) + h * (r2 + r1))
+             c.insulation * ((1) / c.thickness) *
+             math.pi * c.surface
              ) / (node_mass * cp)
 
         return A
@@ -546,33 +738,265 @@ class HotWaterTank(object):
         # specific heat at temperature of node i
         cp = self.specific_heat_water(nodes_temp[node])
 
-        # thermal conductivity of insulation material
-        k = self.insulation_k_value()
-
-        # dimensions
-        r1 = self.internal_radius()
-        r2 = self.dimensions['width']
-        h = self.dimensions['height']
-
-        # correction factors
-        Fi = self.correction_factors['insulation_factor']
-        Fe = self.correction_factors['overall_factor']
+        # insulation, dimensions and correction factors
+        c = self.constants
 
         Fc = self.charging_function(state, nodes_temp, source_temp, node)[node]
         Fdi = self.discharging_bottom_node(
             state, nodes_temp, return_temp, flow_temp)[node]
         Ta = self.amb_temp(timestep)
 
-        cl = self.connection_losses()
-
         D = (Fc * mass_flow * cp * source_temp +
              Fdi * mass_flow * cp * return_temp +
-             Fe * Fi * k * ((Ta) / (r2 - r1)) * math.pi *
-             ((r1 ** 2) + h * (r2 + r1)) + Fe * cl
+             c.insulation * ((Ta) / c.thickness) * math.pi *
+             c.surface + c.connection_loss
              ) / (node_mass * cp)
 
         return D
 
+    def coefficient_arrays(self, state, nodes_temp, mass_flow, source_temp,
+                           flow_temp, return_temp, timestep):
+        """coefficients A, B, C and D of all nodes as arrays
+
+        Array equivalent of calling coefficient_A, coefficient_B,
+        coefficient_C and coefficient_D for every node, the node
+        functions are built once for the whole tank.
+
+        Arguments:
+            state {str} -- charging, discharging or standby
+            nodes_temp {array} -- temperature of each node
+            mass_flow {float} -- mass flow in internal timestep
+            source_temp {float} -- temperature of charging water
+            flow_temp {float} -- flow temperature of district heating
+            return_temp {float} -- return temperature of district heating
+            timestep {int} -- hour of year
+
+        Returns:
+            tuple -- arrays of coefficients A, B, C and D
+        """
+        if state not in STATES:
+            msg = f'State {state} not valid, must be one of {STATES}'
+            LOG.error(msg)
+            raise ValueError(msg)
+
+        nodes_temp = np.asarray(nodes_temp, dtype=float)
+
+        # specific heat at temperature of each node
+        cp = self.specific_heat_nodes(nodes_temp)
+
+        # node functions, see charging_function, discharging_function,
+        # charging_top_node, discharging_bottom_node and mixing_function,
+        # are evaluated by the kernel, compiled if numba is installed
+        return kernels.coefficients(
+            STATE_CODES[state], nodes_temp, cp, mass_flow, source_temp,
+            flow_temp, return_temp, *self.node_constants(timestep))
+
+    def node_constants(self, timestep):
+        """terms of the node equations which do not depend on the nodes
+
+        Arguments:
+            timestep {int} -- hour of year
+
+        Returns:
+            tuple -- node mass, heat loss per degree through the
+                insulation, ambient temperature and corrected heat
+                loss of the connections
+        """
+        c = self.constants
+        return c.node_mass, c.UA, self.amb_temp(timestep), c.connection_loss
+
+    @staticmethod
+    def node_derivatives(nodes_temp, coefficients):
+        """rate of change of temperature of all nodes
+
+        Each node is coupled to the node above through B and
+        the node below through C, so the system is tridiagonal.
+
+        Arguments:
+            nodes_temp {array} -- temperature of each node
+            coefficients {tuple} -- arrays A, B, C and D
+
+        Returns:
+            array -- dT/dt of each node
+        """
+        return kernels.node_derivatives(nodes_temp, *coefficients)
+
+    @staticmethod
+    def node_matrix(coefficients):
+        """tridiagonal matrix M of the system dT/dt = M T + D
+
+        Arguments:
+            coefficients {tuple} -- arrays A, B, C and D
+
+        Returns:
+            array -- square matrix with A on the diagonal, B below
+                and C above
+        """
+        A, B, C, _ = coefficients
+        return np.diag(A) + np.diag(B[1:], -1) + np.diag(C[:-1], 1)
+
+    def integrate_step(self, nodes_temp, coefficients, tspan):
+        """temperature of nodes after one internal timestep
+
+        With the odeint and exact integrators the rate of change is
+        evaluated at the start of the step and held for the whole step,
+        the exact integrator applies this directly rather than through
+        odeint. The expm integrator solves the coupled linear system
+        over the step with a matrix exponential, so the node
+        temperatures, and their losses and mixing, evolve within the
+        step.
+
+        Arguments:
+            nodes_temp {array} -- temperature of each node
+            coefficients {tuple} -- arrays A, B, C and D
+            tspan {list} -- start and end of internal timestep
+
+        Returns:
+            array -- temperature of each node at end of step
+        """
+        dt = tspan[1] - tspan[0]
+
+        if self.integrator == Integrator.EXACT:
+            return nodes_temp + self.node_derivatives(
+                nodes_temp, coefficients) * dt
+
+        elif self.integrator == Integrator.EXPM:
+            # augmented system [T, 1] so that D is included in expm
+            n = self.number_nodes
+            M = np.zeros((n + 1, n + 1))
+            M[:n, :n] = self.node_matrix(coefficients)
+            M[:n, n] = coefficients[3]
+            E = expm(M * dt)
+            return E[:n, :n] @ nodes_temp + E[:n, n]
+
+        dTdt = self.node_derivatives(nodes_temp, coefficients)
+
+        def model_temp(z, t):
+            return dTdt
+
+        z = odeint(model_temp, nodes_temp, tspan)
+        return z[1]
+
+    def standby_step(self, nodes_temp, coefficients, dt=1):
+        """temperature of nodes after a step without flow
+
+        Without flow the nodes are not coupled, B and C are zero, and
+        each node only exchanges heat with its surroundings, so the
+        step is solved in closed form rather than by integrate_step.
+        The expm integrator decays each node exactly towards its
+        equilibrium temperature -D/A, the others hold the rate of
+        change for the whole step.
+
+        Arguments:
+            nodes_temp {array} -- temperature of each node
+            coefficients {tuple} -- arrays A, B, C and D for standby
+
+        Keyword Arguments:
+            dt {float} -- length of step (default: {1})
+
+        Returns:
+            array -- temperature of each node at end of step
+        """
+        A, _, _, D = coefficients
+        dTdt = A * nodes_temp + D
+        if self.integrator == Integrator.EXPM:
+            return nodes_temp + dTdt * (np.expm1(A * dt) / A)
+        return nodes_temp + dTdt * dt
+
+    def adaptive_steps(self, nodes_temp, step_coefficients, duration):
+        """temperature of nodes over steps chosen from an error estimate
+
+        Each step is integrated whole and as two halves, with the
+        coefficients of the second half taken at the middle of the
+        step. The difference estimates the error of the whole step.
+        Coefficients which change in the second half, such as when a
+        node passes the flow temperature, are bounded by the change of
+        the rate of change with the coefficients at the end of the
+        step. These errors build up over the steps, so each step is
+        allowed its share of half of step_tolerance.
+
+        Nodes which pass each other within a step are mixed by sorting
+        them at the end of the step rather than where they meet. The
+        error is at most the distance they passed, which does not
+        build up as the next step mixes them again, so each step is
+        allowed the other half of step_tolerance.
+
+        The halves are kept if both errors are within their allowance
+        and the next step is twice as long, otherwise the step is
+        halved, as it is if the halves take water out of the range of
+        the cp table. A step halved MAX_STEP_HALVINGS times is kept
+        whatever its error.
+
+        Arguments:
+            nodes_temp {array} -- temperature of each node
+            step_coefficients {function} -- arrays A, B, C and D at
+                the temperature of each node
+            duration {float} -- length of all steps together
+
+        Returns:
+            list -- temperature of each node after each step kept
+        """
+        shortest = duration / 2 ** MAX_STEP_HALVINGS
+        start = 0.
+        step = duration
+        coefficients = step_coefficients(nodes_temp)
+        node_temp_list = []
+        while start < duration:
+            step = min(step, duration - start)
+            middle = start + step / 2.
+            end = start + step
+
+            unsorted = self.integrate_step(
+                nodes_temp, coefficients, [start, end])
+            whole = np.sort(unsorted)[::-1]
+            half = np.sort(self.integrate_step(
+                nodes_temp, coefficients, [start, middle]))[::-1]
+            if step > shortest and not water_in_range(half):
+                step /= 2.
+                continue
+            middle_coefficients = step_coefficients(half)
+            halves = np.sort(self.integrate_step(
+                half, middle_coefficients, [middle, end]))[::-1]
+            if step > shortest and not water_in_range(halves):
+                step /= 2.
+                continue
+            end_coefficients = step_coefficients(halves)
+
+            change = (self.node_derivatives(halves, end_coefficients) -
+                      self.node_derivatives(halves, middle_coefficients))
+            error = max(np.max(np.abs(halves - whole)),
+                        np.max(np.abs(change)) * step / 2.)
+            passed = np.max(np.abs(whole - unsorted))
+            within = (error <= self.step_tolerance * step / duration / 2. and
+                      passed <= self.step_tolerance / 2.)
+            if within or step <= shortest:
+                nodes_temp = halves
+                coefficients = end_coefficients
+                node_temp_list.append(list(nodes_temp))
+                start = end
+                step *= 2.
+            else:
+                step /= 2.
+        return node_temp_list
+
+    def max_rise(self, timestep):
+        """upper bound of the rise of any node temperature in a step
+
+        In one internal step at most the mass of a node flows into or
+        out of each node, so the new temperature of a node is that of
+        a node, the return water or zero plus the gain from its
+        surroundings. The gain is largest for water at 0 degC.
+
+        Arguments:
+            timestep {int} -- hour of year
+
+        Returns:
+            float -- rise in degC
+        """
+        c = self.constants
+        gain = c.UA * self.amb_temp(timestep) + c.connection_loss
+        return max(gain, 0.) / (c.node_mass * self.cp_array.min())
+
     def set_of_coefficients(self, state, nodes_temp, source_temp,
                             source_delta_t, flow_temp, return_temp,
                             thermal_output, demand, temp_tank_bottom,
@@ -605,49 +1029,18 @@ class HotWaterTank(object):
         if self.capacity == 0:
             return nodes_temp
 
-        check = 0.0
-        for node in range(len(nodes_temp)):
-            check += nodes_temp[node]
+        check = sum(nodes_temp)
         if check == source_temp * len(nodes_temp) and state == 'charging':
             return nodes_temp * len(nodes_temp)
 
-        def model_temp(z, t, c):
-            dzdt = []
-            for node in range(self.number_nodes):
-
-                if node == 0:
-                    Ti = nodes_temp[node]
-                    Ti_b = nodes_temp[node + 1]
-
-                    dTdt = (c[node]['A'] * Ti +
-                            c[node]['C'] * Ti_b +
-                            c[node]['D'])
-
-                    dzdt.append(dTdt)
-
-                elif node == (self.number_nodes - 1):
-                    Ti = nodes_temp[node]
-                    Ti_a = nodes_temp[node - 1]
-
-                    dTdt = (c[node]['A'] * Ti +
-                            c[node]['B'] * Ti_a +
-                            c[node]['D'])
-
-                    dzdt.append(dTdt)
-
-                else:
-                    Ti = nodes_temp[node]
-                    Ti_b = nodes_temp[node + 1]
-                    Ti_a = nodes_temp[node - 1]
-
-                    dTdt = (c[node]['A'] * Ti +
-                            c[node]['B'] * Ti_a +
-                            c[node]['C'] * Ti_b +
-                            c[node]['D'])
-
-                    dzdt.append(dTdt)
-
-            return dzdt
+        if state == 'standby':
+            # a single step without flow
+            coefficients = self.coefficient_arrays(
+                state, nodes_temp, 0., source_temp, flow_temp, return_temp,
+                timestep)
+            nodes_temp = self.standby_step(
+                np.asarray(nodes_temp, dtype=float), coefficients)
+            return [list(np.sort(nodes_temp)[::-1])]
 
         # node indexes
         top = 0
@@ -667,39 +1060,37 @@ class HotWaterTank(object):
         # minimum internal timesteps is 1
         t = max(t, 1)
 
-        # initial condition of coefficients
-        coefficients = []
         # divide thermal output and demand accross timesteps
         # convert from kWh to kJ
         thermal_output = thermal_output * 3600 / float(t)
         demand = demand * 3600 / float(t)
 
-        coefficients.append((self.set_of_coefficients(
-            state, nodes_temp, source_temp, source_delta_t, flow_temp,
-            return_temp, thermal_output, demand,
-            nodes_temp[bottom], nodes_temp[top], timestep)))
+        def step_coefficients(nodes_temp):
+            # errors may lead to slight overestimation of maximum
+            # mass flow so limit to node mass
+            mass_flow = min(self.mass_flow_calc(
+                state, flow_temp, return_temp, source_temp, source_delta_t,
+                thermal_output, demand, nodes_temp[bottom], nodes_temp[top]),
+                self.calc_node_mass())
+            return self.coefficient_arrays(
+                state, nodes_temp, mass_flow, source_temp,
+                flow_temp, return_temp, timestep)
+
+        nodes_temp = np.asarray(nodes_temp, dtype=float)
+        if self.step_tolerance is not None:
+            return self.adaptive_steps(nodes_temp, step_coefficients, t)
 
         node_temp_list = []
-        # node_temp_list.append(nodes_temp)
 
         # solve ODE
         for i in range(1, t + 1):
             # span for next time step
             tspan = [i - 1, i]
-            # solve for next step
-            # new coefficients
-            coefficients.append((self.set_of_coefficients(
-                state, nodes_temp, source_temp, source_delta_t,
-                flow_temp, return_temp, thermal_output, demand,
-                nodes_temp[bottom], nodes_temp[top], timestep)))
-
-            z = odeint(
-                model_temp, nodes_temp, tspan,
-                args=(coefficients[i],))
-
-            nodes_temp = z[1]
-            nodes_temp = sorted(nodes_temp, reverse=True)
-            node_temp_list.append(nodes_temp)
+            coefficients = step_coefficients(nodes_temp)
+
+            nodes_temp = self.integrate_step(nodes_temp, coefficients, tspan)
+            nodes_temp = np.sort(nodes_temp)[::-1]
+            node_temp_list.append(list(nodes_temp))
         return node_temp_list
 
     def coefficient_A_max(self, state, node, nodes_temp, source_temp,
@@ -710,17 +1101,8 @@ class HotWaterTank(object):
         # specific heat at temperature of node i
         cp = self.specific_heat_water(nodes_temp[node])
 
-        # thermal conductivity of insulation material
-        k = self.insulation_k_value()
-
-        # dimensions
-        r1 = self.internal_radius()
-        r2 = self.dimensions['width']
-        h = self.dimensions['height']
-
-        # correction factors
-        Fi = self.correction_factors['insulation_factor']
-        Fe = self.correction_factors['overall_factor']
+        # insulation, dimensions and correction factors
+        c = self.constants
 
         Fd = self.discharging_function(state, nodes_temp, flow_temp, node)[node]
         mf = self.mixing_function(state, node, nodes_temp,
@@ -734,8 +1116,8 @@ class HotWaterTank(object):
              mf['Fdnt'] * mass_flow * cp -
              mf['Fcnb'] * mass_flow * cp -
              Fco * mass_flow * cp -
-             Fe * Fi * k * ((1) / (r2 - r1)) *
-             math.pi * ((r1 ** 2) + h * (r2 + r1))
+             c.insulation * ((1) / c.thickness) *
+             math.pi * c.surface
              ) / (node_mass * cp)
 
         return A
@@ -772,31 +1154,20 @@ class HotWaterTank(object):
         # specific heat at temperature of node i
         cp = self.specific_heat_water(nodes_temp[node])
 
-        # thermal conductivity of insulation material
-        k = self.insulation_k_value()
-
-        # dimensions
-        r1 = self.internal_radius()
-        r2 = self.dimensions['width']
-        h = self.dimensions['height']
-
-        # correction factors
-        Fi = self.correction_factors['insulation_factor']
-        Fe = self.correction_factors['overall_factor']
+        # insulation, dimensions and correction factors
+        c = self.constants
 
         Fc = self.charging_function(state, nodes_temp, source_temp)[node]
         Fdi = self.discharging_bottom_node(
             state, nodes_temp, return_temp, flow_temp)[node]
         Ta = self.amb_temp(timestep)
 
-        cl = self.connection_losses()
-
         mass_flow = node_mass
 
         D = (Fc * mass_flow * cp * source_temp +
              Fdi * mass_flow * cp * return_temp +
-             Fe * Fi * k * ((Ta) / (r2 - r1)) * math.pi *
-             ((r1 ** 2) + h * (r2 + r1)) + Fe * cl
+             c.insulation * ((Ta) / c.thickness) * math.pi *
+             c.surface + c.connection_loss
              ) / (node_mass * cp)
 
         return D
@@ -821,73 +1192,127 @@ class HotWaterTank(object):
 
     def max_energy_in_out(self, state, nodes_temp, source_temp,
                           flow_temp, return_temp, timestep):
+        """maximum energy which can be charged to or discharged from tank
 
-        # for node in range(len(nodes_temp)):
-        #     if nodes_temp[node] > source_temp:
-        #         nodes_temp[node] = source_temp
-
-        nodes_temp_sum = 0.0
-        for node in range(len(nodes_temp)):
-            nodes_temp_sum += nodes_temp[node]
-        if nodes_temp_sum >= source_temp * len(nodes_temp) and state == 'charging':
-            return 0.0
-
-        if nodes_temp_sum <= return_temp * len(nodes_temp) and state == 'discharging':
-            return 0.0
+        Results are held in a least recently used cache keyed on the
+        state, the node temperatures rounded to
+        MAX_ENERGY_CACHE_DECIMALS and the source, flow, return and
+        ambient temperatures, so node temperatures which only differ
+        beyond that precision share a result.
 
-        if self.capacity == 0:
-            return 0.0
+        Arguments:
+            state {str} -- charging or discharging
+            nodes_temp {list} -- node temperatures
+            source_temp {float} -- temperature of heat source
+            flow_temp {float} -- flow temperature to demand
+            return_temp {float} -- return temperature from demand
+            timestep {int} --
 
-        def model_temp(z, t, c):
-            dzdt = []
-            for node in range(self.number_nodes):
+        Returns:
+            float -- energy in kWh
+        """
+        if self.cache_size == 0:
+            return self._max_energy(
+                state, nodes_temp, source_temp, flow_temp, return_temp,
+                timestep)
+
+        quantised = np.round(
+            np.asarray(nodes_temp, dtype=float), MAX_ENERGY_CACHE_DECIMALS)
+        key = (state, quantised.tobytes(), float(source_temp),
+               float(flow_temp), float(return_temp),
+               float(self.amb_temp(timestep)))
+        cache = self._max_energy_cache
+        if key in cache:
+            self._cache_hits += 1
+            cache.move_to_end(key)
+            return cache[key]
+
+        self._cache_misses += 1
+        energy = self._max_energy(
+            state, nodes_temp, source_temp, flow_temp, return_temp, timestep)
+        cache[key] = energy
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return energy
+
+    def clear_cache(self):
+        """empty the max_energy_in_out cache and seeds, reset its counts"""
+        self._max_energy_cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # max_energy_in_out results of the hour computed for many tanks
+        self._max_energy_seeds = {}
+
+    def cache_info(self):
+        """hits, misses and size of the max_energy_in_out cache
 
-                if node == 0:
-                    Ti = nodes_temp[node]
-                    Ti_b = nodes_temp[node + 1]
+        Returns:
+            CacheInfo -- hits, misses, maxsize and currsize
+        """
+        return CacheInfo(self._cache_hits, self._cache_misses,
+                         self.cache_size, len(self._max_energy_cache))
 
-                    dTdt = (c[node]['A'] * Ti +
-                            c[node]['C'] * Ti_b +
-                            c[node]['D'])
+    def log_cache_info(self, name):
+        """write max_energy_in_out cache hits and misses to the log
 
-                    dzdt.append(dTdt)
+        Arguments:
+            name {str} -- name of the run the cache was used for
+        """
+        info = self.cache_info()
+        calls = info.hits + info.misses
+        rate = 100. * info.hits / calls if calls else 0.
+        LOG.info(f'Tank max energy cache for {name}: {info.hits} hits, '
+                 f'{info.misses} misses ({rate:.1f}% hit rate), '
+                 f'{info.currsize}/{info.maxsize} entries')
 
-                elif node == (self.number_nodes - 1):
-                    Ti = nodes_temp[node]
-                    Ti_a = nodes_temp[node - 1]
+    def seed_max_energy(self, seeds):
+        """max_energy_in_out results computed outside of the tank
 
-                    dTdt = (c[node]['A'] * Ti +
-                            c[node]['B'] * Ti_a +
-                            c[node]['D'])
+        The seeds replace any previous ones and are used instead of
+        solving the node equations when the arguments of a call match
+        exactly, see pylesa.storage.batch.
 
-                    dzdt.append(dTdt)
+        Arguments:
+            seeds {dict} -- energy in kWh keyed by seed_key
+        """
+        self._max_energy_seeds = seeds
+
+    def _max_energy(self, state, nodes_temp, source_temp, flow_temp,
+                    return_temp, timestep):
+        seeds = self._max_energy_seeds
+        if seeds:
+            key = seed_key(state, nodes_temp, source_temp, flow_temp,
+                           return_temp, timestep)
+            if key in seeds:
+                return seeds[key]
+        return self._max_energy_in_out(
+            state, nodes_temp, source_temp, flow_temp, return_temp, timestep)
+
+    def _max_energy_in_out(self, state, nodes_temp, source_temp,
+                           flow_temp, return_temp, timestep):
 
-                else:
-                    Ti = nodes_temp[node]
-                    Ti_b = nodes_temp[node + 1]
-                    Ti_a = nodes_temp[node - 1]
+        # for node in range(len(nodes_temp)):
+        #     if nodes_temp[node] > source_temp:
+        #         nodes_temp[node] = source_temp
 
-                    dTdt = (c[node]['A'] * Ti +
-                            c[node]['B'] * Ti_a +
-                            c[node]['C'] * Ti_b +
-                            c[node]['D'])
+        nodes_temp_sum = sum(nodes_temp)
+        if nodes_temp_sum >= source_temp * len(nodes_temp) and state == 'charging':
+            return 0.0
 
-                    dzdt.append(dTdt)
+        if nodes_temp_sum <= return_temp * len(nodes_temp) and state == 'discharging':
+            return 0.0
 
-            return dzdt
+        if self.capacity == 0 or state == 'standby':
+            return 0.0
 
         # number of time points
         t = self.number_nodes - 1
 
-        # initial condition of coefficients
-        coefficients = []
-        coefficients.append((self.set_of_max_coefficients(
-            state, nodes_temp, source_temp,
-            flow_temp, return_temp, timestep)))
-
         energy_list = []
         mass_flow = self.calc_node_mass()
         cp = self.specific_heat_water(source_temp)
+        nodes_temp = np.asarray(nodes_temp, dtype=float)
+        rise = self.max_rise(timestep)
 
         # solve ODE
         for i in range(1, t + 1):
@@ -900,18 +1325,19 @@ class HotWaterTank(object):
             else:
                 energy = 0
             energy_list.append(energy)
+            # the temperatures after the last step are not used, and no
+            # more energy is discharged once the top node can not rise
+            # above the flow temperature in the remaining steps
+            if i == t or (state == 'discharging' and discharged(
+                    nodes_temp, flow_temp, return_temp, rise * (t - i))):
+                break
             # span for next time step
             tspan = [i - 1, i]
-            # solve for next step
-            # new coefficients
-            coefficients.append((self.set_of_max_coefficients(
-                state, nodes_temp, source_temp,
-                flow_temp, return_temp, timestep)))
-
-            z = odeint(
-                model_temp, nodes_temp, tspan,
-                args=(coefficients[i],))
-            nodes_temp = z[1]
+            # solve for next step with the maximum mass flow
+            coefficients = self.coefficient_arrays(
+                state, nodes_temp, mass_flow, source_temp,
+                flow_temp, return_temp, timestep)
+            nodes_temp = self.integrate_step(nodes_temp, coefficients, tspan)
 
         # convert J to kWh by divide by 3600000
         energy_total = sum(energy_list) / 3600000
@@ -0,0 +1,299 @@
+"""compiled kernels of the hot water tank node model
+
+The node coefficients and temperature derivatives are scalar
+arithmetic over the nodes of the tank, evaluated for every internal
+timestep of every hour of every combination. They are compiled with
+numba when it is installed and otherwise run as plain Python loops,
+which for the few nodes of a tank are faster than the equivalent
+NumPy array operations, except for the derivatives.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    JIT = True
+except ImportError:
+    JIT = False
+
+    def njit(*args, **kwargs):
+        """leave the function as plain Python when numba is missing"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+
+# tank states as integers for the kernels, in the order of STATES
+CHARGING = 0
+DISCHARGING = 1
+STANDBY = 2
+
+
+@njit(cache=True)
+def interpolate_cp(temp, cp_table):
+    """cp of water interpolated linearly from a table at every 10 degC
+
+    Arguments:
+        temp {float} -- temperature of water, 0 to 100 degC
+        cp_table {array} -- cp at 0, 10, ..., 100 degC
+
+    Returns:
+        float -- cp of water at temp
+    """
+    x = temp / 10.
+    i = min(int(x), len(cp_table) - 2)
+    return cp_table[i] + (x - i) * (cp_table[i + 1] - cp_table[i])
+
+
+@njit(cache=True)
+def specific_heat(nodes_temp, cp_table):
+    """cp of water of each node from a table at every 10 degC
+
+    Arguments:
+        nodes_temp {array} -- temperature of each node
+        cp_table {array} -- cp at 0, 10, ..., 100 degC
+
+    Returns:
+        array -- cp of each node, see interpolate_cp
+    """
+    n = len(nodes_temp)
+    cp = np.empty(n)
+    for i in range(n):
+        temp = nodes_temp[i]
+        if temp < 0. or temp > 100.:
+            raise ValueError(
+                'Water temperature is outside of allowable range of '
+                '0<=temp<=100')
+        cp[i] = interpolate_cp(temp, cp_table)
+    return cp
+
+
+def batch_specific_heat(nodes_temp, cp_tables):
+    """cp of water of tanks x nodes, each row as specific_heat
+
+    Arguments:
+        nodes_temp {array} -- temperature of each node, tanks x nodes
+        cp_tables {array} -- cp table of each tank, tanks x 11
+
+    Returns:
+        array -- cp of each node of each tank
+    """
+    if np.any((nodes_temp < 0.) | (nodes_temp > 100.)):
+        raise ValueError(
+            'Water temperature is outside of allowable range of '
+            '0<=temp<=100')
+    x = nodes_temp / 10.
+    i = np.minimum(x.astype(int), cp_tables.shape[1] - 2)
+    low = np.take_along_axis(cp_tables, i, axis=1)
+    high = np.take_along_axis(cp_tables, i + 1, axis=1)
+    return low + (x - i) * (high - low)
+
+
+@njit(cache=True)
+def coefficients(state, nodes_temp, cp, mass_flow, source_temp, flow_temp,
+                 return_temp, node_mass, UA, ambient_temp, connection_loss):
+    """coefficients A, B, C and D of the node equations
+
+    dT/dt of node i is A T[i] + B T[i - 1] + C T[i + 1] + D, see
+    HotWaterTank.coefficient_arrays for the node functions.
+
+    Arguments:
+        state {int} -- CHARGING, DISCHARGING or STANDBY
+        nodes_temp {array} -- temperature of each node, top first
+        cp {array} -- cp of water of each node
+        mass_flow {float} -- mass flow in internal timestep
+        source_temp {float} -- temperature of charging water
+        flow_temp {float} -- flow temperature of district heating
+        return_temp {float} -- return temperature of district heating
+        node_mass {float} -- mass of one node
+        UA {float} -- heat loss per degree through the insulation
+        ambient_temp {float} -- temperature surrounding the tank
+        connection_loss {float} -- corrected heat loss of connections
+
+    Returns:
+        tuple -- arrays of coefficients A, B, C and D
+    """
+    n = len(nodes_temp)
+    bottom = n - 1
+    A = np.empty(n)
+    B = np.empty(n)
+    C = np.empty(n)
+    D = np.empty(n)
+
+    # lowest node which is charged or discharged, bottom + 1 if none
+    node_charging = n
+    node_discharging = n
+    for i in range(n):
+        if state == CHARGING:
+            if source_temp >= nodes_temp[i] and (
+                    i == 0 or source_temp <= nodes_temp[i - 1]):
+                node_charging = i
+        elif state == DISCHARGING:
+            if i == 0:
+                if flow_temp <= nodes_temp[0]:
+                    node_discharging = 0
+            elif flow_temp < nodes_temp[i] and flow_temp >= nodes_temp[i - 1]:
+                node_discharging = i
+
+    losses = UA * ambient_temp
+    for i in range(n):
+        Fc = 0.
+        Fd = 0.
+        Fco = 0.
+        Fdi = 0.
+        Fcnt = 0.
+        Fdnt = 0.
+        Fcnb = 0.
+        Fdnb = 0.
+        if state == CHARGING:
+            if source_temp >= nodes_temp[i] and (
+                    i == 0 or source_temp <= nodes_temp[i - 1]):
+                Fc = 1.
+            if i == bottom:
+                Fco = 1.
+            if i > node_charging:
+                Fcnt = 1.
+            if not (i == bottom or i < node_charging):
+                Fcnb = 1.
+        elif state == DISCHARGING:
+            if i == 0:
+                if flow_temp <= nodes_temp[0]:
+                    Fd = 1.
+            elif flow_temp < nodes_temp[i] and flow_temp >= nodes_temp[i - 1]:
+                Fd = 1.
+            if (node_discharging < n and i == bottom and
+                    nodes_temp[0] >= flow_temp):
+                Fdi = 1.
+            if not (i == 0 or i <= node_discharging):
+                Fdnt = 1.
+            if not (i == bottom or i < node_discharging):
+                Fdnb = 1.
+
+        A[i] = (- (Fd + Fdnt + Fcnb + Fco) * mass_flow * cp[i] - UA
+                ) / (node_mass * cp[i])
+        B[i] = Fcnt * mass_flow / node_mass
+        C[i] = Fdnb * mass_flow / node_mass
+        D[i] = (Fc * mass_flow * cp[i] * source_temp +
+                Fdi * mass_flow * cp[i] * return_temp +
+                losses + connection_loss
+                ) / (node_mass * cp[i])
+
+    return A, B, C, D
+
+
+if JIT:
+    @njit(cache=True)
+    def node_derivatives(nodes_temp, A, B, C, D):
+        """rate of change of temperature of each node
+
+        Arguments:
+            nodes_temp {array} -- temperature of each node, top first
+            A, B, C, D {array} -- coefficients of the node equations
+
+        Returns:
+            array -- dT/dt of each node
+        """
+        n = len(nodes_temp)
+        dTdt = np.empty(n)
+        for i in range(n):
+            dTdt[i] = A[i] * nodes_temp[i] + D[i]
+            if i > 0:
+                dTdt[i] += B[i] * nodes_temp[i - 1]
+            if i < n - 1:
+                dTdt[i] += C[i] * nodes_temp[i + 1]
+        return dTdt
+
+else:
+    # array operations are faster than a Python loop here
+    def node_derivatives(nodes_temp, A, B, C, D):
+        """rate of change of temperature of each node
+
+        Arguments:
+            nodes_temp {array} -- temperature of each node, top first
+            A, B, C, D {array} -- coefficients of the node equations
+
+        Returns:
+            array -- dT/dt of each node
+        """
+        dTdt = A * nodes_temp + D
+        dTdt[1:] += B[1:] * nodes_temp[:-1]
+        dTdt[:-1] += C[:-1] * nodes_temp[1:]
+        return dTdt
+
+
+def _last(flags):
+    """index of the last set flag of each row, the row length if none"""
+    n = flags.shape[1]
+    last = n - 1 - np.argmax(flags[:, ::-1], axis=1)
+    return np.where(flags.any(axis=1), last, n)
+
+
+def batch_coefficients(state, nodes_temp, cp, mass_flow, source_temp,
+                       flow_temp, return_temp, node_mass, UA, ambient_temp,
+                       connection_loss):
+    """coefficients of the node equations of many tanks at once
+
+    Array version of coefficients with one row per tank, the element
+    by element arithmetic is the same so each row matches coefficients.
+
+    Arguments:
+        state {int} -- CHARGING, DISCHARGING or STANDBY
+        nodes_temp {array} -- temperature of each node, tanks x nodes
+        cp {array} -- cp of water of each node, tanks x nodes
+        mass_flow, source_temp, flow_temp, return_temp, node_mass, UA,
+        ambient_temp, connection_loss -- as coefficients, a float or
+            an array of one value per tank
+
+    Returns:
+        tuple -- arrays of coefficients A, B, C and D, tanks x nodes
+    """
+    count, n = nodes_temp.shape
+
+    def column(value):
+        # one value per tank as a column, a float broadcasts as it is
+        value = np.asarray(value, dtype=float)
+        return value[:, None] if value.ndim else value
+
+    source_temp = column(source_temp)
+    flow_temp = column(flow_temp)
+    mass_flow = column(mass_flow)
+    node_mass = column(node_mass)
+    UA = column(UA)
+
+    nodes = np.arange(n)
+    bottom = n - 1
+    Fc = Fd = Fco = Fdi = Fcnt = Fdnt = Fcnb = Fdnb = np.zeros((count, n))
+
+    if state == CHARGING:
+        charged = np.empty((count, n), dtype=bool)
+        charged[:, :1] = source_temp >= nodes_temp[:, :1]
+        charged[:, 1:] = ((source_temp >= nodes_temp[:, 1:]) &
+                          (source_temp <= nodes_temp[:, :-1]))
+        node_charging = _last(charged)[:, None]
+        Fc = charged.astype(float)
+        Fco = np.broadcast_to(nodes == bottom, (count, n)).astype(float)
+        Fcnt = (nodes > node_charging).astype(float)
+        Fcnb = (~((nodes == bottom) | (nodes < node_charging))).astype(float)
+
+    elif state == DISCHARGING:
+        discharged = np.empty((count, n), dtype=bool)
+        discharged[:, :1] = flow_temp <= nodes_temp[:, :1]
+        discharged[:, 1:] = ((flow_temp < nodes_temp[:, 1:]) &
+                             (flow_temp >= nodes_temp[:, :-1]))
+        node_discharging = _last(discharged)[:, None]
+        Fd = discharged.astype(float)
+        Fdi = ((nodes == bottom) & (node_discharging < n) &
+               (nodes_temp[:, :1] >= flow_temp)).astype(float)
+        Fdnt = (~((nodes == 0) | (nodes <= node_discharging))).astype(float)
+        Fdnb = (~((nodes == bottom) |
+                  (nodes < node_discharging))).astype(float)
+
+    losses = UA * column(ambient_temp)
+    A = (- (Fd + Fdnt + Fcnb + Fco) * mass_flow * cp - UA
+         ) / (node_mass * cp)
+    B = Fcnt * mass_flow / node_mass
+    C = Fdnb * mass_flow / node_mass
+    D = (Fc * mass_flow * cp * source_temp +
+         Fdi * mass_flow * cp * column(return_temp) +
+         losses + column(connection_loss)
+         ) / (node_mass * cp)
+
+    return A, B, C, D
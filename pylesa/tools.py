@@ -3,7 +3,10 @@
 useful functions which are used throughout
 """
 import logging
+import os
+import numpy as np
 import pandas as pd
+from pathlib import Path
 
 import pickle
 from collections import OrderedDict
@@ -17,6 +20,19 @@ def inputs_path():
     return dic
 
 
+def write_pickle(obj, file: Path):
+    """pickle obj to file
+
+    The pickle is written to a temporary file which is then renamed,
+    so that parallel processes never read a partial file.
+    """
+    file = Path(file)
+    tmp = file.with_name(f'{file.stem}_{os.getpid()}.tmp')
+    with open(tmp, 'wb') as handle:
+        pickle.dump(obj, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, file)
+
+
 def month_split(year):
 
     month_list = OrderedDict(
@@ -82,8 +98,22 @@ def mean_year(year):
     return year.values.mean()
 
 
-def timeindex():
-    time = pd.date_range(start='2017-01-01', periods=8760, freq='h')
+def timeindex(data=None):
+    """
+    timestamps of a series
+
+    PARAMETERS
+    data: dataframe or series, the timestamps of its index are used
+    if it has them, otherwise hourly timestamps from the start of 2017
+    are made for each of its rows, 8760 if no data is given
+
+    RETURNS
+    DatetimeIndex
+    """
+    if data is not None and isinstance(data.index, pd.DatetimeIndex):
+        return data.index
+    periods = 8760 if data is None else len(data)
+    time = pd.date_range(start='2017-01-01', periods=periods, freq='h')
     return time
 
 
@@ -108,47 +138,29 @@ class CheckFunctions(object):
         """
         this looks at total renewable generation and total electrical demand
         works out the surplus and deficit
-        looks every timestep for whole year
+        looks every timestep of the series, of any length or resolution
 
         RETURNS
-        pdf: a dataframe containing the following
+        dic: a dictionary of arrays containing the following
             match: RES - elec_demand
             deficit: where demand exceeds RES
             surplus: where RES exceeds demand
+            RES_used: RES used by the electrical demand
         """
 
         # sum of the wind turbines and PV
-        total_renewables = self.renewable_generation
-        electrical_demand = self.elec_demand
+        total_renewables = np.asarray(self.renewable_generation, dtype=float)
+        electrical_demand = np.asarray(self.elec_demand, dtype=float)
 
         # match by subtracting between the total renewables and elec_demand
         match = total_renewables - electrical_demand
+        shortfall = match <= 0.
+        deficit = np.where(shortfall, -match, 0.)
+        surplus = np.where(shortfall, 0., match)
+        RES_used = np.minimum(total_renewables, electrical_demand)
 
-        # create empty lists for the deficit and surplus
-        deficit = []
-        surplus = []
-        RES_used = []
-
-        # search for the whole year, h=8760
-        # calculates the deficit or surplus at each timestep,
-        # and produces two separate dataframes
-        for x in range(0, 8760):
-
-            RES_used.append(min(total_renewables[x], electrical_demand[x]))
-
-            if match[x] <= 0.0:
-                deficit.append(-1 * match[x])
-                surplus.append(0.0)
-
-            else:
-                deficit.append(0.0)
-                surplus.append(match[x])
-
-        d = {'match': match, 'deficit': deficit,
-             'surplus': surplus, 'RES_used': RES_used}
-        pdf = pd.DataFrame(data=d)
-
-        return pdf
+        return {'match': match, 'deficit': deficit,
+                'surplus': surplus, 'RES_used': RES_used}
 
     def heat_demand_check(self, timestep, heat_generated):
 
@@ -178,25 +190,21 @@ class CheckFunctions(object):
         # if > 0 then heat demand not met
         elif heat_met > 0:
             return False
-        # if < 0 then too much heat generated for some reason, throw error
-        # else:
-            # msg = 'Error in heat generation: Too much heat generated'
-            # LOG.error(msg)
-            # raise SystemExit(msg)
+        # if < 0 then too much heat generated for some reason, log error
+        else:
+            msg = f'Error in heat generation: too much heat generated ({heat_met})'
+            LOG.error(msg)
 
     def surplus_check(self, surplus, RES_used):
 
         """
         this is used to check if surplus exists at point in flow diagram
 
-        PARAMATERS
-
-        timestep: a float/int of the timestep to be modelled
+        PARAMETERS
         surplus: total surplus in the timestep
         RES_used: surplus used up to point in the flow diagram
 
         RETURNS
-
         boolean statement:
             TRUE if surplus exists
             FALSE if surplus doesnt exist
@@ -213,13 +221,25 @@ class CheckFunctions(object):
         elif RES_leftover == 0.0:
             return False
         # if something else then error
-        # else:
-        #     msg = 'Error in RES usage: Too much RES used'
-        #     LOG.error(msg)
-        #     raise SystemExit(msg)
+        else:
+            msg = f'Error in RES usage: too much RES used ({RES_leftover})'
+            LOG.error(msg)
 
     def deficit_check(self, deficit, elec_supplied):
 
+        """
+        this is used to check if deficit remains at point in flow diagram
+
+        PARAMETERS
+        deficit: total deficit in the timestep
+        elec_supplied: electricity supplied up to point in the flow diagram
+
+        RETURNS
+        boolean statement:
+            TRUE if deficit remains
+            FALSE if deficit has been met
+        """
+
         deficit_leftover = round(deficit, 2) - round(elec_supplied, 2)
         deficit_leftover = round(deficit_leftover, 2)
 
@@ -230,7 +250,6 @@ class CheckFunctions(object):
         elif deficit_leftover == 0:
             return False
         # if something else then error
-        # else:
-        #     msg = 'Error in program: Deficit turned into surplus'
-        #     LOG.error(msg)
-        #     raise SystemExit(msg)
\ No newline at end of file
+        else:
+            msg = f'Error in program: deficit turned into surplus ({deficit_leftover})'
+            LOG.error(msg)
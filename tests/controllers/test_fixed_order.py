@@ -0,0 +1,46 @@
+import inspect
+
+import pytest
+
+from pylesa.controllers.fixed_order import (
+    PROCESS_KEY, PROCESSES, FixedOrder)
+
+
+class TestProcesses:
+    @pytest.mark.parametrize("setpoint", ["above", "below"])
+    def test_key(self, setpoint):
+        assert set(PROCESS_KEY[setpoint].values()) <= set(PROCESSES)
+
+    @pytest.mark.parametrize("name", sorted(PROCESSES))
+    def test_handler_arguments(self, name):
+        process = PROCESSES[name]
+        if process.handler is None:
+            pytest.skip("process does nothing")
+        params = inspect.signature(getattr(FixedOrder, process.handler))
+        assert tuple(params.parameters)[1:] == process.args
+
+
+class TestOrder:
+    @pytest.fixture
+    def controller(self):
+        # the dispatch only needs the handlers of the class
+        return FixedOrder.__new__(FixedOrder)
+
+    def test_compile(self, controller):
+        steps = controller.compile_order([1, 3, 2], "above")
+        # RES to demand has no handler
+        assert [step[0].__name__ for step in steps] == [
+            "import_to_demand", "ES_to_demand"]
+
+    def test_unknown_process(self, controller):
+        with pytest.raises(ValueError):
+            controller.compile_order([14], "above")
+
+    def test_run_order(self, controller):
+        results = controller.set_of_results()
+        checks = {"elec_unmet": 5., "soc": 3.}
+        steps = controller.compile_order([2, 3], "above")
+        controller.run_order(steps, results, checks)
+        assert results["ES"]["discharging_to_demand"] == 3.
+        assert results["grid"]["import_for_elec_demand"] == 2.
+        assert checks == {"elec_unmet": 0., "soc": 0.}
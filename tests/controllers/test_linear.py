@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pylesa.controllers.linear import LinearHorizon
+
+
+@pytest.fixture
+def electrical_storage():
+    return SimpleNamespace(
+        capacity=0., charge_max=0., discharge_max=0., charge_eff=0.9,
+        discharge_eff=0.9, self_discharge=0.)
+
+
+def horizon_inputs(steps=4, **kwargs):
+    inputs = {
+        "IC": np.full(steps, 100.),
+        "RES": np.zeros(steps),
+        "ed": np.full(steps, 10.),
+        "hd": np.full(steps, 20.),
+        "cop": np.full(steps, 2.5),
+        "duty": np.full(steps, 50.),
+        "HP_min": np.zeros(steps),
+        "max_cap": np.full(steps, 100.),
+        "aux_cost": np.full(steps, 100.),
+        "init_soc": 0.,
+        "init_soc_ES": 0.,
+        "initial": {},
+    }
+    inputs.update(kwargs)
+    return inputs
+
+
+class TestLinearHorizon:
+    @pytest.fixture
+    def horizon(self, electrical_storage):
+        return LinearHorizon(electrical_storage, 100., 50., True)
+
+    def test_demands_met(self, horizon):
+        inputs = horizon_inputs()
+        v = horizon.solve(**inputs)
+        # heat pump is cheaper than the auxiliary heater
+        assert np.allclose(v["HPt"][1:], inputs["hd"][1:])
+        assert np.allclose(v["aux"][1:], 0.)
+        assert np.allclose(v["imp_ed"][1:], inputs["ed"][1:])
+        assert horizon.iterations > 0
+
+    def test_renewables_used_first(self, horizon):
+        v = horizon.solve(**horizon_inputs(RES=np.full(4, 100.)))
+        assert np.allclose(v["imp_ed"][1:], 0.)
+        assert np.allclose(v["HPtrd"][1:], 20.)
+        assert np.all(v["export"][1:] > 0.)
+
+    def test_storage_shifts_demand(self, horizon):
+        IC = np.array([100., 10., 100., 100.])
+        v = horizon.solve(**horizon_inputs(IC=IC))
+        # charge when imports are cheap and discharge when expensive
+        assert v["TSc"][1] > 0.
+        assert v["TSd"][2:].sum() > 0.
+        loss = 0.01 * v["soc"][1:]
+        assert np.allclose(
+            np.diff(v["soc"]), v["TSc"][1:] - v["TSd"][1:] - loss)
+
+    def test_initial_values(self, horizon):
+        v = horizon.solve(**horizon_inputs(
+            init_soc=30., initial={"HPt": 12.}))
+        assert v["soc"][0] == 30.
+        assert v["HPt"][0] == 12.
+        assert len(v["HPt"]) == 4
+
+    def test_minimum_output(self, horizon):
+        # demand below minimum output, so run the heat pump in some hours
+        # and store the surplus rather than run at part load
+        v = horizon.solve(**horizon_inputs(
+            hd=np.full(4, 10.), HP_min=np.full(4, 25.)))
+        HPt = v["HPt"][1:]
+        assert np.all((HPt < 1e-6) | (HPt >= 25. - 1e-6))
+        assert set(np.round(v["HP_status"][1:])) <= {0., 1.}
+
+    def test_non_electric_aux(self, electrical_storage):
+        horizon = LinearHorizon(electrical_storage, 100., 50., False)
+        v = horizon.solve(**horizon_inputs(aux_cost=1.))
+        # cheap auxiliary heater meets the heat demand
+        assert np.allclose(v["aux_d"][1:], 20.)
+        for name in ["HPtesd", "ESd_aux", "aux_rd", "aux_rs"]:
+            assert np.allclose(v[name], 0.)
+
+    def test_infeasible(self, horizon):
+        with pytest.raises(ValueError):
+            # demand exceeds heat pump duty and auxiliary capacity
+            horizon.solve(**horizon_inputs(hd=np.full(4, 1000.)))
@@ -0,0 +1,114 @@
+import logging
+
+import numpy as np
+import pytest
+
+from pylesa.controllers.enums import Backend
+from pylesa.controllers.mpc import Scheduler
+from pylesa.io.results import from_records
+
+
+def make_scheduler(persistent, warm_start=False):
+    # the model helpers do not need the inputs loaded by __init__
+    scheduler = Scheduler.__new__(Scheduler)
+    scheduler.persistent = persistent
+    scheduler.warm_start = warm_start
+    scheduler._gekko = None
+    scheduler._handles = {}
+    scheduler._previous_solution = None
+    return scheduler
+
+
+class TestGekkoModel:
+    @pytest.fixture
+    def persistent(self):
+        scheduler = make_scheduler(True)
+        yield scheduler
+        scheduler.discard_model()
+
+    def test_new_model_every_call(self):
+        scheduler = make_scheduler(False)
+        m1, new1 = scheduler.gekko_model(24)
+        m2, new2 = scheduler.gekko_model(24)
+        assert new1 and new2
+        assert m1 is not m2
+        scheduler.discard_model()
+
+    def test_reuse(self, persistent):
+        m1, new1 = persistent.gekko_model(24)
+        m2, new2 = persistent.gekko_model(24)
+        assert new1 and not new2
+        assert m1 is m2
+
+    def test_rebuild_on_horizon_change(self, persistent):
+        m1, _ = persistent.gekko_model(24)
+        m2, new = persistent.gekko_model(12)
+        assert new
+        assert m1 is not m2
+        assert len(m2.time) == 12
+
+    def test_update_values(self, persistent):
+        persistent.gekko_model(3)
+        p = persistent._param("p", [1., 2., 3.])
+        v = persistent._var("v", 0., lb=0)
+        c = persistent._const("c", 5.)
+        i = persistent._intermediate("i", 2 * v)
+        persistent.gekko_model(3)
+        assert persistent._param("p", [4., 5., 6.]) is p
+        assert list(p.value) == [4., 5., 6.]
+        assert persistent._var("v", 1.) is v
+        assert v.value == 1.
+        assert persistent._const("c", 5.) is c
+        assert persistent._intermediate("i", 2 * v) is i
+
+    def test_discard_model(self, persistent):
+        persistent.gekko_model(24)
+        persistent._param("p", [0.] * 24)
+        persistent.discard_model()
+        assert persistent._gekko is None
+        assert persistent._handles == {}
+
+
+class TestWarmStart:
+    @pytest.fixture
+    def scheduler(self):
+        scheduler = make_scheduler(False, warm_start=True)
+        scheduler.gekko_model(4)
+        yield scheduler
+        scheduler.discard_model()
+
+    def test_no_previous_solution(self, scheduler):
+        assert scheduler._initial_guess("v", 2.) == 2.
+
+    def test_disabled(self, scheduler):
+        scheduler.warm_start = False
+        scheduler._previous_solution = {"v": np.array([0., 1., 2., 3.])}
+        assert scheduler._initial_guess("v", 5.) == 5.
+
+    def test_shifted(self, scheduler):
+        scheduler._previous_solution = {"v": np.array([0., 1., 2., 3.])}
+        # first value is set, the rest is shifted and the last repeated
+        assert scheduler._initial_guess("v", 5.) == [5., 2., 3., 3.]
+        assert scheduler._initial_guess("w", 5.) == 5.
+
+    def test_var_value(self, scheduler):
+        scheduler._previous_solution = {"v": np.array([0., 1., 2., 3.])}
+        v = scheduler._var("v", 5., lb=0)
+        assert list(v.value) == [5., 2., 3., 3.]
+
+
+class TestSolverStats:
+    def test_log(self, caplog):
+        scheduler = make_scheduler(False)
+        scheduler.backend = Backend.GEKKO
+        scheduler.subname = "combo"
+        results = from_records([
+            {"TS": {"final_nodes_temp": [50.]},
+             "solver": {"iterations": i, "solve_time": t}}
+            for i, t in [(0, 0.), (4, 1.), (6, 2.)]])
+        with caplog.at_level(logging.INFO):
+            scheduler.log_solver_stats(results)
+        # the first hour is not solved so is not included
+        assert "mean 5.0 iterations" in caplog.text
+        assert "mean 1.500 s" in caplog.text
+        assert "total 3.0 s" in caplog.text
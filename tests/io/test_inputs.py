@@ -0,0 +1,98 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pylesa import parametric_analysis, tools
+from pylesa.constants import INDIR, OUTDIR
+from pylesa.io import inputs
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / INDIR).mkdir()
+    (tmp_path / OUTDIR).mkdir()
+    base = {
+        "parametric_analysis": {"hp_min": 100, "hp_max": 200, "hp_step": 100,
+                                "ts_min": 500, "ts_max": 500, "ts_step": 0},
+        "hp_basics": pd.DataFrame({"capacity": [100]}),
+        "thermal_storage": pd.DataFrame({"capacity": [1000]}),
+        "resources": pd.DataFrame({"GHI": [1., 2., 3.]}),
+    }
+    for i in range(1, 5):
+        base[f"regression{i}"] = pd.DataFrame({"duty": [10., 20.]})
+    tools.write_pickle(base, tmp_path / INDIR / inputs.BASE_FILE)
+    inputs.clear_cache()
+    yield tmp_path
+    inputs.clear_cache()
+
+
+class TestLoad:
+    def test_overlay(self, root):
+        tools.write_pickle(
+            {inputs.BASE_KEY: inputs.BASE_FILE,
+             "hp_basics": pd.DataFrame({"capacity": [200]})},
+            root / INDIR / "combo.pkl")
+        container = inputs.load(root, "combo")
+        assert inputs.BASE_KEY not in container
+        assert container["hp_basics"]["capacity"][0] == 200
+        assert container["thermal_storage"]["capacity"][0] == 1000
+
+    def test_complete_container(self, root):
+        tools.write_pickle({"hp_basics": pd.DataFrame({"capacity": [300]})},
+                           root / INDIR / "combo.pkl")
+        assert inputs.load(root, "combo")["hp_basics"]["capacity"][0] == 300
+
+    def test_base_read_once(self, root):
+        path = root / INDIR / inputs.BASE_FILE
+        assert inputs.load_base(path) is inputs.load_base(path)
+        inputs.clear_cache()
+        tools.write_pickle({"resources": None}, path)
+        assert inputs.load_base(path) == {"resources": None}
+
+
+class TestRead:
+    def test_read_only(self, root):
+        container = inputs.read(root / INDIR / inputs.BASE_FILE)
+        with pytest.raises(TypeError):
+            container["resources"] = None
+
+    def test_read_again_when_changed(self, root):
+        path = root / INDIR / "combo.pkl"
+        tools.write_pickle({"a": 1}, path)
+        first = inputs.read(path)
+        assert inputs.read(path) is first
+        tools.write_pickle({"a": 2}, path)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert inputs.read(path) == {"a": 2}
+
+    def test_clear_path(self, root):
+        path = root / INDIR / "combo.pkl"
+        tools.write_pickle({"a": 1}, path)
+        base = inputs.read(root / INDIR / inputs.BASE_FILE)
+        first = inputs.read(path)
+        inputs.clear_cache(path)
+        assert inputs.read(path) is not first
+        assert inputs.read(root / INDIR / inputs.BASE_FILE) is base
+
+
+class TestCreatePickles:
+    def test_overlays(self, root):
+        para = parametric_analysis.Para(root)
+        para.create_pickles()
+        assert para.folder_name == ["hp_100_ts_500", "hp_200_ts_500"]
+
+        overlay = pd.read_pickle(root / INDIR / "hp_200_ts_500.pkl")
+        assert "resources" not in overlay
+        container = inputs.Inputs(root, "hp_200_ts_500").container
+        assert container["hp_basics"]["capacity"][0] == 200
+        assert container["thermal_storage"]["capacity"][0] == 500
+        assert list(container["regression3"]["duty"]) == [20., 40.]
+
+        # the base inputs are not changed
+        base = inputs.load_base(root / INDIR / inputs.BASE_FILE)
+        assert base["hp_basics"]["capacity"][0] == 100
+        assert list(base["regression3"]["duty"]) == [10., 20.]
+        container = inputs.Inputs(root, "hp_100_ts_500").container
+        assert list(container["regression3"]["duty"]) == [10., 20.]
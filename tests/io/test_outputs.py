@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from pylesa.io.outputs import KPI_SERIES, Calcs
+
+
+def make_calcs(electric_aux=True, grid_RES_hours=None, **series):
+    # the KPIs only need the series and inputs set by __init__
+    calcs = Calcs.__new__(Calcs)
+    calcs.timesteps = 3
+    calcs.series = {name: np.zeros(3) for name in KPI_SERIES}
+    calcs.series.update(
+        {name: np.asarray(value, dtype=float)
+         for name, value in series.items()})
+    calcs.electric_aux = electric_aux
+    calcs.grid_RES_hours = lambda: grid_RES_hours
+    return calcs
+
+
+class TestCalcs:
+    def test_sums(self):
+        calcs = make_calcs(HPt=[1., 2., 3.], HPe=[0.5, 1., 1.])
+        assert calcs.sum_hp_output() == 6.
+        assert calcs.max_heat_pump_output() == 3.
+        assert calcs.calc_scop() == 2.4
+
+    def test_heat_cost(self):
+        series = {"import": [10., 20., 0.], "ed_import": [5., 0., 0.],
+                  "import_price": [100., 200., 300.],
+                  "aux_cost": [1000., 0., 2000.]}
+        electric = make_calcs(**series)
+        assert np.allclose(electric.heat_cost(), [0.5, 4., 0.])
+        fuel = make_calcs(electric_aux=False, **series)
+        assert np.allclose(fuel.heat_cost(), [1.5, 4., 2.])
+
+    def test_energy_cost(self):
+        series = {"cashflow": [-1000., 500., 0.], "aux_cost": [1000., 0., 0.]}
+        assert np.allclose(make_calcs(**series).energy_cost(), [1., -0.5, 0.])
+        fuel = make_calcs(electric_aux=False, **series)
+        assert np.allclose(fuel.energy_cost(), [2., -0.5, 0.])
+
+    @pytest.mark.parametrize("hours, expected", [
+        (None, 0.),
+        (np.array([True, False, True]), 4.),
+    ])
+    def test_grid_RES_used(self, hours, expected):
+        calcs = make_calcs(grid_RES_hours=hours, **{"import": [1., 2., 3.]})
+        assert calcs.grid_RES_used() == expected
+
+    def test_HP_from_grid_RES(self):
+        calcs = make_calcs(
+            grid_RES_hours=np.array([False, True, True]),
+            HPe_import=[1., 2., 3.], cop=[3., 3., 2.])
+        assert calcs.HP_from_grid_RES() == 12.
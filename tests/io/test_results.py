@@ -0,0 +1,79 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from pylesa.io.results import (
+    FILENAME, LEGACY_FILENAME, ResultsStore, from_records, load_results)
+
+
+def make_record(hour, number_nodes=3):
+    return {
+        "HP": {"heat_total_output": 10. * hour, "cop": 3.},
+        "TS": {"charging_total": float(hour),
+               "final_nodes_temp": [50. + hour] * number_nodes},
+    }
+
+
+class TestResultsStore:
+    @pytest.fixture
+    def store(self):
+        return ResultsStore(make_record(0), 4, 3)
+
+    def test_append(self, store):
+        for hour in range(3):
+            store.append(make_record(hour))
+        results = store.results()
+        assert len(store) == len(results) == 3
+        assert np.array_equal(
+            results["HP"]["heat_total_output"], [0., 10., 20.])
+        assert results["TS"]["final_nodes_temp"].shape == (3, 3)
+        # rows are indexed in the same way as the list of dicts
+        assert results[2]["TS"]["final_nodes_temp"][0] == 52.
+
+    def test_partial_record(self, store):
+        store.append({"HP": {"cop": 2.5}})
+        assert store.results()[0]["HP"]["cop"] == 2.5
+        assert store.results()[0]["HP"]["heat_total_output"] == 0.
+
+    def test_unknown_field(self, store):
+        with pytest.raises(KeyError):
+            store.append({"HP": {"unknown": 1.}})
+
+    def test_full(self, store):
+        for hour in range(4):
+            store.append(make_record(hour))
+        with pytest.raises(ValueError):
+            store.append(make_record(4))
+
+    def test_save_load(self, store, tmp_path):
+        store.append(make_record(1))
+        store.save(tmp_path)
+        assert (tmp_path / FILENAME).exists()
+        results = load_results(tmp_path)
+        assert np.array_equal(results, store.results())
+
+
+class TestLegacy:
+    def test_from_records(self):
+        records = [make_record(hour) for hour in range(2)]
+        records[1]["HP"]["extra"] = 5.
+        results = from_records(records)
+        assert np.array_equal(results["HP"]["extra"], [0., 5.])
+        assert np.array_equal(results["TS"]["charging_total"], [0., 1.])
+
+    def test_empty(self):
+        with pytest.raises(ValueError):
+            from_records([])
+
+    def test_load_pickle(self, tmp_path):
+        records = [make_record(hour) for hour in range(2)]
+        with open(tmp_path / LEGACY_FILENAME, "wb") as handle:
+            pickle.dump(records, handle)
+        results = load_results(tmp_path)
+        assert np.array_equal(
+            results["HP"]["heat_total_output"], [0., 10.])
+
+    def test_missing(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_results(tmp_path)
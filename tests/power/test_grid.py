@@ -0,0 +1,98 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pylesa.constants import INDIR
+from pylesa.power import grid
+
+
+@pytest.fixture
+def power():
+    return pd.Series(np.linspace(1000., 0., 8760))
+
+
+def write_cache(root, power, lower_percent, higher_percent):
+    (root / INDIR).mkdir()
+    lower_band, higher_band = grid.wind_farm_bands(
+        power, lower_percent, higher_percent)
+    cache = {"power": power,
+             "lower_percent": lower_percent, "higher_percent": higher_percent,
+             "lower_band": lower_band, "higher_band": higher_band}
+    with open(root / INDIR / grid.WIND_FARM_FILE, "wb") as handle:
+        pickle.dump(cache, handle)
+
+
+class TestWindFarm:
+    def test_bands(self, power):
+        lower_band, higher_band = grid.wind_farm_bands(power, 0.9, 0.1)
+        # power is exceeded 90 % of the time at the lower band
+        assert lower_band < higher_band
+        assert np.mean(power >= lower_band) == pytest.approx(0.9, abs=0.01)
+        assert np.mean(power >= higher_band) == pytest.approx(0.1, abs=0.01)
+
+    def test_cached(self, power, tmp_path):
+        write_cache(tmp_path, power, 0.9, 0.1)
+        # the combination inputs are not read when the cache exists
+        info = grid.wind_farm_info(tmp_path, "missing", 0.9, 0.1)
+        assert info["power"].equals(power)
+        assert (info["lower_band"], info["higher_band"]) == (
+            grid.wind_farm_bands(power, 0.9, 0.1))
+
+    def test_new_bands(self, power, tmp_path):
+        write_cache(tmp_path, power, 0.9, 0.1)
+        info = grid.wind_farm_info(tmp_path, "missing", 0.8, 0.2)
+        assert (info["lower_band"], info["higher_band"]) == (
+            grid.wind_farm_bands(power, 0.8, 0.2))
+        cache = pd.read_pickle(tmp_path / INDIR / grid.WIND_FARM_FILE)
+        assert cache["lower_percent"] == 0.8
+        assert list((tmp_path / INDIR).glob("*.tmp")) == []
+
+
+def make_grid(tmp_path, tariff_choice, timesteps=48, **kwargs):
+    return grid.Grid(tmp_path, "inputs", None, tariff_choice, None, None,
+                     timesteps=timesteps, **kwargs)
+
+
+class TestTariffs:
+    def test_day_of_week(self):
+        # 1st January 2017 was a Sunday
+        days = grid.day_of_week(2017, 48)
+        assert np.all(days[:24] == 6) and np.all(days[24:] == 0)
+        assert np.array_equal(grid.hour_of_day(26)[22:], [22, 23, 0, 1])
+
+    def test_flat_rates(self, tmp_path):
+        tariff = make_grid(tmp_path, "Flat rates", timesteps=10,
+                           flat_rate={"import": 150})
+        assert np.array_equal(tariff.import_cost_series(), np.full(10, 150.))
+
+    def test_variable_periods(self, tmp_path):
+        periods = pd.DataFrame(
+            {day: np.arange(24) + 100. * number
+             for number, day in enumerate(grid.DAYS)})
+        tariff = make_grid(tmp_path, "Variable periods",
+                           variable_periods=periods, variable_periods_year=2017)
+        cost = tariff.import_cost_series()
+        assert cost[5] == 605. and cost[24 + 5] == 5.
+
+    def test_wholesale_market(self, tmp_path):
+        wm = pd.DataFrame({"wholesale_market": np.full(48, 50.)})
+        tariff = make_grid(tmp_path, "Time of use - WM", wholesale_market=wm,
+                           premium=10., maximum=115.)
+        cost = tariff.import_cost_series()
+        assert cost[15] == pytest.approx(110.)
+        assert cost[16] == cost[40] == 115.
+
+    def test_short_series(self, tmp_path):
+        wm = pd.DataFrame({"wholesale_market": np.full(24, 50.)})
+        tariff = make_grid(tmp_path, "Time of use - WM", wholesale_market=wm,
+                           premium=10., maximum=115.)
+        with pytest.raises(ValueError):
+            tariff.import_cost_series()
+
+    def test_ppa_tariff(self):
+        cost = grid.ppa_tariff(np.full(3, 100.), [0., 50., 100.],
+                               lower_band=10., higher_band=90.,
+                               lower_penalty=20., higher_discount=30.)
+        assert np.array_equal(cost, [120., 100., 70.])
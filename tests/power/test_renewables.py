@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from pvlib.location import Location
+import pytest
+
+from pylesa.power.renewables import PV, PV_MONTH_FACTORS, month_factors
+
+LATITUDE = 55.86
+LONGITUDE = -4.25
+
+
+def weather_input(index):
+    """PV weather inputs of clear sky at each timestamp, see Inputs.weather"""
+    sky = Location(LATITUDE, LONGITUDE).get_clearsky(index.tz_localize("UTC"))
+    data = pd.DataFrame({"DHI": sky["dhi"].to_numpy(),
+                         "GHI": sky["ghi"].to_numpy(),
+                         "DNI": sky["dni"].to_numpy(),
+                         "wind_speed_10": 3.,
+                         "air_temperature": 10.}, index=index)
+    return {name: data[[name]] for name in data.columns}
+
+
+def make_pv(weather, multiplier=10):
+    return PV(module_name="Canadian Solar CS5P-220M___2009_",
+              inverter_name="ABB: MICRO-0.25-I-OUTD-US-208 [208V]",
+              multiplier=multiplier, surface_tilt=35, surface_azimuth=180,
+              surface_type="grass", loc_name="Glasgow", latitude=LATITUDE,
+              longitude=LONGITUDE, altitude=10, weather_input=weather)
+
+
+class TestMonthFactors:
+    def test_calendar_months(self):
+        index = pd.date_range("01/01/2017", periods=8760, freq="1h",
+                              tz="Europe/London")
+        factors = month_factors(index)
+        # january has 744 hours rather than 730
+        assert np.all(factors[:744] == PV_MONTH_FACTORS[0])
+        assert factors[744] == PV_MONTH_FACTORS[1]
+        assert factors[-1] == PV_MONTH_FACTORS[11]
+
+    def test_multi_year_sub_hourly(self):
+        index = pd.date_range("12/31/2019 23:30", periods=4, freq="30min")
+        assert np.array_equal(
+            month_factors(index), PV_MONTH_FACTORS[[11, 0, 0, 0]])
+
+
+class TestPowerOutput:
+    def test_hourly_year(self):
+        index = pd.date_range("2017-01-01", periods=8760, freq="h")
+        weather = weather_input(index)
+        power = make_pv(weather).power_output()
+        # rows without timestamps are taken as hours from the start of 2017
+        unindexed = {name: data.reset_index(drop=True)
+                     for name, data in weather.items()}
+        np.testing.assert_array_equal(
+            make_pv(unindexed).power_output(), power)
+        assert power.max() > 0.
+
+    def test_sub_hourly(self):
+        index = pd.date_range("2017-06-20", "2017-06-22", freq="15min",
+                              inclusive="left")
+        power = make_pv(weather_input(index)).power_output()
+        assert len(power) == len(index)
+        assert power.max() > 0.
+        # the output at each hour matches that of an hourly series
+        hourly = make_pv(weather_input(index[::4])).power_output()
+        np.testing.assert_allclose(power[::4], hourly)
+
+    def test_multi_year(self):
+        index = pd.date_range("2019-07-01", "2021-07-01", freq="h",
+                              inclusive="left")
+        power = make_pv(weather_input(index)).power_output()
+        assert len(power) == len(index)
+        # each year is corrected by the months of its own timestamps
+        for start, end in [("2019-07-01", "2020-01-01"),
+                           ("2020-01-01", "2021-01-01"),
+                           ("2021-01-01", "2021-07-01")]:
+            part = (index >= start) & (index < end)
+            expected = make_pv(weather_input(index[part])).power_output()
+            np.testing.assert_allclose(power[part], expected)
+
+    @pytest.mark.parametrize("periods", [96, 17544])
+    def test_no_systems(self, periods):
+        index = pd.date_range("2017-01-01", periods=periods, freq="h")
+        power = make_pv(weather_input(index), multiplier=0).power_output()
+        assert len(power) == periods
+        assert not power.any()
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from pylesa.power import sam
+
+
+@pytest.fixture
+def libraries(tmp_path, monkeypatch):
+    tables = {
+        "CECMod": pd.DataFrame({"Module_A": [1., "Mono"]}, index=["A_c", "Technology"]),
+        "SandiaMod": pd.DataFrame({"Module_B": [2.]}, index=["Area"]),
+        "cecinverter": pd.DataFrame({"Inverter_C": [3.]}, index=["Paco"]),
+    }
+    calls = []
+
+    def retrieve_sam(name):
+        calls.append(name)
+        return tables[name]
+
+    monkeypatch.setattr(sam, "cache_dir", lambda: tmp_path)
+    monkeypatch.setattr(sam.pvlib.pvsystem, "retrieve_sam", retrieve_sam)
+    sam.index.cache_clear()
+    sam.table.cache_clear()
+    yield tables, calls
+    sam.index.cache_clear()
+    sam.table.cache_clear()
+
+
+def test_sanitise():
+    assert sam.sanitise('Mod-1 (2.0) [x]:+/",') == "Mod_1__2_0___x______"
+
+
+def test_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(sam.CACHE_DIR_VARIABLE, str(tmp_path))
+    assert sam.cache_dir().parent == tmp_path / "sam"
+
+
+class TestLookup:
+    def test_module(self, libraries):
+        tables, _ = libraries
+        assert sam.module("Module A").equals(tables["CECMod"]["Module_A"])
+        assert sam.module("Module-B").equals(tables["SandiaMod"]["Module_B"])
+        assert sam.inverter("Inverter C").equals(
+            tables["cecinverter"]["Inverter_C"])
+
+    def test_missing(self, libraries):
+        with pytest.raises(KeyError):
+            sam.module("Module D")
+
+    def test_built_once(self, libraries):
+        _, calls = libraries
+        sam.module("Module A")
+        # a new process reads the index written by the first
+        sam.index.cache_clear()
+        assert sam.module("Module A")["A_c"] == 1.
+        assert calls == ["CECMod"]
+
+    def test_unwritable_cache(self, libraries, tmp_path, monkeypatch):
+        tables, calls = libraries
+        # the cache folder cannot be created below a file
+        blocked = tmp_path / "blocked"
+        blocked.write_text("")
+        monkeypatch.setattr(sam, "cache_dir", lambda: blocked / "sam")
+        assert sam.module("Module A").equals(tables["CECMod"]["Module_A"])
+        assert sam.inverter("Inverter C").equals(
+            tables["cecinverter"]["Inverter_C"])
+        with pytest.raises(KeyError):
+            sam.module("Module D")
+
+    def test_unknown_library(self, libraries):
+        with pytest.raises(ValueError):
+            sam.build("unknown")
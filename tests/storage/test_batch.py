@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pylesa.main import main
+from pylesa.storage import batch
+from pylesa.storage.enums import Integrator
+from pylesa.storage.hot_water_tank import seed_key
+
+from .test_hot_water_tank import make_tank
+
+CAPACITIES = [0., 500., 2000., 10000., 50000.]
+
+
+@pytest.fixture
+def nodes_temp():
+    rng = np.random.default_rng(0)
+    return np.sort(rng.uniform(40., 60., (len(CAPACITIES), 6)), axis=1)[:, ::-1]
+
+
+class TestMaxEnergyInOut:
+    @pytest.mark.parametrize("integrator", list(Integrator))
+    @pytest.mark.parametrize("state", ["charging", "discharging", "standby"])
+    def test_matches_tank(self, integrator, state, nodes_temp):
+        tanks = [make_tank(capacity, integrator=integrator)
+                 for capacity in CAPACITIES]
+        got = batch.max_energy_in_out(
+            tanks, state, nodes_temp, 55., 50., 40., 100)
+        expected = [tank._max_energy_in_out(
+            state, list(temps), 55., 50., 40., 100)
+            for tank, temps in zip(tanks, nodes_temp)]
+        np.testing.assert_array_equal(got, expected)
+
+    @pytest.mark.parametrize("integrator", list(Integrator))
+    def test_rows_discharged(self, integrator):
+        # rows run out of water above the flow temperature at different steps
+        nodes_temp = np.full((len(CAPACITIES), 6), 45.)
+        for row in range(len(CAPACITIES)):
+            nodes_temp[row, :row + 1] = 70.
+        tanks = [make_tank(capacity, integrator=integrator)
+                 for capacity in CAPACITIES]
+        got = batch.max_energy_in_out(
+            tanks, "discharging", nodes_temp, 75., 55., 40., 100)
+        expected = [tank._max_energy_in_out(
+            "discharging", list(temps), 75., 55., 40., 100)
+            for tank, temps in zip(tanks, nodes_temp)]
+        np.testing.assert_array_equal(got, expected)
+
+    def test_bad_state(self, nodes_temp):
+        tanks = [make_tank(capacity) for capacity in CAPACITIES]
+        with pytest.raises(ValueError):
+            batch.max_energy_in_out(
+                tanks, "boiling", nodes_temp, 55., 50., 40., 100)
+
+    def test_number_of_tanks(self, nodes_temp):
+        with pytest.raises(ValueError):
+            batch.max_energy_in_out(
+                [make_tank()], "charging", nodes_temp, 55., 50., 40., 100)
+
+    def test_number_of_nodes(self):
+        tanks = [make_tank(), make_tank(number_nodes=4)]
+        with pytest.raises(ValueError):
+            batch.max_energy_in_out(
+                tanks, "charging", np.full((2, 6), 50.), 55., 50., 40., 100)
+
+
+class TestSeedMaxEnergy:
+    def test_seeds_used(self, nodes_temp):
+        tanks = [make_tank(capacity) for capacity in CAPACITIES]
+        batch.seed_max_energy(tanks, nodes_temp, 55., 50., 40., 100)
+        for tank, temps in zip(tanks, nodes_temp):
+            key = seed_key("charging", temps, 55., 50., 40., 100)
+            assert key in tank._max_energy_seeds
+            # a seed replaces solving the node equations
+            tank._max_energy_seeds[key] = -1.
+            assert tank.max_energy_in_out(
+                "charging", list(temps), 55., 50., 40., 100) == -1.
+
+    def test_other_arguments_solved(self, nodes_temp):
+        tank = make_tank()
+        batch.seed_max_energy([tank], nodes_temp[1:2], 55., 50., 40., 100)
+        assert tank.max_energy_in_out(
+            "charging", list(nodes_temp[1]), 60., 50., 40., 100) == \
+            tank._max_energy_in_out(
+                "charging", list(nodes_temp[1]), 60., 50., 40., 100)
+
+
+class TestMaxEnergyHours:
+    @pytest.fixture
+    def hours(self):
+        rng = np.random.default_rng(1)
+        # few distinct temperatures so that many hours are the same
+        source_temp = rng.choice([50., 55., 60.], 48)
+        flow_temp = rng.choice([45., 50.], 48)
+        air = pd.DataFrame({"air_temperature": rng.choice([5., 10.], 48)})
+        return source_temp, flow_temp, {"air_temperature": air}
+
+    @pytest.mark.parametrize("integrator", list(Integrator))
+    @pytest.mark.parametrize("state", ["charging", "discharging"])
+    def test_matches_tank(self, integrator, state, hours):
+        source_temp, flow_temp, air_temperature = hours
+        tank = make_tank(10000., location="outside", integrator=integrator,
+                         air_temperature=air_temperature, cache_size=0)
+        nodes_temp = [62., 58., 54., 47., 43., 41.]
+        got = batch.max_energy_hours(
+            tank, state, nodes_temp, source_temp, flow_temp, 40.,
+            np.arange(48))
+        expected = [tank.max_energy_in_out(
+            state, nodes_temp, source_temp[hour], flow_temp[hour], 40., hour)
+            for hour in range(48)]
+        np.testing.assert_array_equal(got, expected)
+
+    def test_distinct_conditions_solved(self, hours, monkeypatch):
+        source_temp, flow_temp, air_temperature = hours
+        tank = make_tank(location="outside", air_temperature=air_temperature)
+        rows = []
+        max_energy_in_out = batch.max_energy_in_out
+        def counted(tanks, *args):
+            rows.append(len(tanks))
+            return max_energy_in_out(tanks, *args)
+        monkeypatch.setattr(batch, "max_energy_in_out", counted)
+        batch.max_energy_hours(tank, "charging", [40.] * 6, source_temp,
+                               flow_temp, 40., np.arange(48))
+        # the flow temperature does not change the energy charged
+        assert rows == [6]
+
+    def test_no_hours(self):
+        energy = batch.max_energy_hours(
+            make_tank(), "charging", [40.] * 6, [], [], 40., [])
+        assert energy.shape == (0,)
+
+
+class TestBatchOption:
+    def test_negative_batch(self, tmp_path):
+        # rejected before the input file is read
+        with pytest.raises(ValueError):
+            main(tmp_path / "fixed_order.xlsx", tmp_path, batch=-1)
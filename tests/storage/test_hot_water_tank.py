@@ -0,0 +1,410 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.integrate import odeint
+
+from pylesa.main import main
+from pylesa.storage.enums import Integrator
+from pylesa.storage.hot_water_tank import HotWaterTank, water_in_range
+
+
+def make_tank(capacity=500., location="inside", number_nodes=6,
+              integrator=Integrator.ODEINT, **kwargs):
+    return HotWaterTank(
+        capacity,
+        "polyurethane",
+        location,
+        number_nodes,
+        {"height": None, "width": None, "insulation_thickness": None},
+        {
+            "tank_opening": 1,
+            "tank_opening_diameter": 35,
+            "uninsulated_connections": 0,
+            "uninsulated_connections_diameter": 35,
+            "insulated_connections": 2,
+            "insulated_connections_diameter": 35,
+        },
+        {"insulation_factor": 1., "overall_factor": 2.},
+        integrator=integrator,
+        **kwargs,
+    )
+
+
+def legacy_model_temp(nodes_temp, c):
+    """Right hand side built node by node from coefficient dicts"""
+    n = len(nodes_temp)
+    dzdt = []
+    for node in range(n):
+        dTdt = c[node]["A"] * nodes_temp[node] + c[node]["D"]
+        if node > 0:
+            dTdt += c[node]["B"] * nodes_temp[node - 1]
+        if node < n - 1:
+            dTdt += c[node]["C"] * nodes_temp[node + 1]
+        dzdt.append(dTdt)
+    return dzdt
+
+
+def legacy_new_nodes_temp(tank, state, nodes_temp, source_temp, source_delta_t,
+                          flow_temp, return_temp, thermal_output, demand, timestep):
+    """Node by node implementation of HotWaterTank.new_nodes_temp"""
+    bottom = tank.number_nodes - 1
+    mass_flow_tot = tank.mass_flow_calc(
+        state, flow_temp, return_temp, source_temp, source_delta_t,
+        thermal_output, demand, nodes_temp[bottom], nodes_temp[0]) * 3600
+    t = max(min(tank.number_nodes, int(np.ceil(mass_flow_tot / tank.calc_node_mass()))), 1)
+    thermal_output = thermal_output * 3600 / float(t)
+    demand = demand * 3600 / float(t)
+
+    node_temp_list = []
+    for i in range(1, t + 1):
+        c = tank.set_of_coefficients(
+            state, nodes_temp, source_temp, source_delta_t, flow_temp,
+            return_temp, thermal_output, demand, nodes_temp[bottom],
+            nodes_temp[0], timestep)
+        dzdt = legacy_model_temp(nodes_temp, c)
+        z = odeint(lambda z, t: dzdt, nodes_temp, [i - 1, i])
+        nodes_temp = sorted(z[1], reverse=True)
+        node_temp_list.append(nodes_temp)
+    return node_temp_list
+
+
+def legacy_max_energy_in_out(tank, state, nodes_temp, source_temp, flow_temp,
+                             return_temp, timestep):
+    """Node by node implementation of HotWaterTank.max_energy_in_out"""
+    n = tank.number_nodes
+    mass_flow = tank.calc_node_mass()
+    cp = tank.specific_heat_water(source_temp)
+    energy = 0.
+    for i in range(1, n):
+        if state == "charging" and source_temp > nodes_temp[n - 1]:
+            energy += mass_flow * cp * (source_temp - nodes_temp[n - 1])
+        elif state == "discharging" and nodes_temp[0] > flow_temp:
+            energy += mass_flow * cp * (nodes_temp[0] - return_temp)
+        c = tank.set_of_max_coefficients(
+            state, nodes_temp, source_temp, flow_temp, return_temp, timestep)
+        dzdt = legacy_model_temp(nodes_temp, c)
+        nodes_temp = odeint(lambda z, t: dzdt, nodes_temp, [i - 1, i])[1]
+    return energy / 3600000
+
+
+CASES = [
+    # state, nodes_temp, source_temp, flow_temp, return_temp
+    ("charging", [60., 55., 50., 45., 42., 40.], 65., 60., 40.),
+    ("charging", [70., 62., 56., 51., 47., 41.], 58., 60., 40.),
+    ("discharging", [70., 65., 60., 50., 45., 40.], 65., 55., 40.),
+    ("discharging", [58., 52., 49., 45., 43., 41.], 65., 50., 40.),
+    ("standby", [60., 55., 50., 45., 42., 40.], 65., 60., 40.),
+]
+
+
+class TestHotWaterTank:
+    @pytest.fixture
+    def tank(self):
+        return make_tank()
+
+    @pytest.mark.parametrize("state, nodes_temp, source_temp, flow_temp, return_temp", CASES)
+    def test_coefficient_arrays(self, tank, state, nodes_temp, source_temp,
+                                flow_temp, return_temp):
+        mass_flow = tank.calc_node_mass()
+        expected = tank.set_of_max_coefficients(
+            state, nodes_temp, source_temp, flow_temp, return_temp, 0)
+        got = tank.coefficient_arrays(
+            state, nodes_temp, mass_flow, source_temp, flow_temp, return_temp, 0)
+        for idx, key in enumerate("ABCD"):
+            assert np.allclose(got[idx], [c[key] for c in expected], rtol=1e-12)
+
+    @pytest.mark.parametrize("state, nodes_temp, source_temp, flow_temp, return_temp", CASES)
+    def test_new_nodes_temp(self, tank, state, nodes_temp, source_temp,
+                            flow_temp, return_temp):
+        args = (state, nodes_temp, source_temp, 5., flow_temp, return_temp, 12., 9., 0)
+        expected = legacy_new_nodes_temp(tank, *args)
+        got = tank.new_nodes_temp(*args)
+        assert len(got) == len(expected)
+        assert np.allclose(got, expected, rtol=1e-9)
+
+    @pytest.mark.parametrize("state, nodes_temp, source_temp, flow_temp, return_temp", CASES)
+    def test_max_energy_in_out(self, tank, state, nodes_temp, source_temp,
+                               flow_temp, return_temp):
+        if state == "standby":
+            pytest.skip("max energy only defined for charging and discharging")
+        args = (state, nodes_temp, source_temp, flow_temp, return_temp, 0)
+        expected = legacy_max_energy_in_out(tank, *args)
+        got = tank.max_energy_in_out(*args)
+        assert got == pytest.approx(expected, rel=1e-9)
+
+    def test_standby_not_integrated(self, tank, monkeypatch):
+        def integrate_step(*args):
+            raise AssertionError("standby hours are not integrated")
+        monkeypatch.setattr(tank, "integrate_step", integrate_step)
+        nodes_temp = [70., 60., 50., 40., 30., 20.]
+        assert tank.max_energy_in_out(
+            "standby", nodes_temp, 60., 55., 40., 0) == 0.
+        tank.new_nodes_temp("standby", nodes_temp, 60., 5., 55., 40., 0., 0., 0)
+
+    def test_discharged_early(self, monkeypatch):
+        tank = make_tank(capacity=50000., number_nodes=20)
+        steps = []
+        integrate_step = tank.integrate_step
+        def counted(*args):
+            steps.append(args)
+            return integrate_step(*args)
+        monkeypatch.setattr(tank, "integrate_step", counted)
+        # only the top two nodes are above the flow temperature
+        nodes_temp = [70., 65.] + [45.] * 18
+        args = ("discharging", nodes_temp, 60., 55., 40., 0)
+        expected = legacy_max_energy_in_out(tank, *args)
+        assert tank.max_energy_in_out(*args) == pytest.approx(expected, rel=1e-9)
+        assert len(steps) < tank.number_nodes - 2
+
+    def test_specific_heat_nodes(self, tank):
+        temps = [0., 14., 15.5, 44., 99.]
+        expected = [tank.specific_heat_water(temp) for temp in temps]
+        assert np.allclose(tank.specific_heat_nodes(temps), expected)
+
+    def test_specific_heat_water(self, tank):
+        assert tank.specific_heat_water(40) == tank.cp[40]
+        assert tank.specific_heat_water(45.) == pytest.approx(
+            (tank.cp[40] + tank.cp[50]) / 2, rel=1e-12)
+        for temp in [np.float64(45.), np.float32(45.), np.int64(45)]:
+            assert tank.specific_heat_water(temp) == tank.specific_heat_water(45.)
+        assert np.array_equal(
+            tank.specific_heat_water(np.array([[10., 45.], [60., 95.]])),
+            [[tank.specific_heat_water(t) for t in row]
+             for row in [[10., 45.], [60., 95.]]])
+
+    @pytest.mark.parametrize("temp", [-0.1, 100.1])
+    def test_specific_heat_water_out_of_range(self, tank, temp):
+        with pytest.raises(ValueError):
+            tank.specific_heat_water(temp)
+
+    def test_specific_heat_nodes_out_of_range(self, tank):
+        with pytest.raises(ValueError):
+            tank.specific_heat_nodes([50., 101.])
+
+    def test_bad_state(self, tank):
+        with pytest.raises(ValueError):
+            tank.coefficient_arrays("bad", [50.] * 6, 10., 60., 55., 40., 0)
+
+    def test_zero_capacity(self):
+        tank = make_tank(capacity=0)
+        assert tank.max_energy_in_out("charging", [40.] * 6, 60., 55., 40., 0) == 0.
+
+
+class TestTankConstants:
+    def test_node_constants(self):
+        tank = make_tank()
+        node_mass, UA, Ta, connection_loss = tank.node_constants(0)
+        assert node_mass == tank.calc_node_mass() == 500. / 6
+        assert UA == tank.constants.UA
+        assert Ta == 15.
+        assert connection_loss == 2. * tank.connection_losses()
+
+    def test_frozen(self):
+        tank = make_tank()
+        assert tank.constants is tank.constants
+        with pytest.raises(AttributeError):
+            tank.constants.node_mass = 1.
+
+    def test_capacity_change(self):
+        tank = make_tank()
+        constants = tank.constants
+        tank.capacity = 1000.
+        assert tank.constants is not constants
+        assert tank.constants == make_tank(capacity=1000.).constants
+        assert tank.dimensions["width"] == make_tank(capacity=1000.).dimensions["width"]
+
+    def test_zero_capacity(self):
+        tank = make_tank(capacity=0)
+        assert tank.calc_node_mass() == 0.
+        assert tank.constants.UA == 0.
+
+
+class TestAmbientTemperature:
+    @pytest.fixture
+    def tank(self):
+        air = pd.DataFrame({"air_temperature": [5., 7., 11.]})
+        return make_tank(location="outside",
+                         air_temperature={"air_temperature": air})
+
+    def test_inside(self):
+        assert make_tank().amb_temp(3) == 15.
+
+    def test_outside(self, tank):
+        assert [tank.amb_temp(hour) for hour in range(3)] == [5., 7., 11.]
+        assert tank.node_constants(1)[2] == 7.
+
+    def test_sub_hourly(self, tank):
+        assert tank.amb_temp(0.5) == 6.
+        assert tank.amb_temp(1.25) == 8.
+        assert tank.amb_temp(2.5) == 11.
+
+    def test_no_air_temperature(self):
+        with pytest.raises(ValueError):
+            make_tank(location="outside").amb_temp(0)
+
+    def test_bad_location(self):
+        with pytest.raises(ValueError):
+            make_tank(location="roof").amb_temp(0)
+
+
+class TestIntegrators:
+    @pytest.mark.parametrize("state, nodes_temp, source_temp, flow_temp, return_temp", CASES)
+    def test_exact(self, state, nodes_temp, source_temp, flow_temp, return_temp):
+        args = (state, nodes_temp, source_temp, 5., flow_temp, return_temp, 12., 9., 0)
+        expected = make_tank().new_nodes_temp(*args)
+        got = make_tank(integrator=Integrator.EXACT).new_nodes_temp(*args)
+        assert np.allclose(got, expected, rtol=1e-9)
+
+    @pytest.mark.parametrize("state, nodes_temp, source_temp, flow_temp, return_temp", CASES)
+    def test_expm(self, state, nodes_temp, source_temp, flow_temp, return_temp):
+        tank = make_tank(integrator=Integrator.EXPM)
+        coefficients = tank.coefficient_arrays(
+            state, nodes_temp, 20., source_temp, flow_temp, return_temp, 0)
+        # coupled linear system solved with odeint
+        M = tank.node_matrix(coefficients)
+        D = coefficients[3]
+        expected = odeint(
+            lambda z, t: M @ z + D, nodes_temp, [0., 1.], rtol=1e-10, atol=1e-10)[1]
+        got = tank.integrate_step(np.array(nodes_temp), coefficients, [0., 1.])
+        assert np.allclose(got, expected, rtol=1e-7)
+
+    @pytest.mark.parametrize("integrator", list(Integrator))
+    def test_standby_step(self, integrator):
+        tank = make_tank(integrator=integrator)
+        nodes_temp = np.array([70., 60., 50., 40., 30., 20.])
+        coefficients = tank.coefficient_arrays(
+            "standby", nodes_temp, 0., 60., 55., 40., 0)
+        expected = tank.integrate_step(nodes_temp, coefficients, [0., 1.])
+        got = tank.standby_step(nodes_temp, coefficients)
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+
+    def test_string_integrator(self):
+        assert make_tank(integrator="EXACT").integrator == Integrator.EXACT
+
+    def test_bad_integrator(self):
+        with pytest.raises(ValueError):
+            make_tank(integrator="euler")
+
+
+def fine_nodes_temp(tank, args, steps=2 ** 11):
+    """new_nodes_temp with many equal steps of the same equations
+
+    The integrators agree as the steps get shorter, so the cheapest,
+    exact, is used.
+    """
+    fine = {}
+
+    def adaptive_steps(nodes_temp, step_coefficients, duration):
+        step = duration / steps
+        for i in range(steps):
+            nodes_temp = np.sort(tank.integrate_step(
+                nodes_temp, step_coefficients(nodes_temp),
+                [i * step, (i + 1) * step]))[::-1]
+        fine["nodes_temp"] = nodes_temp
+        return [list(nodes_temp)]
+
+    tolerance, integrator = tank.step_tolerance, tank.integrator
+    tank.step_tolerance, tank.integrator = 1., Integrator.EXACT
+    tank.adaptive_steps = adaptive_steps
+    try:
+        tank.new_nodes_temp(*args)
+    finally:
+        del tank.adaptive_steps
+        tank.step_tolerance, tank.integrator = tolerance, integrator
+    return fine["nodes_temp"]
+
+
+class TestStepTolerance:
+    @pytest.mark.parametrize("integrator", [Integrator.EXACT, Integrator.EXPM])
+    @pytest.mark.parametrize("capacity, number_nodes, state, thermal_output, demand", [
+        (2000., 6, "charging", 40., 10.),
+        (2000., 6, "discharging", 0., 40.),
+        (10000., 10, "discharging", 0., 40.),
+        (50000., 20, "charging", 40., 10.),
+    ])
+    def test_within_tolerance(self, integrator, capacity, number_nodes, state,
+                              thermal_output, demand):
+        tolerance = 0.05
+        tank = make_tank(capacity, number_nodes=number_nodes,
+                         integrator=integrator, step_tolerance=tolerance)
+        nodes_temp = list(np.linspace(62., 42., number_nodes))
+        args = (state, nodes_temp, 65., 5., 55., 40., thermal_output,
+                demand, 0)
+        got = tank.new_nodes_temp(*args)[-1]
+        expected = fine_nodes_temp(tank, args)
+        assert np.max(np.abs(np.array(got) - expected)) <= tolerance
+
+    def test_default_steps(self):
+        # without a tolerance each step moves at most a node of mass
+        args = ("discharging", [62., 58., 54., 50., 46., 42.], 65., 5., 55.,
+                40., 0., 40., 0)
+        tank = make_tank(2000.)
+        assert len(tank.new_nodes_temp(*args)) == 5
+        tank = make_tank(2000., step_tolerance=0.02)
+        assert len(tank.new_nodes_temp(*args)) > 5
+
+    def test_long_step_out_of_range(self):
+        # the first steps tried take the water below 0 degC
+        tank = make_tank(300., integrator=Integrator.EXACT,
+                         step_tolerance=0.05)
+        got = tank.new_nodes_temp(
+            "discharging", [59., 46., 42., 41., 37., 35.], 65., 5., 55.,
+            40., 16., 41., 0)
+        assert water_in_range(np.array(got))
+
+    @pytest.mark.parametrize("tolerance", [0., -1.])
+    def test_bad_tolerance(self, tolerance):
+        with pytest.raises(ValueError):
+            make_tank(step_tolerance=tolerance)
+
+    def test_main_bad_tolerance(self, tmp_path):
+        # rejected before the input file is read
+        with pytest.raises(ValueError):
+            main(tmp_path / "fixed_order.xlsx", tmp_path, step_tolerance=0.)
+
+
+class TestMaxEnergyCache:
+    args = ("charging", [60., 55., 50., 45., 42., 40.], 65., 60., 40., 0)
+
+    def test_hit(self):
+        tank = make_tank()
+        first = tank.max_energy_in_out(*self.args)
+        assert tank.max_energy_in_out(*self.args) == first
+        info = tank.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    def test_matches_uncached(self):
+        cached = make_tank().max_energy_in_out(*self.args)
+        uncached = make_tank(cache_size=0).max_energy_in_out(*self.args)
+        assert cached == uncached
+
+    def test_disabled(self):
+        tank = make_tank(cache_size=0)
+        tank.max_energy_in_out(*self.args)
+        tank.max_energy_in_out(*self.args)
+        assert tank.cache_info() == (0, 0, 0, 0)
+
+    def test_lru_eviction(self):
+        tank = make_tank(cache_size=2)
+        for source_temp in [65., 66., 65., 67., 66.]:
+            tank.max_energy_in_out(
+                "charging", [60.] * 6, source_temp, 60., 40., 0)
+        # 66 was evicted by 67 as 65 was used more recently
+        info = tank.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+
+    def test_negative_size(self):
+        with pytest.raises(ValueError):
+            make_tank(cache_size=-1)
+
+    def test_capacity_change(self):
+        args = ("charging", [40.] * 6, 60., 55., 30., 0)
+        tank = make_tank()
+        tank.seed_max_energy({"seed": 1.})
+        before = tank.max_energy_in_out(*args)
+        tank.capacity *= 4
+        assert tank.cache_info() == (0, 0, tank.cache_size, 0)
+        assert tank._max_energy_seeds == {}
+        after = tank.max_energy_in_out(*args)
+        assert after != before
+        assert after == make_tank(capacity=2000.).max_energy_in_out(*args)
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from pylesa.storage import kernels
+
+CP_TABLE = np.array([4217., 4192., 4182., 4179., 4178., 4180., 4184.,
+                     4189., 4196., 4205., 4216.])
+
+
+def array_coefficients(state, nodes_temp, cp, mass_flow, source_temp,
+                       flow_temp, return_temp, node_mass, UA, Ta, cl):
+    """Node functions as whole array operations"""
+    n = len(nodes_temp)
+    nodes = np.arange(n)
+    bottom = n - 1
+    Fc = Fd = Fco = Fdi = Fcnt = Fdnt = Fcnb = Fdnb = np.zeros(n)
+    if state == kernels.CHARGING:
+        Fc = np.empty(n)
+        Fc[0] = source_temp >= nodes_temp[0]
+        Fc[1:] = ((source_temp >= nodes_temp[1:]) &
+                  (source_temp <= nodes_temp[:-1]))
+        Fco = (nodes == bottom).astype(float)
+        charged = np.flatnonzero(Fc)
+        node_charging = charged[-1] if charged.size else n
+        Fcnt = (nodes > node_charging).astype(float)
+        Fcnb = (~((nodes == bottom) | (nodes < node_charging))).astype(float)
+    elif state == kernels.DISCHARGING:
+        Fd = np.empty(n)
+        Fd[0] = flow_temp <= nodes_temp[0]
+        Fd[1:] = ((flow_temp < nodes_temp[1:]) &
+                  (flow_temp >= nodes_temp[:-1]))
+        discharged = np.flatnonzero(Fd)
+        if discharged.size:
+            node_discharging = discharged[-1]
+            Fdi = ((nodes == bottom) &
+                   (nodes_temp[0] >= flow_temp)).astype(float)
+        else:
+            node_discharging = n
+        Fdnt = (~((nodes == 0) | (nodes <= node_discharging))).astype(float)
+        Fdnb = (~((nodes == bottom) | (nodes < node_discharging))).astype(float)
+
+    A = (- (Fd + Fdnt + Fcnb + Fco) * mass_flow * cp - UA) / (node_mass * cp)
+    B = Fcnt * mass_flow / node_mass
+    C = Fdnb * mass_flow / node_mass
+    D = (Fc * mass_flow * cp * source_temp +
+         Fdi * mass_flow * cp * return_temp +
+         UA * Ta + cl) / (node_mass * cp)
+    return A, B, C, D
+
+
+@pytest.mark.parametrize("state", [kernels.CHARGING, kernels.DISCHARGING,
+                                   kernels.STANDBY])
+def test_coefficients(state):
+    rng = np.random.default_rng(state)
+    for _ in range(50):
+        nodes_temp = np.sort(rng.uniform(10., 90., 6))[::-1].copy()
+        cp = kernels.specific_heat(nodes_temp, CP_TABLE)
+        args = (state, nodes_temp, cp, 0.5, rng.uniform(10., 90.),
+                rng.uniform(10., 90.), 40., 80., 1.2, 15., 3.)
+        for got, expected in zip(kernels.coefficients(*args),
+                                 array_coefficients(*args)):
+            np.testing.assert_array_equal(got, expected)
+
+
+def test_node_derivatives():
+    rng = np.random.default_rng(0)
+    nodes_temp = rng.uniform(10., 90., 6)
+    A, B, C, D = rng.normal(size=(4, 6))
+    expected = A * nodes_temp + D
+    expected[1:] += B[1:] * nodes_temp[:-1]
+    expected[:-1] += C[:-1] * nodes_temp[1:]
+    np.testing.assert_allclose(
+        kernels.node_derivatives(nodes_temp, A, B, C, D), expected)
+
+
+def test_specific_heat():
+    temps = np.array([0., 14.9, 15., 25., 90., 99.5, 100.])
+    np.testing.assert_allclose(
+        kernels.specific_heat(temps, CP_TABLE),
+        np.interp(temps, np.arange(0., 101., 10.), CP_TABLE), rtol=1e-12)
+    np.testing.assert_array_equal(
+        kernels.specific_heat(np.arange(0., 101., 10.), CP_TABLE), CP_TABLE)
+
+
+def test_batch_specific_heat():
+    rng = np.random.default_rng(0)
+    nodes_temp = rng.uniform(0., 100., (20, 6))
+    nodes_temp[0] = [0., 10., 50., 99.9, 100., 100.]
+    got = kernels.batch_specific_heat(nodes_temp, np.tile(CP_TABLE, (20, 1)))
+    for row in range(20):
+        np.testing.assert_array_equal(
+            got[row], kernels.specific_heat(nodes_temp[row], CP_TABLE))
+
+
+@pytest.mark.parametrize("temp", [-1., 101.])
+def test_specific_heat_out_of_range(temp):
+    with pytest.raises(ValueError):
+        kernels.specific_heat(np.array([50., temp]), CP_TABLE)
+
+
+@pytest.mark.parametrize("temp", [-1., 101.])
+def test_batch_specific_heat_out_of_range(temp):
+    nodes_temp = np.full((3, 4), 50.)
+    nodes_temp[1, 2] = temp
+    with pytest.raises(ValueError):
+        kernels.batch_specific_heat(nodes_temp, np.tile(CP_TABLE, (3, 1)))
+
+
+@pytest.mark.parametrize("state", [kernels.CHARGING, kernels.DISCHARGING,
+                                   kernels.STANDBY])
+def test_batch_coefficients(state):
+    rng = np.random.default_rng(state)
+    nodes_temp = np.sort(rng.uniform(10., 90., (20, 6)), axis=1)[:, ::-1]
+    cp = CP_TABLE[np.rint(nodes_temp / 10.).astype(int)]
+    mass_flow = rng.uniform(0.1, 2., 20)
+    node_mass = rng.uniform(50., 300., 20)
+    UA = rng.uniform(0.5, 2., 20)
+    got = kernels.batch_coefficients(
+        state, nodes_temp, cp, mass_flow, 55., 50., 40., node_mass, UA,
+        15., 3.)
+    for row in range(20):
+        expected = kernels.coefficients(
+            state, nodes_temp[row].copy(), cp[row].copy(), mass_flow[row],
+            55., 50., 40., node_mass[row], UA[row], 15., 3.)
+        for g, e in zip(got, expected):
+            np.testing.assert_array_equal(g[row], e)
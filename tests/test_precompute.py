@@ -0,0 +1,28 @@
+import pandas as pd
+
+from pylesa import precompute, tools
+from pylesa.constants import INDIR
+
+
+def fail(*args):
+    raise AssertionError("series should not be recalculated")
+
+
+class TestLoad:
+    def test_cached(self, tmp_path, monkeypatch):
+        (tmp_path / INDIR).mkdir()
+        series = {"PV": pd.Series([1., 2.]), "import_cost": pd.Series([3., 4.])}
+        tools.write_pickle(series, tmp_path / INDIR / precompute.FILENAME)
+        monkeypatch.setattr(precompute, "calculate", fail)
+        # the combination inputs are not read when the file exists
+        loaded = precompute.load(tmp_path, "missing")
+        assert loaded["PV"].equals(series["PV"])
+        assert loaded["import_cost"].equals(series["import_cost"])
+
+    def test_calculated(self, tmp_path, monkeypatch):
+        (tmp_path / INDIR).mkdir()
+        series = {"PV": pd.Series([1., 2.])}
+        monkeypatch.setattr(precompute, "calculate", lambda root, sub: series)
+        precompute.load(tmp_path, "inputs")
+        monkeypatch.setattr(precompute, "calculate", fail)
+        assert precompute.load(tmp_path, "inputs")["PV"].equals(series["PV"])
@@ -4,7 +4,7 @@ from pathlib import Path
 import pytest
 import time
 
-from pylesa.mp.process import OutputProcess
+from pylesa.mp.process import JobPool, OutputProcess
 
 LOG = logging.getLogger(__name__)
 
@@ -57,6 +57,24 @@ class TestOutputProcess:
         assert process.is_alive()
 
 
+class TestJobPool:
+    def test_run_jobs(self, tmpdir):
+        fpaths = [Path(tmpdir) / f"test_{idx}.txt" for idx in range(5)]
+        JobPool(2).run(task, [[fpath] for fpath in fpaths])
+
+        for fpath in fpaths:
+            assert Path(fpath).exists()
+
+    def test_handle_task_error(self, tmpdir):
+        jobs = [[Path(tmpdir) / "test_0.txt"], ["bad/path"]]
+        with pytest.raises(RuntimeError, match="bad/path"):
+            JobPool(2).run(task, jobs)
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            JobPool(0)
+
+
 class TestLogging:
     @pytest.fixture
     def stream_handler(self):
@@ -89,3 +107,13 @@ class TestLogging:
         assert len(lines) == len(fpaths)
         for fpath in fpaths:
             assert f"Wrote: {fpath.stem}\n" in lines
+
+    def test_pool_logging(self, stream_handler, tmpdir):
+        fpaths = [Path(tmpdir) / f"test_{idx}.txt" for idx in range(5)]
+        JobPool(2).run(task, [[fpath] for fpath in fpaths])
+
+        # Check log messages from the workers
+        stream_handler.seek(0)
+        lines = stream_handler.readlines()
+        for fpath in fpaths:
+            assert f"Wrote: {fpath.stem}\n" in lines
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from pylesa.tools import CheckFunctions
+
+
+class TestCheckFunctions:
+    def test_electrical_surplus_deficit(self):
+        generation = pd.Series([5., 2., 3., 0.])
+        demand = np.array([3., 2., 4., 1.])
+        match = CheckFunctions(
+            generation, demand, None).electrical_surplus_deficit()
+        assert np.array_equal(match["match"], [2., 0., -1., -1.])
+        assert np.array_equal(match["surplus"], [2., 0., 0., 0.])
+        assert np.array_equal(match["deficit"], [0., 0., 1., 1.])
+        assert np.array_equal(match["RES_used"], [3., 2., 3., 0.])
+
+    def test_checks_log_errors(self, caplog):
+        check = CheckFunctions(None, None, [10.])
+        assert check.heat_demand_check(0, 12.) is None
+        assert check.surplus_check(1., 2.) is None
+        assert check.deficit_check(1., 2.) is None
+        assert len(caplog.records) == 3
+        assert all(record.levelname == "ERROR" for record in caplog.records)